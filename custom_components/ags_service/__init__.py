@@ -1,14 +1,20 @@
 """Main module for the AGS Service integration."""
 import asyncio
-import copy
+import collections
+import hashlib
+import json
 import logging
+import time
+import uuid
 import voluptuous as vol
 
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE, EVENT_HOMEASSISTANT_STARTED
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.discovery import async_load_platform
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.storage import Store
-from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
 from homeassistant.helpers import area_registry as ar
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
@@ -16,13 +22,33 @@ from homeassistant.components import websocket_api
 from homeassistant.components.http import StaticPathConfig
 from homeassistant.components.panel_custom import async_register_panel
 from homeassistant.components.frontend import add_extra_js_url
-from .ags_service import ensure_action_queue, update_ags_sensors
+from homeassistant.exceptions import HomeAssistantError
+from .ags_service import (
+    CONF_ZONE,
+    CONF_ZONES,
+    LOG_CORRELATION_ID,
+    async_apply_transaction,
+    ensure_action_queue,
+    room_switch_key,
+    seed_warm_start,
+    update_ags_sensors,
+    zone_slug,
+)
+from .records import (
+    CONF_TV_MODE,
+    DEFAULT_PRIORITY,
+    TV_MODE_NO_MUSIC,
+    TV_MODE_TV_AUDIO,
+    invalidate_room_records,
+)
+from .runtime import get_runtime
 from .source_utils import (
     CONF_DEFAULT_SOURCE_ID,
     CONF_HIDDEN_SOURCE_IDS,
     CONF_LAST_DISCOVERED_SOURCES,
     CONF_SOURCE_DISPLAY_NAMES,
     CONF_SOURCE_FAVORITES,
+    SourceView,
     normalize_source_list,
     normalize_source_storage,
 )
@@ -34,10 +60,16 @@ DOMAIN = "ags_service"
 STORAGE_VERSION = 1
 STORAGE_KEY = "ags_service.json"
 BACKUP_STORAGE_KEY = "ags_service.backup.json"
+CATALOG_STORAGE_KEY = "ags_service.catalog.json"
+DECISION_STORAGE_KEY = "ags_service.decision.json"
+# Saves requested within this window are coalesced into one write.
+CONFIG_SAVE_DELAY = 2
 FRONTEND_ASSET_VERSION = "2.1.0"
 
 # Signal for dynamic entity updates
 SIGNAL_AGS_RELOAD = "ags_service_reload"
+SIGNAL_AGS_STATE = "ags_service_state"
+SIGNAL_AGS_CONFIG_PATCHED = "ags_service_config_patched"
 
 # Define the configuration keys
 CONF_ROOM = 'room'
@@ -59,19 +91,25 @@ CONF_OTT_DEVICES = 'ott_devices'
 CONF_BATCH_UNJOIN = 'batch_unjoin'
 CONF_NATIVE_ROOM_POPUP = 'native_room_popup'
 CONF_PORTAL_MEDIA_PLAYER = 'portal_media_player'
+CONF_DISCOVERY_MAX_NODES = 'discovery_max_nodes'
+CONF_DISCOVERY_MAX_DEPTH = 'discovery_max_depth'
+CONF_DISCOVERY_TIME_LIMIT = 'discovery_time_limit'
+DEFAULT_DISCOVERY_MAX_NODES = 2000
+DEFAULT_DISCOVERY_MAX_DEPTH = 4
+DEFAULT_DISCOVERY_TIME_LIMIT = 90
+CONF_COMPACT_ATTRIBUTES = 'compact_attributes'
+CONF_LOG_BUFFER_SIZE = 'log_buffer_size'
+LOG_BUFFER_SIZE = 2000
 CONF_SOURCES = 'Sources'
 CONF_FAVORITE_SOURCES = 'favorite_sources'
 CONF_SOURCE = 'Source'
 CONF_MEDIA_CONTENT_TYPE = 'media_content_type'
 CONF_SOURCE_VALUE = 'Source_Value'
 CONF_SOURCE_DEFAULT = 'source_default'
-CONF_TV_MODE = 'tv_mode'
 CONF_HA_AREA_ID = 'ha_area_id'
 CONF_HA_AREA_NAME = 'ha_area_name'
 CONF_HA_AREA_LINKED = 'ha_area_linked'
 
-TV_MODE_TV_AUDIO = 'tv_audio'
-TV_MODE_NO_MUSIC = 'no_music'
 
 
 # Define the configuration schema for an OTT device mapping
@@ -110,6 +148,15 @@ ROOM_SCHEMA = vol.Schema(
     }, extra=vol.ALLOW_EXTRA
 )
 
+# An extra zone groups its own rooms with its own media player and queue.
+ZONE_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_ZONE): cv.string,
+        vol.Optional("rooms", default=[]): vol.All(cv.ensure_list, [ROOM_SCHEMA]),
+        vol.Optional(CONF_STATIC_NAME): cv.string,
+    }, extra=vol.ALLOW_EXTRA
+)
+
 SOURCE_SCHEMA = vol.Schema(
     {
         vol.Optional("id"): cv.string,
@@ -124,6 +171,7 @@ SOURCE_SCHEMA = vol.Schema(
 CONFIG_SCHEMA = vol.Schema({
     DOMAIN: vol.Schema({
         vol.Optional("rooms"): vol.All(cv.ensure_list, [ROOM_SCHEMA]),
+        vol.Optional(CONF_ZONES, default=[]): vol.All(cv.ensure_list, [ZONE_SCHEMA]),
         vol.Optional(CONF_SOURCE_FAVORITES): vol.All(cv.ensure_list, [SOURCE_SCHEMA]),
         vol.Optional(CONF_HIDDEN_SOURCE_IDS): vol.All(cv.ensure_list, [cv.string]),
         vol.Optional(CONF_SOURCE_DISPLAY_NAMES): dict,
@@ -154,10 +202,37 @@ CONFIG_SCHEMA = vol.Schema({
         vol.Optional(CONF_BATCH_UNJOIN, default=False): cv.boolean,
         vol.Optional(CONF_NATIVE_ROOM_POPUP, default=True): cv.boolean,
         vol.Optional(CONF_PORTAL_MEDIA_PLAYER, default="ha_default"): vol.In(["ha_default", "custom"]),
+        vol.Optional(CONF_DISCOVERY_MAX_NODES, default=DEFAULT_DISCOVERY_MAX_NODES): cv.positive_int,
+        vol.Optional(CONF_DISCOVERY_MAX_DEPTH, default=DEFAULT_DISCOVERY_MAX_DEPTH): cv.positive_int,
+        vol.Optional(CONF_DISCOVERY_TIME_LIMIT, default=DEFAULT_DISCOVERY_TIME_LIMIT): cv.positive_int,
+        vol.Optional(CONF_COMPACT_ATTRIBUTES, default=False): cv.boolean,
+        vol.Optional(CONF_LOG_BUFFER_SIZE, default=LOG_BUFFER_SIZE): cv.positive_int,
     }, extra=vol.ALLOW_EXTRA)
 }, extra=vol.ALLOW_EXTRA)
 
 
+SERVICE_APPLY = "apply"
+APPLY_FIELDS = {
+    vol.Optional("rooms", default={}): {cv.string: cv.boolean},
+    vol.Optional("exclusive", default=False): cv.boolean,
+    vol.Optional("source"): cv.string,
+    vol.Optional("volume"): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+    vol.Optional("system"): cv.boolean,
+}
+APPLY_SCHEMA = vol.Schema(APPLY_FIELDS)
+
+
+def _apply_arguments(data) -> dict:
+    """Pick the bulk apply arguments out of a service call or websocket message."""
+    return {
+        "rooms": dict(data.get("rooms") or {}),
+        "exclusive": data.get("exclusive", False),
+        "source": data.get("source"),
+        "volume": data.get("volume"),
+        "system": data.get("system"),
+    }
+
+
 def _config_has_user_data(cfg: dict | None) -> bool:
     """Return true when a config contains user-defined AGS setup."""
     if not isinstance(cfg, dict):
@@ -168,6 +243,7 @@ def _config_has_user_data(cfg: dict | None) -> bool:
         or cfg.get(CONF_LAST_DISCOVERED_SOURCES)
         or cfg.get(CONF_FAVORITE_SOURCES)
         or cfg.get("Sources")
+        or cfg.get(CONF_ZONES)
     )
 
 
@@ -176,14 +252,14 @@ def _merge_missing_config(primary: dict, fallback: dict | None) -> tuple[dict, b
     if not isinstance(fallback, dict) or not fallback:
         return primary, False
 
-    merged = copy.deepcopy(primary or {})
+    merged = dict(primary or {})
     changed = False
     for key, value in fallback.items():
         if value is None:
             continue
         current = merged.get(key)
         if key not in merged or current in (None, "", []) or current == {}:
-            merged[key] = copy.deepcopy(value)
+            merged[key] = value
             changed = True
     return merged, changed
 
@@ -210,27 +286,289 @@ def _remove_legacy_homekit_media_player(hass: HomeAssistant) -> None:
                 _LOGGER.debug("Unable to remove retired AGS media player %s: %s", entry.entity_id, err)
 
 
+def _json_default(value):
+    """Encode presented ``SourceView`` records as plain dicts, anything else as text."""
+    if isinstance(value, SourceView):
+        return value.to_dict()
+    return str(value)
+
+
+def _config_digest(config: dict | None) -> str | None:
+    """Return a stable content hash for a stored config document."""
+    if config is None:
+        return None
+    encoded = json.dumps(config, sort_keys=True, default=_json_default).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()
+
+
+# Sanitized and schema-validated configs, keyed by the digest of their input,
+# so repeated gets and unchanged saves skip the full normalization. Each AGS
+# runtime keeps its own memo under hass.data[DOMAIN].
+CONFIG_MEMO_SIZE = 8
+
+
+def _config_memo(hass: HomeAssistant | None, name: str):
+    """Return the named config memo of this AGS runtime, if there is one."""
+    if hass is None:
+        return None
+    memos = hass.data.setdefault(DOMAIN, {}).setdefault("_config_memo", {})
+    return memos.setdefault(name, collections.OrderedDict())
+
+
+def _detached_rooms(rooms) -> list[dict]:
+    """Copy a rooms list down to its device dicts."""
+    return [
+        {**room, "devices": [dict(device) for device in room.get("devices", []) or []]}
+        for room in rooms or []
+    ]
+
+
+def _detached_config(config: dict) -> dict:
+    """Return a copy of ``config`` whose rooms and zones the caller may edit.
+
+    Source catalogs stay shared; they are only ever replaced, never edited.
+    """
+    detached = dict(config)
+    if "rooms" in detached:
+        detached["rooms"] = _detached_rooms(detached["rooms"])
+    if CONF_ZONES in detached:
+        detached[CONF_ZONES] = [
+            {**zone, "rooms": _detached_rooms(zone.get("rooms"))}
+            for zone in detached[CONF_ZONES] or []
+        ]
+    return detached
+
+
+def _memoized_config(memo, config, build):
+    """Return ``build(config)``, reusing the result for identical input.
+
+    Callers get their own copy of the cached result, so storing or editing
+    it never changes what a later caller receives.
+    """
+    if memo is None:
+        return build(config)
+    digest = _config_digest(config)
+    cached = memo.get(digest)
+    if cached is None:
+        cached = memo[digest] = build(config)
+        if len(memo) > CONFIG_MEMO_SIZE:
+            memo.popitem(last=False)
+    else:
+        memo.move_to_end(digest)
+    return _detached_config(cached)
+
+
+def validate_config_schema(config: dict, hass: HomeAssistant | None = None) -> dict:
+    """Validate a domain config against ``CONFIG_SCHEMA``."""
+    return _memoized_config(
+        _config_memo(hass, "schema"), config, lambda raw: CONFIG_SCHEMA({DOMAIN: raw})[DOMAIN]
+    )
+
+
+class ConfigPersistence:
+    """Coalesce AGS config saves and rotate the last-known-good backup.
+
+    Requests within ``CONFIG_SAVE_DELAY`` collapse into one write of the
+    newest document, and writes whose content hash matches what is already
+    on disk are skipped. The backup is written before the main store and
+    holds the previous good document, so one of the two files always has
+    usable settings even if a write is interrupted. A failed write keeps the
+    document pending and is retried after the save window.
+
+    Once the discovered-source catalog has been loaded it is split out of
+    the main document into its own store and written only when it changes.
+    Until then it stays inline so an early save can never drop it.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        store: Store,
+        backup_store: Store,
+        catalog_store: Store | None = None,
+        delay: float = CONFIG_SAVE_DELAY,
+    ):
+        self.hass = hass
+        self.store = store
+        self.backup_store = backup_store
+        self.catalog_store = catalog_store
+        self.delay = delay
+        self.catalog_loaded = False
+        self._catalog_digest = None
+        self._pending = None
+        self._cancel_timer = None
+        self._lock = asyncio.Lock()
+        self._persisted = None
+        self._persisted_digest = None
+        self._backup_digest = None
+        self.stats = {
+            "requested": 0,
+            "coalesced": 0,
+            "written": 0,
+            "skipped_unchanged": 0,
+            "backup_writes": 0,
+            "catalog_writes": 0,
+            "failed": 0,
+            "last_duration": 0.0,
+            "max_duration": 0.0,
+            "total_duration": 0.0,
+        }
+
+    def prime(self, stored_config: dict | None, backup_config: dict | None) -> None:
+        """Record what is already on disk so unchanged saves are skipped."""
+        self._persisted = stored_config if isinstance(stored_config, dict) else None
+        self._persisted_digest = _config_digest(self._persisted)
+        self._backup_digest = _config_digest(backup_config if isinstance(backup_config, dict) else None)
+
+    def prime_catalog(self, catalog: list | None) -> None:
+        """Record the catalog on disk and start writing it separately."""
+        self._catalog_digest = _config_digest(catalog)
+        self.catalog_loaded = self.catalog_store is not None
+
+    def async_schedule_save(self, config: dict) -> None:
+        """Queue a config document to be written after the save window."""
+        self.stats["requested"] += 1
+        if self._pending is not None:
+            self.stats["coalesced"] += 1
+        self._pending = config
+        if self._cancel_timer is None:
+            self._cancel_timer = async_call_later(self.hass, self.delay, self._async_timer_fired)
+
+    async def _async_timer_fired(self, _now) -> None:
+        self._cancel_timer = None
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        """Write the pending document now, if it differs from disk."""
+        if self._cancel_timer is not None:
+            self._cancel_timer()
+            self._cancel_timer = None
+
+        async with self._lock:
+            config, self._pending = self._pending, None
+            if config is None:
+                return
+            try:
+                await self._async_write(config)
+            except Exception:
+                # Keep the document for the next attempt unless a newer one
+                # was queued while this write was running.
+                self.stats["failed"] += 1
+                if self._pending is None:
+                    self._pending = config
+                if self._cancel_timer is None:
+                    self._cancel_timer = async_call_later(self.hass, self.delay, self._async_timer_fired)
+                _LOGGER.exception("AGS: Saving config failed; will retry")
+
+    async def _async_write(self, config: dict) -> None:
+        """Write one config document, its backup and the split-out catalog."""
+        started = time.monotonic()
+        document = config
+        catalog = config.get(CONF_LAST_DISCOVERED_SOURCES)
+        if self.catalog_loaded:
+            document = {
+                key: value
+                for key, value in config.items()
+                if key != CONF_LAST_DISCOVERED_SOURCES
+            }
+            catalog_digest = _config_digest(catalog)
+            if catalog is not None and catalog_digest != self._catalog_digest:
+                await self.catalog_store.async_save({CONF_LAST_DISCOVERED_SOURCES: catalog})
+                self._catalog_digest = catalog_digest
+                self.stats["catalog_writes"] += 1
+
+        digest = _config_digest(document)
+        if digest == self._persisted_digest:
+            self.stats["skipped_unchanged"] += 1
+            return
+
+        if _config_has_user_data(self._persisted):
+            backup, backup_digest = self._persisted, self._persisted_digest
+        elif _config_has_user_data(document):
+            backup, backup_digest = document, digest
+        else:
+            backup, backup_digest = None, None
+        if backup is not None and backup_digest != self._backup_digest:
+            await self.backup_store.async_save(backup)
+            self._backup_digest = backup_digest
+            self.stats["backup_writes"] += 1
+
+        await self.store.async_save(document)
+        self._persisted, self._persisted_digest = document, digest
+
+        duration = time.monotonic() - started
+        self.stats["written"] += 1
+        self.stats["last_duration"] = round(duration, 4)
+        self.stats["max_duration"] = round(max(self.stats["max_duration"], duration), 4)
+        self.stats["total_duration"] = round(self.stats["total_duration"] + duration, 4)
+        _LOGGER.debug("AGS: Saved config in %.3fs (%s)", duration, self.stats)
+
+    def as_dict(self) -> dict:
+        """Return save counters for diagnostics."""
+        return {**self.stats, "pending": self._pending is not None}
+
+
+def _get_config_persistence(hass: HomeAssistant, store: Store | None = None) -> ConfigPersistence:
+    """Return the shared config persistence, creating it on first use."""
+    ags_data = hass.data.setdefault(DOMAIN, {})
+    persistence = ags_data.get("_config_persistence")
+    if persistence is None:
+        backup_store = ags_data.get("backup_store")
+        if backup_store is None:
+            backup_store = Store(hass, STORAGE_VERSION, BACKUP_STORAGE_KEY)
+            ags_data["backup_store"] = backup_store
+        catalog_store = Store(hass, STORAGE_VERSION, CATALOG_STORAGE_KEY)
+        persistence = ConfigPersistence(hass, store or ags_data["store"], backup_store, catalog_store)
+        ags_data["_config_persistence"] = persistence
+    elif store is not None:
+        persistence.store = store
+    return persistence
+
+
+async def _async_load_source_catalog(hass: HomeAssistant) -> None:
+    """Read the discovered-source catalog store into the live config."""
+    ags_data = hass.data[DOMAIN]
+    persistence = _get_config_persistence(hass)
+    data = await persistence.catalog_store.async_load()
+    catalog = data.get(CONF_LAST_DISCOVERED_SOURCES) if isinstance(data, dict) else None
+    persistence.prime_catalog(catalog)
+    # A legacy inline catalog, or a discovery run that finished first, wins.
+    if not catalog or ags_data.get(CONF_LAST_DISCOVERED_SOURCES):
+        return
+
+    catalog = normalize_source_list(catalog)
+    ags_data[CONF_LAST_DISCOVERED_SOURCES] = catalog
+    stored_config = ags_data.get("_stored_config_cache") or {}
+    ags_data["_stored_config_cache"] = {**stored_config, CONF_LAST_DISCOVERED_SOURCES: catalog}
+    ags_data["source_list_revision"] = int(ags_data.get("source_list_revision", 0) or 0) + 1
+    _bump_config_revision(hass)
+    async_dispatcher_send(hass, SIGNAL_AGS_CONFIG_PATCHED, frozenset({"sources"}))
+
+
+async def async_ensure_source_catalog(hass: HomeAssistant) -> None:
+    """Load the discovered-source catalog once; later calls reuse the load."""
+    ags_data = hass.data.setdefault(DOMAIN, {})
+    task = ags_data.get("_source_catalog_load")
+    if task is None:
+        task = hass.async_create_task(_async_load_source_catalog(hass))
+        ags_data["_source_catalog_load"] = task
+    try:
+        await task
+    except Exception:
+        # Drop the failed load so the next caller reads the store again.
+        if ags_data.get("_source_catalog_load") is task:
+            ags_data.pop("_source_catalog_load", None)
+        raise
+
+
 async def _async_save_config_with_backup(
     hass: HomeAssistant,
     config: dict,
     *,
     store: Store | None = None,
 ) -> None:
-    """Save config and keep a last-known-good backup for storage recovery."""
-    store = store or hass.data[DOMAIN]["store"]
-    backup_store = hass.data[DOMAIN].get("backup_store")
-    if backup_store is None:
-        backup_store = Store(hass, STORAGE_VERSION, BACKUP_STORAGE_KEY)
-        hass.data[DOMAIN]["backup_store"] = backup_store
-
-    current_config = hass.data.get(DOMAIN, {}).get("_stored_config_cache")
-    if _config_has_user_data(current_config):
-        await backup_store.async_save(current_config)
-
-    await store.async_save(config)
-
-    if _config_has_user_data(config):
-        await backup_store.async_save(config)
+    """Queue a config save; the backup keeps the last-known-good document."""
+    _get_config_persistence(hass, store).async_schedule_save(config)
 
 
 def _registry_values(registry, attr: str) -> list:
@@ -265,69 +603,165 @@ def _device_is_tv_like(hass: HomeAssistant, entity_id: str, entity_entry=None) -
     return any("tv" in str(candidate or "").lower() for candidate in candidates)
 
 
-def _get_ha_areas_with_media_players(hass: HomeAssistant) -> list[dict]:
-    """Return HA areas with media_player entities resolved through registries."""
-    area_registry = ar.async_get(hass)
-    entity_registry = er.async_get(hass)
-    device_registry = dr.async_get(hass)
-
-    areas = sorted(_registry_values(area_registry, "areas"), key=_area_name)
-    entity_entries = _registry_values(entity_registry, "entities")
-    devices = _registry_values(device_registry, "devices")
-    devices_by_area: dict[str, set[str]] = {}
-    for device in devices:
-        area_id = getattr(device, "area_id", None)
-        device_id = getattr(device, "id", None)
-        if area_id and device_id:
-            devices_by_area.setdefault(area_id, set()).add(device_id)
-
-    result = []
-    for area in areas:
-        area_id = getattr(area, "id", "")
-        if not area_id:
-            continue
+def _media_player_info(hass: HomeAssistant, entry) -> dict:
+    """Return the panel-facing description of one media_player registry entry."""
+    entity_id = getattr(entry, "entity_id", "")
+    state = hass.states.get(entity_id)
+    return {
+        "entity_id": entity_id,
+        "name": (
+            (getattr(state, "attributes", {}) or {}).get("friendly_name")
+            or getattr(entry, "original_name", None)
+            or getattr(entry, "name", None)
+            or entity_id
+        ),
+        "device_type": "tv" if _device_is_tv_like(hass, entity_id, entry) else "speaker",
+    }
 
-        entities = []
-        seen: set[str] = set()
-        for entry in entity_entries:
-            if getattr(entry, "domain", None) != "media_player":
-                continue
-            entry_area_id = getattr(entry, "area_id", None)
-            device_id = getattr(entry, "device_id", None)
-            if entry_area_id != area_id and device_id not in devices_by_area.get(area_id, set()):
-                continue
-            entity_id = getattr(entry, "entity_id", "")
-            if not entity_id or entity_id in seen:
-                continue
-            seen.add(entity_id)
-            state = hass.states.get(entity_id)
-            entities.append(
-                {
-                    "entity_id": entity_id,
-                    "name": (
-                        (getattr(state, "attributes", {}) or {}).get("friendly_name")
-                        or getattr(entry, "original_name", None)
-                        or getattr(entry, "name", None)
-                        or entity_id
-                    ),
-                    "device_type": "tv" if _device_is_tv_like(hass, entity_id, entry) else "speaker",
-                }
-            )
 
-        result.append(
+class AreaMediaIndex:
+    """HA areas and their media_player entities, kept current from registry events.
+
+    The first read walks the area, device and entity registries once. After
+    that each registry-updated event only re-reads the area, device or
+    entity it names, and the area list is re-derived from the stored maps.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._built = False
+        self._areas: dict[str, str] = {}
+        self._device_areas: dict[str, str] = {}
+        self._players: dict[str, dict] = {}
+        self._provisional: set[str] = set()
+        self._result: list[dict] | None = None
+        self.stats = {"builds": 0, "incremental_updates": 0}
+
+    def _store_player(self, entry) -> None:
+        entity_id = getattr(entry, "entity_id", "")
+        if not entity_id:
+            return
+        self._players[entity_id] = {
+            "area_id": getattr(entry, "area_id", None),
+            "device_id": getattr(entry, "device_id", None),
+            "info": _media_player_info(self.hass, entry),
+            "entry": entry,
+        }
+        # Names and TV detection improve once the entity has a state.
+        if self.hass.states.get(entity_id) is None:
+            self._provisional.add(entity_id)
+        else:
+            self._provisional.discard(entity_id)
+
+    def _build(self) -> None:
+        self._areas = {
+            getattr(area, "id", ""): _area_name(area)
+            for area in _registry_values(ar.async_get(self.hass), "areas")
+            if getattr(area, "id", "")
+        }
+        self._device_areas = {
+            getattr(device, "id", None): getattr(device, "area_id", None)
+            for device in _registry_values(dr.async_get(self.hass), "devices")
+            if getattr(device, "id", None) and getattr(device, "area_id", None)
+        }
+        self._players = {}
+        self._provisional = set()
+        for entry in _registry_values(er.async_get(self.hass), "entities"):
+            if getattr(entry, "domain", None) == "media_player":
+                self._store_player(entry)
+        self._built = True
+        self._result = None
+        self.stats["builds"] += 1
+
+    def invalidate(self) -> None:
+        """Drop everything; the next read rebuilds from the registries."""
+        self._built = False
+        self._result = None
+
+    def async_handle_event(self, event) -> None:
+        """Apply one area, device or entity registry update."""
+        if not self._built:
+            return
+        data = getattr(event, "data", {}) or {}
+        event_type = getattr(event, "event_type", None)
+        action = data.get("action")
+        try:
+            if event_type == ar.EVENT_AREA_REGISTRY_UPDATED:
+                area_id = data.get("area_id")
+                area = None if action == "remove" else ar.async_get(self.hass).async_get_area(area_id)
+                if area is None:
+                    self._areas.pop(area_id, None)
+                else:
+                    self._areas[area_id] = _area_name(area)
+            elif event_type == dr.EVENT_DEVICE_REGISTRY_UPDATED:
+                device_id = data.get("device_id")
+                device = None if action == "remove" else dr.async_get(self.hass).async_get(device_id)
+                area_id = getattr(device, "area_id", None)
+                if area_id:
+                    self._device_areas[device_id] = area_id
+                else:
+                    self._device_areas.pop(device_id, None)
+            elif event_type == er.EVENT_ENTITY_REGISTRY_UPDATED:
+                entity_id = data.get("entity_id")
+                old_entity_id = (data.get("changes") or {}).get("entity_id") or data.get("old_entity_id")
+                for stale_id in (entity_id, old_entity_id):
+                    if stale_id:
+                        self._players.pop(stale_id, None)
+                        self._provisional.discard(stale_id)
+                entry = None if action == "remove" else er.async_get(self.hass).async_get(entity_id)
+                if entry is not None and getattr(entry, "domain", None) == "media_player":
+                    self._store_player(entry)
+            else:
+                self.invalidate()
+                return
+        except AttributeError:
+            # Registry API variant without single-item lookups.
+            self.invalidate()
+            return
+        self._result = None
+        self.stats["incremental_updates"] += 1
+
+    def areas(self) -> list[dict]:
+        """Return areas with their media players, sorted the way the panel lists them."""
+        if not self._built:
+            self._build()
+        for entity_id in list(self._provisional):
+            if self.hass.states.get(entity_id) is not None:
+                self._store_player(self._players[entity_id]["entry"])
+                self._result = None
+        if self._result is not None:
+            return self._result
+
+        by_area: dict[str, list[dict]] = {area_id: [] for area_id in self._areas}
+        for player in self._players.values():
+            for area_id in {player["area_id"], self._device_areas.get(player["device_id"])}:
+                if area_id in by_area:
+                    by_area[area_id].append(player["info"])
+
+        self._result = [
             {
                 "area_id": area_id,
-                "name": _area_name(area),
-                "media_players": sorted(entities, key=lambda item: item["name"].lower()),
+                "name": name,
+                "media_players": sorted(by_area[area_id], key=lambda item: item["name"].lower()),
             }
-        )
+            for area_id, name in sorted(self._areas.items(), key=lambda item: item[1])
+        ]
+        return self._result
 
-    return result
+
+def _get_ha_areas_with_media_players(hass: HomeAssistant) -> list[dict]:
+    """Return HA areas with media_player entities resolved through registries."""
+    ags_data = hass.data.setdefault(DOMAIN, {})
+    index = ags_data.get("_area_index")
+    if index is None:
+        index = AreaMediaIndex(hass)
+        ags_data["_area_index"] = index
+    return index.areas()
 
 
 def sync_linked_area_rooms(hass: HomeAssistant, raw_cfg: dict | None) -> dict:
     """Mirror linked AGS rooms to their HA area media players."""
-    cfg = copy.deepcopy(raw_cfg or {})
+    cfg = dict(raw_cfg or {})
     area_map = {
         area["area_id"]: area
         for area in _get_ha_areas_with_media_players(hass)
@@ -341,14 +775,15 @@ def sync_linked_area_rooms(hass: HomeAssistant, raw_cfg: dict | None) -> dict:
             except (TypeError, ValueError):
                 continue
 
-    for room in cfg.get("rooms", []) or []:
+    rooms = list(cfg.get("rooms", []) or [])
+    for index, room in enumerate(rooms):
         area_id = str(room.get(CONF_HA_AREA_ID) or "").strip()
         if not room.get(CONF_HA_AREA_LINKED) or not area_id or area_id not in area_map:
             continue
 
         area = area_map[area_id]
         existing_by_id = {
-            str(device.get("device_id") or "").strip(): copy.deepcopy(device)
+            str(device.get("device_id") or "").strip(): dict(device)
             for device in room.get("devices", []) or []
             if str(device.get("device_id") or "").strip()
         }
@@ -374,16 +809,63 @@ def sync_linked_area_rooms(hass: HomeAssistant, raw_cfg: dict | None) -> dict:
                 device.setdefault("disabled", False)
             synced_devices.append(device)
 
-        room["devices"] = synced_devices
-        room[CONF_HA_AREA_NAME] = area["name"]
-        room[CONF_HA_AREA_LINKED] = True
+        rooms[index] = {
+            **room,
+            "devices": synced_devices,
+            CONF_HA_AREA_NAME: area["name"],
+            CONF_HA_AREA_LINKED: True,
+        }
 
+    if "rooms" in cfg:
+        cfg["rooms"] = rooms
     return cfg
 
 
-def sanitize_runtime_config(raw_cfg: dict | None) -> dict:
+def _sanitize_zones(raw_zones, main_rooms) -> list[dict]:
+    """Normalize zone rooms and drop names that would reuse a room switch."""
+    taken_switches = {room_switch_key(room["room"]) for room in main_rooms}
+    seen_zones: set[str] = set()
+    zones = []
+    for zone in raw_zones or []:
+        zone_name = str(zone.get(CONF_ZONE, "")).strip()
+        zone_id = zone_slug(zone_name)
+        if not zone_id or zone_id in seen_zones:
+            _LOGGER.warning("Skipping AGS zone with a missing or duplicate name: %r", zone_name)
+            continue
+        seen_zones.add(zone_id)
+        zone_rooms = []
+        for room in sanitize_runtime_config({"rooms": zone.get("rooms", [])})["rooms"]:
+            switch_key = room_switch_key(room["room"])
+            if switch_key in taken_switches:
+                _LOGGER.warning("Room %s in zone %s is already configured elsewhere, skipping", room["room"], zone_name)
+                continue
+            taken_switches.add(switch_key)
+            zone_rooms.append(room)
+        zones.append({**zone, CONF_ZONE: zone_name, "rooms": zone_rooms})
+    return zones
+
+
+def _source_catalog_pending(hass: HomeAssistant | None) -> bool:
+    """Return true while the split-out source catalog has not been read yet."""
+    if hass is None:
+        return False
+    persistence = hass.data.get(DOMAIN, {}).get("_config_persistence")
+    return persistence is not None and not persistence.catalog_loaded
+
+
+def sanitize_runtime_config(raw_cfg: dict | None, hass: HomeAssistant | None = None) -> dict:
     """Normalize runtime config and auto-fix safe conflicts."""
-    cfg = copy.deepcopy(raw_cfg or {})
+    if _source_catalog_pending(hass):
+        return _memoized_config(
+            _config_memo(hass, "sanitize_catalog_pending"),
+            raw_cfg or {},
+            lambda raw: _sanitize_runtime_config(raw, catalog_pending=True),
+        )
+    return _memoized_config(_config_memo(hass, "sanitize"), raw_cfg or {}, _sanitize_runtime_config)
+
+
+def _sanitize_runtime_config(raw_cfg: dict, *, catalog_pending: bool = False) -> dict:
+    cfg = dict(raw_cfg)
 
     normalized_rooms = []
     seen_devices: set[str] = set()
@@ -414,13 +896,12 @@ def sanitize_runtime_config(raw_cfg: dict | None) -> dict:
                                 "device_type": "ott",
                                 "parent_tv": device.get("device_id"),
                                 "tv_input": mapping.get("tv_input", ""),
-                                "priority": device.get("priority", 999),
+                                "priority": device.get("priority", DEFAULT_PRIORITY),
                                 "unique_id": ''.join(random.choices(string.ascii_lowercase + string.digits, k=9))
                             })
 
         if legacy_otts:
-            devices.extend(legacy_otts)
-            room["devices"] = devices
+            room = {**room, "devices": [*devices, *legacy_otts]}
 
         devices_with_order = []
         room_primary_entities: set[str] = set()
@@ -445,7 +926,7 @@ def sanitize_runtime_config(raw_cfg: dict | None) -> dict:
             if d_type != "ott":
                 seen_devices.add(device_id)
 
-            normalized_device = copy.deepcopy(device)
+            normalized_device = dict(device)
             normalized_device["device_id"] = device_id
             if not normalized_device.get("unique_id"):
                 import random, string
@@ -497,13 +978,13 @@ def sanitize_runtime_config(raw_cfg: dict | None) -> dict:
             device
             for _, device in sorted(
                 devices_with_order,
-                key=lambda pair: (pair[1].get("priority", 999), pair[0]),
+                key=lambda pair: (pair[1].get("priority", DEFAULT_PRIORITY), pair[0]),
             )
         ]
 
         normalized_rooms.append(
             {
-                **copy.deepcopy(room),
+                **room,
                 "room": room_name,
                 "devices": ordered_devices,
                 CONF_HA_AREA_ID: str(room.get(CONF_HA_AREA_ID) or "").strip(),
@@ -520,7 +1001,7 @@ def sanitize_runtime_config(raw_cfg: dict | None) -> dict:
     for rank, (_, _, device) in enumerate(
         sorted(
             all_devices,
-            key=lambda item: (item[2].get("priority", 999), item[0], item[1]),
+            key=lambda item: (item[2].get("priority", DEFAULT_PRIORITY), item[0], item[1]),
         ),
         start=1,
     ):
@@ -540,13 +1021,21 @@ def sanitize_runtime_config(raw_cfg: dict | None) -> dict:
         for key, value in (source_cfg.get(CONF_SOURCE_DISPLAY_NAMES, {}) or {}).items()
         if str(key).strip() and str(value).strip()
     }
+    # Until the split-out catalog is read, the default and scheduled sources
+    # may name discovered sources that are not in memory yet; keep them.
     default_source_id = str(source_cfg.get(CONF_DEFAULT_SOURCE_ID) or "").strip()
-    if default_source_id and default_source_id not in known_source_ids:
+    if catalog_pending:
+        default_source_id = default_source_id or str(cfg.get(CONF_DEFAULT_SOURCE_ID) or "").strip()
+    elif default_source_id and default_source_id not in known_source_ids:
         default_source_id = ""
 
     valid_source_names = {source["Source"] for source in normalized_sources + discovered_sources}
     default_source_schedule = cfg.get("default_source_schedule")
-    if default_source_schedule and default_source_schedule.get("source_name") not in valid_source_names:
+    if (
+        default_source_schedule
+        and default_source_schedule.get("source_name") not in valid_source_names
+        and not catalog_pending
+    ):
         default_source_schedule = None
 
     normalized_cfg = {
@@ -559,6 +1048,8 @@ def sanitize_runtime_config(raw_cfg: dict | None) -> dict:
         CONF_LAST_DISCOVERED_SOURCES: discovered_sources,
         "default_source_schedule": default_source_schedule,
     }
+    if CONF_ZONES in cfg:
+        normalized_cfg[CONF_ZONES] = _sanitize_zones(cfg.get(CONF_ZONES), normalized_rooms)
     normalized_cfg.pop("Sources", None)
     normalized_cfg.pop(CONF_FAVORITE_SOURCES, None)
     normalized_cfg.pop("ExcludedSources", None)
@@ -567,15 +1058,74 @@ def sanitize_runtime_config(raw_cfg: dict | None) -> dict:
 
 # Add a custom logging handler to capture AGS specific logs
 class AGSLogHandler(logging.Handler):
-    def __init__(self):
+    """Keep recent AGS log records as structured entries in a ring buffer.
+
+    Every entry gets a sequence number so clients can ask for only what is
+    newer than the last record they saw, and listeners are told about each
+    new entry for websocket streaming. Sequence numbers restart with the
+    process, so entries also carry a ``boot_id`` that tells cursors apart.
+    """
+
+    def __init__(self, capacity: int = LOG_BUFFER_SIZE):
         super().__init__()
-        self.logs = []
+        self.records = collections.deque(maxlen=capacity)
+        self.listeners = []
+        self.boot_id = uuid.uuid4().hex
+        self._next_seq = 1
+
+    def set_capacity(self, capacity: int) -> None:
+        """Resize the buffer, keeping the newest records."""
+        if capacity != self.records.maxlen:
+            self.records = collections.deque(self.records, maxlen=capacity)
 
     def emit(self, record):
-        log_entry = self.format(record)
-        self.logs.append(log_entry)
-        if len(self.logs) > 50:
-            self.logs.pop(0)
+        try:
+            entry = {
+                "seq": self._next_seq,
+                "boot_id": self.boot_id,
+                "time": record.created,
+                "level": record.levelname,
+                "levelno": record.levelno,
+                "logger": record.name,
+                "message": record.getMessage(),
+                "correlation_id": getattr(record, "correlation_id", None) or LOG_CORRELATION_ID.get(),
+            }
+        except Exception:  # pragma: no cover - mirrors logging.Handler
+            self.handleError(record)
+            return
+        self._next_seq += 1
+        self.records.append(entry)
+        for listener in list(self.listeners):
+            listener(entry)
+
+    @staticmethod
+    def level_number(level: str | None) -> int:
+        """Return the numeric threshold for a level name, 0 when unset."""
+        number = logging.getLevelName(level.upper()) if level else 0
+        return number if isinstance(number, int) else 0
+
+    def query(
+        self,
+        *,
+        level: str | None = None,
+        since: float | None = None,
+        after: int | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """Return buffered entries matching the level, time and cursor filters."""
+        min_level = self.level_number(level)
+        entries = [
+            entry
+            for entry in list(self.records)
+            if entry["levelno"] >= min_level
+            and (since is None or entry["time"] >= since)
+            and (after is None or entry["seq"] > after)
+        ]
+        return entries[-limit:] if limit else entries
+
+    def cursor(self, after: int | None, boot_id: str | None) -> int | None:
+        """Return ``after`` if it was issued by this boot, else no cursor."""
+        return after if boot_id in (None, self.boot_id) else None
 
 ags_log_handler = AGSLogHandler()
 ags_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
@@ -593,27 +1143,64 @@ async def async_setup(hass: HomeAssistant, config: dict):
     await _async_initialize_runtime(hass, config.get(DOMAIN, {}), is_yaml=True)
 
     if not hass.config_entries.async_entries(DOMAIN):
-        # Legacy YAML mode: discover platforms directly.
-        await async_load_platform(hass, 'sensor', DOMAIN, {}, config)
-        await async_load_platform(hass, 'switch', DOMAIN, {}, config)
-        await async_load_platform(hass, 'media_player', DOMAIN, {}, config)
+        # Legacy YAML mode: discover platforms directly. Discovery only
+        # dispatches; the platforms request the shared startup refresh.
+        await asyncio.gather(
+            *(
+                async_load_platform(hass, platform, DOMAIN, {}, config)
+                for platform in ('sensor', 'switch', 'media_player')
+            )
+        )
 
     return True
 
-def apply_config(hass: HomeAssistant, cfg: dict):
-    """Apply validated configuration to hass.data."""
-    try:
-        cfg = sanitize_runtime_config(cfg)
-    except vol.Invalid as err:
-        _LOGGER.error("Configuration validation failed: %s", err)
+def _config_boot_id(ags_data: dict) -> str:
+    """Return the token that tells this runtime's config revisions apart.
+
+    ``config_revision`` restarts from 0 whenever the runtime data is rebuilt,
+    so clients compare this token as well before trusting a revision match.
+    """
+    return ags_data.setdefault("config_boot_id", uuid.uuid4().hex)
+
+
+def _bump_config_revision(hass: HomeAssistant) -> int:
+    """Invalidate the cached config/get reply and return the new revision."""
+    ags_data = hass.data.setdefault(DOMAIN, {})
+    _config_boot_id(ags_data)
+    ags_data["config_revision"] = int(ags_data.get("config_revision", 0) or 0) + 1
+    ags_data.pop("_config_get_cache", None)
+    invalidate_room_records()
+    return ags_data["config_revision"]
+
+
+def apply_config(hass: HomeAssistant, cfg: dict, *, sanitized: bool = False):
+    """Apply validated configuration to hass.data.
+
+    Pass ``sanitized=True`` for a document that already went through
+    ``sanitize_runtime_config`` to skip normalizing it a second time.
+    """
+    if not sanitized:
+        try:
+            cfg = sanitize_runtime_config(cfg, hass)
+        except vol.Invalid as err:
+            _LOGGER.error("Configuration validation failed: %s", err)
 
     if DOMAIN not in hass.data:
         hass.data[DOMAIN] = {}
 
     rooms = cfg.get('rooms', [])
 
-    hass.data[DOMAIN].update({
-        'rooms': rooms,
+    hass.data[DOMAIN].update(_runtime_config_values(cfg))
+    ags_log_handler.set_capacity(hass.data[DOMAIN]['log_buffer_size'])
+    get_runtime(hass).configured_rooms = [room.get('room') for room in rooms if room.get('room')]
+    _bump_config_revision(hass)
+
+
+def _runtime_config_values(cfg: dict) -> dict:
+    """Return the hass.data values derived from a sanitized config."""
+    return {
+        'rooms': cfg.get('rooms', []),
+        CONF_ZONES: cfg.get(CONF_ZONES, []),
         CONF_SOURCE_FAVORITES: cfg.get(CONF_SOURCE_FAVORITES, []),
         CONF_HIDDEN_SOURCE_IDS: cfg.get(CONF_HIDDEN_SOURCE_IDS, []),
         CONF_SOURCE_DISPLAY_NAMES: cfg.get(CONF_SOURCE_DISPLAY_NAMES, {}),
@@ -630,8 +1217,71 @@ def apply_config(hass: HomeAssistant, cfg: dict):
         'batch_unjoin': cfg.get(CONF_BATCH_UNJOIN, False),
         'native_room_popup': cfg.get(CONF_NATIVE_ROOM_POPUP, True),
         'portal_media_player': cfg.get(CONF_PORTAL_MEDIA_PLAYER, "ha_default"),
-    })
-    hass.data['configured_rooms'] = [room.get('room') for room in rooms if room.get('room')]
+        'discovery_max_nodes': cfg.get(CONF_DISCOVERY_MAX_NODES, DEFAULT_DISCOVERY_MAX_NODES),
+        'discovery_max_depth': cfg.get(CONF_DISCOVERY_MAX_DEPTH, DEFAULT_DISCOVERY_MAX_DEPTH),
+        'discovery_time_limit': cfg.get(CONF_DISCOVERY_TIME_LIMIT, DEFAULT_DISCOVERY_TIME_LIMIT),
+        'compact_attributes': cfg.get(CONF_COMPACT_ATTRIBUTES, False),
+        'log_buffer_size': cfg.get(CONF_LOG_BUFFER_SIZE, LOG_BUFFER_SIZE),
+    }
+
+def _resolve_startup_config(
+    stored_config,
+    backup_config,
+    *,
+    legacy_config: dict,
+    entry_config: dict,
+    reinitializing: bool,
+) -> dict:
+    """Pick the config to run with from storage, YAML, the entry and the backup.
+
+    Decided entirely in memory; the caller saves the result once.
+    """
+    if not isinstance(stored_config, dict):
+        if reinitializing:
+            stored_config = {}
+        elif legacy_config:
+            _LOGGER.info("Migrating legacy AGS configuration to JSON storage")
+            return dict(legacy_config)
+        elif _config_has_user_data(entry_config):
+            _LOGGER.info("Migrating AGS config entry data to JSON storage")
+            return dict(entry_config)
+        elif _config_has_user_data(backup_config):
+            _LOGGER.warning("Recovering AGS configuration from backup storage")
+            return dict(backup_config)
+        else:
+            # Entry data might have something if it's not a fresh install
+            return entry_config or {
+                "rooms": [],
+                CONF_SOURCE_FAVORITES: [],
+                "off_override": False,
+                "create_sensors": True,
+            }
+
+    if not _config_has_user_data(stored_config):
+        for fallback_name, fallback_config in (
+            ("YAML", legacy_config),
+            ("config entry", entry_config),
+            ("backup", backup_config),
+        ):
+            if _config_has_user_data(fallback_config):
+                _LOGGER.warning(
+                    "AGS stored config is empty; restoring from %s instead of loading blank settings",
+                    fallback_name,
+                )
+                return dict(fallback_config)
+        return stored_config
+
+    for fallback_name, fallback_config in (
+        ("YAML", legacy_config),
+        ("config entry", entry_config),
+    ):
+        if not _config_has_user_data(fallback_config):
+            continue
+        stored_config, merged = _merge_missing_config(stored_config, fallback_config)
+        if merged:
+            _LOGGER.info("AGS: Merged missing %s settings into storage", fallback_name)
+    return stored_config
+
 
 async def _async_initialize_runtime(hass: HomeAssistant, config: dict, is_yaml: bool = False):
     """Initialize shared runtime state, storage, websocket endpoints, and panel."""
@@ -645,124 +1295,80 @@ async def _async_initialize_runtime(hass: HomeAssistant, config: dict, is_yaml:
     if is_yaml:
         hass.data[DOMAIN]["_yaml_config"] = config
 
+    # Land any queued save before reading storage back.
+    previous_persistence = hass.data[DOMAIN].pop("_config_persistence", None)
+    if previous_persistence is not None:
+        await previous_persistence.async_flush()
+    hass.data[DOMAIN].pop("_source_catalog_load", None)
+
+    phase_started = started = time.monotonic()
+    timings = {}
+
+    def _phase(name):
+        nonlocal phase_started
+        now = time.monotonic()
+        timings[name] = round(now - phase_started, 4)
+        phase_started = now
+
     store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
-    stored_config = await store.async_load()
-    hass.data[DOMAIN]["store"] = store
     backup_store = Store(hass, STORAGE_VERSION, BACKUP_STORAGE_KEY)
-    backup_config = await backup_store.async_load()
+    decision_store = Store(hass, STORAGE_VERSION, DECISION_STORAGE_KEY)
+    stored_config, backup_config, decision_snapshot = await asyncio.gather(
+        store.async_load(),
+        backup_store.async_load(),
+        decision_store.async_load(),
+    )
+    hass.data[DOMAIN]["store"] = store
     hass.data[DOMAIN]["backup_store"] = backup_store
+    hass.data[DOMAIN]["decision_store"] = decision_store
+    seed_warm_start(hass, decision_snapshot)
+    _get_config_persistence(hass, store).prime(stored_config, backup_config)
+    if not hass.data[DOMAIN].get("_config_flush_listener"):
+        async def _async_flush_config(_event):
+            persistence = hass.data.get(DOMAIN, {}).get("_config_persistence")
+            if persistence is not None:
+                await persistence.async_flush()
+
+        hass.data[DOMAIN]["_config_flush_listener"] = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, _async_flush_config
+        )
 
-    if is_init:
-        legacy_config = hass.data[DOMAIN].get("_yaml_config", {})
-        entry_config = config if not is_yaml else {}
-        active_config = stored_config if isinstance(stored_config, dict) else {}
-        if not _config_has_user_data(active_config):
-            if _config_has_user_data(legacy_config):
-                _LOGGER.warning(
-                    "AGS stored config is empty; restoring runtime config from YAML"
-                )
-                active_config = copy.deepcopy(legacy_config)
-                await _async_save_config_with_backup(hass, active_config, store=store)
-            elif _config_has_user_data(entry_config):
-                _LOGGER.warning(
-                    "AGS stored config is empty; restoring runtime config from config entry"
-                )
-                active_config = copy.deepcopy(entry_config)
-                await _async_save_config_with_backup(hass, active_config, store=store)
-            elif _config_has_user_data(backup_config):
-                _LOGGER.warning(
-                    "AGS stored config is empty; restoring runtime config from backup"
-                )
-                active_config = copy.deepcopy(backup_config)
-                await _async_save_config_with_backup(hass, active_config, store=store)
-        else:
-            for fallback_name, fallback_config in (
-                ("YAML", legacy_config),
-                ("config entry", entry_config),
-            ):
-                if not _config_has_user_data(fallback_config):
-                    continue
-                active_config, merged = _merge_missing_config(
-                    active_config,
-                    fallback_config,
-                )
-                if merged:
-                    _LOGGER.info(
-                        "AGS: Merged missing %s settings into storage",
-                        fallback_name,
-                    )
-                    await _async_save_config_with_backup(hass, active_config, store=store)
-
-        active_config = sanitize_runtime_config(sync_linked_area_rooms(hass, active_config))
-        await _async_save_config_with_backup(hass, active_config, store=store)
-        hass.data[DOMAIN]["_stored_config_cache"] = copy.deepcopy(active_config)
-        apply_config(hass, active_config)
-        _remove_legacy_homekit_media_player(hass)
-        return True
-
-    legacy_config = hass.data[DOMAIN].get("_yaml_config", {})
-    entry_config = config if not is_yaml else {}
+    # The discovered-source catalog is the bulk of the stored data; keep it
+    # off the startup path and read it once Home Assistant is running.
+    async def _async_load_catalog_after_start(_event=None):
+        await async_ensure_source_catalog(hass)
 
-    if not isinstance(stored_config, dict):
-        if legacy_config:
-            _LOGGER.info("Migrating legacy AGS configuration to JSON storage")
-            stored_config = copy.deepcopy(legacy_config)
-            await _async_save_config_with_backup(hass, stored_config, store=store)
-        elif _config_has_user_data(entry_config):
-            _LOGGER.info("Migrating AGS config entry data to JSON storage")
-            stored_config = copy.deepcopy(entry_config)
-            await _async_save_config_with_backup(hass, stored_config, store=store)
-        elif _config_has_user_data(backup_config):
-            _LOGGER.warning("Recovering AGS configuration from backup storage")
-            stored_config = copy.deepcopy(backup_config)
-            await _async_save_config_with_backup(hass, stored_config, store=store)
-        else:
-            # Entry data might have something if it's not a fresh install
-            stored_config = config if not is_yaml else {}
-            if not stored_config:
-                stored_config = {
-                    "rooms": [],
-                    CONF_SOURCE_FAVORITES: [],
-                    "off_override": False,
-                    "create_sensors": True,
-                }
+    if getattr(hass, "is_running", False):
+        hass.async_create_task(_async_load_catalog_after_start())
     else:
-        if not _config_has_user_data(stored_config):
-            if _config_has_user_data(legacy_config):
-                _LOGGER.warning(
-                    "AGS stored config is empty; restoring from YAML instead of loading blank settings"
-                )
-                stored_config = copy.deepcopy(legacy_config)
-                await _async_save_config_with_backup(hass, stored_config, store=store)
-            elif _config_has_user_data(entry_config):
-                _LOGGER.warning(
-                    "AGS stored config is empty; restoring from config entry instead of loading blank settings"
-                )
-                stored_config = copy.deepcopy(entry_config)
-                await _async_save_config_with_backup(hass, stored_config, store=store)
-            elif _config_has_user_data(backup_config):
-                _LOGGER.warning(
-                    "AGS stored config is empty; restoring from backup instead of loading blank settings"
-                )
-                stored_config = copy.deepcopy(backup_config)
-                await _async_save_config_with_backup(hass, stored_config, store=store)
-        else:
-            for fallback_config in (legacy_config, entry_config):
-                if not _config_has_user_data(fallback_config):
-                    continue
-                stored_config, merged = _merge_missing_config(
-                    stored_config,
-                    fallback_config,
-                )
-                if merged:
-                    await _async_save_config_with_backup(hass, stored_config, store=store)
-
-    stored_config = sanitize_runtime_config(sync_linked_area_rooms(hass, stored_config))
-    await _async_save_config_with_backup(hass, stored_config, store=store)
-    apply_config(hass, stored_config)
-    hass.data[DOMAIN]["_stored_config_cache"] = copy.deepcopy(stored_config)
-    hass.data[DOMAIN]['apply_config'] = lambda cfg: apply_config(hass, cfg)
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _async_load_catalog_after_start)
+    _phase("load")
+
+    active_config = _resolve_startup_config(
+        stored_config,
+        backup_config,
+        legacy_config=hass.data[DOMAIN].get("_yaml_config", {}),
+        entry_config=config if not is_yaml else {},
+        reinitializing=bool(is_init),
+    )
+    active_config = sanitize_runtime_config(sync_linked_area_rooms(hass, active_config), hass)
+    _phase("migrate")
+
+    # The persistence layer skips the write when nothing changed on disk.
+    await _async_save_config_with_backup(hass, active_config, store=store)
+    apply_config(hass, active_config, sanitized=True)
+    hass.data[DOMAIN]["_stored_config_cache"] = active_config
+    hass.data[DOMAIN]['apply_config'] = lambda cfg, **kwargs: apply_config(hass, cfg, **kwargs)
     _remove_legacy_homekit_media_player(hass)
+    _phase("apply")
+
+    if is_init:
+        _LOGGER.info(
+            "AGS: Runtime re-initialized in %.3fs (%s)",
+            time.monotonic() - started,
+            timings,
+        )
+        return True
 
     # Cancel existing action worker if it's already running (from a previous setup)
     if "action_worker" in hass.data[DOMAIN]:
@@ -777,13 +1383,42 @@ async def _async_initialize_runtime(hass: HomeAssistant, config: dict, is_yaml:
     if "status_handler_lock" not in hass.data[DOMAIN]:
         hass.data[DOMAIN]["status_handler_lock"] = asyncio.Lock()
 
+    if not hass.data[DOMAIN].get("_config_registry_listeners"):
+        # Linked rooms mirror HA areas, so registry edits change config/get.
+        @callback
+        def _registry_updated(event):
+            index = hass.data[DOMAIN].get("_area_index")
+            if index is not None:
+                index.async_handle_event(event)
+            _bump_config_revision(hass)
+
+        hass.data[DOMAIN]["_config_registry_listeners"] = [
+            hass.bus.async_listen(event_type, _registry_updated)
+            for event_type in (
+                ar.EVENT_AREA_REGISTRY_UPDATED,
+                dr.EVENT_DEVICE_REGISTRY_UPDATED,
+                er.EVENT_ENTITY_REGISTRY_UPDATED,
+            )
+        ]
+
+    if not hass.services.has_service(DOMAIN, SERVICE_APPLY):
+        async def _async_handle_apply(call):
+            await async_apply_transaction(hass, hass.data[DOMAIN], **_apply_arguments(call.data))
+
+        hass.services.async_register(DOMAIN, SERVICE_APPLY, _async_handle_apply, schema=APPLY_SCHEMA)
+
     if not hass.data[DOMAIN].get("_frontend_registered"):
         # Register WebSocket API endpoints
         websocket_api.async_register_command(hass, ws_get_config)
         websocket_api.async_register_command(hass, ws_save_config)
+        websocket_api.async_register_command(hass, ws_patch_config)
         websocket_api.async_register_command(hass, ws_list_areas)
         websocket_api.async_register_command(hass, ws_get_logs)
+        websocket_api.async_register_command(hass, ws_subscribe_logs)
+        websocket_api.async_register_command(hass, ws_apply)
         websocket_api.async_register_command(hass, ws_refresh_sources)
+        websocket_api.async_register_command(hass, ws_get_diagnostics)
+        websocket_api.async_register_command(hass, ws_subscribe_state)
 
         # Register static path for panel
         import os
@@ -810,6 +1445,12 @@ async def _async_initialize_runtime(hass: HomeAssistant, config: dict, is_yaml:
         hass.data[DOMAIN]["_frontend_registered"] = True
 
     hass.data[DOMAIN]["_runtime_initialized"] = True
+    _phase("register")
+    _LOGGER.info(
+        "AGS: Runtime initialized in %.3fs (%s)",
+        time.monotonic() - started,
+        timings,
+    )
 
     return True
 
@@ -824,11 +1465,30 @@ async def async_setup_entry(hass: HomeAssistant, entry):
 
 @websocket_api.websocket_command({
     vol.Required("type"): "ags_service/config/get",
+    vol.Optional("revision"): vol.Any(None, int),
+    vol.Optional("boot_id"): vol.Any(None, str),
 })
 @callback
 def ws_get_config(hass, connection, msg):
-    """Handle get config command."""
+    """Handle get config command.
+
+    Replies are cached per config revision; a client that already holds the
+    current revision gets a small not-modified reply instead.
+    """
     live_config = hass.data[DOMAIN]
+    revision = live_config.get("config_revision", 0)
+    boot_id = _config_boot_id(live_config)
+    if msg.get("revision") == revision and msg.get("boot_id") == boot_id:
+        connection.send_result(
+            msg["id"],
+            {"not_modified": True, "config_revision": revision, "config_boot_id": boot_id},
+        )
+        return
+    cached = live_config.get("_config_get_cache")
+    if cached is not None and cached[0] == revision:
+        connection.send_result(msg["id"], cached[1])
+        return
+
     config_source = live_config.get("_stored_config_cache") or {
         "rooms": live_config.get("rooms", []),
         CONF_SOURCE_FAVORITES: live_config.get(CONF_SOURCE_FAVORITES, []),
@@ -847,9 +1507,15 @@ def ws_get_config(hass, connection, msg):
         "batch_unjoin": live_config.get("batch_unjoin", False),
         "native_room_popup": live_config.get("native_room_popup", True),
         "portal_media_player": live_config.get("portal_media_player", "ha_default"),
+        "discovery_max_nodes": live_config.get(CONF_DISCOVERY_MAX_NODES, DEFAULT_DISCOVERY_MAX_NODES),
+        "discovery_max_depth": live_config.get(CONF_DISCOVERY_MAX_DEPTH, DEFAULT_DISCOVERY_MAX_DEPTH),
+        "discovery_time_limit": live_config.get(CONF_DISCOVERY_TIME_LIMIT, DEFAULT_DISCOVERY_TIME_LIMIT),
+        "compact_attributes": live_config.get("compact_attributes", False),
+        "log_buffer_size": live_config.get("log_buffer_size", LOG_BUFFER_SIZE),
+        CONF_ZONES: live_config.get(CONF_ZONES, []),
     }
     config = sync_linked_area_rooms(hass, config_source)
-    config = sanitize_runtime_config(config)
+    config = sanitize_runtime_config(config, hass)
     data = {
         "rooms": config.get("rooms", []),
         CONF_SOURCE_FAVORITES: config.get(CONF_SOURCE_FAVORITES, []),
@@ -868,7 +1534,16 @@ def ws_get_config(hass, connection, msg):
         "batch_unjoin": config.get("batch_unjoin", False),
         "native_room_popup": config.get("native_room_popup", True),
         "portal_media_player": config.get("portal_media_player", "ha_default"),
+        "discovery_max_nodes": config.get(CONF_DISCOVERY_MAX_NODES, DEFAULT_DISCOVERY_MAX_NODES),
+        "discovery_max_depth": config.get(CONF_DISCOVERY_MAX_DEPTH, DEFAULT_DISCOVERY_MAX_DEPTH),
+        "discovery_time_limit": config.get(CONF_DISCOVERY_TIME_LIMIT, DEFAULT_DISCOVERY_TIME_LIMIT),
+        "compact_attributes": config.get("compact_attributes", False),
+        "log_buffer_size": config.get("log_buffer_size", LOG_BUFFER_SIZE),
+        CONF_ZONES: config.get(CONF_ZONES, []),
+        "config_revision": revision,
+        "config_boot_id": boot_id,
     }
+    live_config["_config_get_cache"] = (revision, data)
     connection.send_result(msg["id"], data)
 
 @websocket_api.websocket_command({
@@ -886,13 +1561,17 @@ def ws_list_areas(hass, connection, msg):
 @callback
 def ws_save_config(hass, connection, msg):
     """Handle save config command with validation and hot-reload."""
-    new_config = msg["config"]
+    new_config = {
+        key: value
+        for key, value in msg["config"].items()
+        if key not in ("config_revision", "config_boot_id", "not_modified")
+    }
 
     # Phase 2: Configuration Validation
     try:
-        validated_config = CONFIG_SCHEMA({DOMAIN: new_config})[DOMAIN]
+        validated_config = validate_config_schema(new_config, hass)
         validated_config = sync_linked_area_rooms(hass, validated_config)
-        validated_config = sanitize_runtime_config(validated_config)
+        validated_config = sanitize_runtime_config(validated_config, hass)
     except vol.Invalid as err:
         connection.send_error(msg["id"], "invalid_config", str(err))
         return
@@ -915,7 +1594,7 @@ def ws_save_config(hass, connection, msg):
         return
 
     # Update live memory
-    hass.data[DOMAIN]['apply_config'](validated_config)
+    hass.data[DOMAIN]['apply_config'](validated_config, sanitized=True)
     hass.data[DOMAIN]["source_list_revision"] = int(
         hass.data[DOMAIN].get("source_list_revision", 0) or 0
     ) + 1
@@ -929,18 +1608,221 @@ def ws_save_config(hass, connection, msg):
     hass.async_create_task(
         _async_save_config_with_backup(hass, validated_config, store=store)
     )
-    hass.data[DOMAIN]["_stored_config_cache"] = copy.deepcopy(validated_config)
+    hass.data[DOMAIN]["_stored_config_cache"] = validated_config
     hass.async_create_task(update_ags_sensors(validated_config, hass))
 
     connection.send_result(msg["id"])
 
+# Keys the entity platforms read only while (re)building their trackers, so a
+# patch touching them still needs the full reload signal.
+PATCH_RELOAD_KEYS = frozenset({
+    CONF_CREATE_SENSORS,
+    CONF_ZONES,
+    CONF_INTERVAL_SYNC,
+    CONF_SCHEDULE_ENTITY,
+    "default_source_schedule",
+})
+PATCH_SOURCE_KEYS = frozenset({
+    CONF_SOURCE_FAVORITES,
+    CONF_HIDDEN_SOURCE_IDS,
+    CONF_SOURCE_DISPLAY_NAMES,
+    CONF_DEFAULT_SOURCE_ID,
+})
+# The discovered-source catalog has its own store and is only written by the
+# crawler; rooms are patched through the per-room ``rooms`` field.
+PATCH_REJECTED_KEYS = frozenset({CONF_ROOMS, CONF_LAST_DISCOVERED_SOURCES})
+
+
+def _config_key_validators() -> dict:
+    """Return the per-key validators of the top-level AGS config schema."""
+    domain_schema = CONFIG_SCHEMA.schema[DOMAIN]
+    return {str(marker): validator for marker, validator in domain_schema.schema.items()}
+
+
+def _tracked_room_entities(rooms: list) -> tuple:
+    """Return the room names and device ids the platforms subscribe to."""
+    return tuple(
+        (room.get("room"), tuple(device.get("device_id") for device in room.get("devices", [])))
+        for room in rooms or []
+    )
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "ags_service/config/patch",
+    vol.Optional("changes", default={}): dict,
+    vol.Optional("rooms", default={}): dict,
+})
+@callback
+def ws_patch_config(hass, connection, msg):
+    """Apply targeted config changes without a full save and hot-reload."""
+    ags_data = hass.data[DOMAIN]
+    changes = msg.get("changes") or {}
+    room_changes = msg.get("rooms") or {}
+    if not changes and not room_changes:
+        connection.send_result(msg["id"], {"config_revision": ags_data.get("config_revision", 0)})
+        return
+
+    stored_config = ags_data.get("_stored_config_cache")
+    if not isinstance(stored_config, dict):
+        # A patch is merged into the stored document; without one the save
+        # would drop every key the patch does not mention.
+        connection.send_error(
+            msg["id"],
+            "config_not_loaded",
+            "AGS configuration is not loaded yet; save the full config instead.",
+        )
+        return
+
+    next_config = dict(stored_config)
+    validators = _config_key_validators()
+    try:
+        # Only the touched subtrees are validated; the rest of the stored
+        # document was validated when it was last saved.
+        for key, value in changes.items():
+            if key in PATCH_REJECTED_KEYS or key not in validators:
+                raise vol.Invalid(f"Unsupported config patch key: {key}")
+            next_config[key] = vol.Schema(validators[key])(value)
+        if room_changes:
+            rooms = list(next_config.get(CONF_ROOMS, []) or [])
+            positions = {room.get("room"): index for index, room in enumerate(rooms)}
+            for room_name, fields in room_changes.items():
+                if room_name not in positions or not isinstance(fields, dict):
+                    raise vol.Invalid(f"Unknown room in config patch: {room_name}")
+                index = positions[room_name]
+                rooms[index] = ROOM_SCHEMA({**rooms[index], **fields, "room": room_name})
+            next_config[CONF_ROOMS] = rooms
+        next_config = sanitize_runtime_config(next_config, hass)
+    except vol.Invalid as err:
+        connection.send_error(msg["id"], "invalid_config", str(err))
+        return
+
+    if not _config_has_user_data(next_config) and _config_has_user_data(stored_config):
+        connection.send_error(
+            msg["id"],
+            "empty_config_blocked",
+            "Refusing to overwrite existing AGS rooms or sources with an empty config.",
+        )
+        return
+
+    # Sanitizing can adjust keys the patch did not name (e.g. a default source
+    # dropped with its favorite), so every derived value that changed is applied.
+    values = _runtime_config_values(next_config)
+    values.pop(CONF_LAST_DISCOVERED_SOURCES)
+    touched = {key for key, value in values.items() if value != ags_data.get(key)} | set(changes)
+    if room_changes:
+        touched.add(CONF_ROOMS)
+    previous_rooms = ags_data.get(CONF_ROOMS, [])
+    for key in touched:
+        ags_data[key] = values[key] if key in values else next_config.get(key)
+    if CONF_LOG_BUFFER_SIZE in touched:
+        ags_log_handler.set_capacity(ags_data[CONF_LOG_BUFFER_SIZE])
+    if CONF_ROOMS in touched:
+        get_runtime(hass).configured_rooms = [
+            room.get("room") for room in next_config[CONF_ROOMS] if room.get("room")
+        ]
+    if touched & PATCH_SOURCE_KEYS:
+        ags_data["source_list_revision"] = int(ags_data.get("source_list_revision", 0) or 0) + 1
+    revision = _bump_config_revision(hass)
+    ags_data["_stored_config_cache"] = next_config
+
+    store = ags_data["store"]
+    hass.async_create_task(
+        _async_save_config_with_backup(hass, next_config, store=store)
+    )
+
+    needs_reload = bool(touched & PATCH_RELOAD_KEYS) or (
+        CONF_ROOMS in touched
+        and _tracked_room_entities(previous_rooms) != _tracked_room_entities(next_config[CONF_ROOMS])
+    )
+    scopes = {"sources" if key in PATCH_SOURCE_KEYS else key for key in touched}
+    if needs_reload:
+        async_dispatcher_send(hass, SIGNAL_AGS_RELOAD)
+    else:
+        async_dispatcher_send(hass, SIGNAL_AGS_CONFIG_PATCHED, frozenset(scopes))
+    if touched - PATCH_SOURCE_KEYS:
+        hass.async_create_task(update_ags_sensors(ags_data, hass))
+
+    connection.send_result(
+        msg["id"],
+        {"config_revision": revision, "reload": needs_reload, "scopes": sorted(scopes)},
+    )
+
 @websocket_api.websocket_command({
     vol.Required("type"): "ags_service/get_logs",
+    vol.Optional("level"): cv.string,
+    vol.Optional("since"): vol.Coerce(float),
+    vol.Optional("after"): vol.Coerce(int),
+    vol.Optional("boot_id"): cv.string,
+    vol.Optional("limit"): cv.positive_int,
 })
 @callback
 def ws_get_logs(hass, connection, msg):
     """Expose AGS specific logs via WebSocket."""
-    connection.send_result(msg["id"], ags_log_handler.logs)
+    connection.send_result(
+        msg["id"],
+        ags_log_handler.query(
+            level=msg.get("level"),
+            since=msg.get("since"),
+            after=ags_log_handler.cursor(msg.get("after"), msg.get("boot_id")),
+            limit=msg.get("limit"),
+        ),
+    )
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "ags_service/logs/subscribe",
+    vol.Optional("level"): cv.string,
+    vol.Optional("after"): vol.Coerce(int),
+    vol.Optional("boot_id"): cv.string,
+})
+@callback
+def ws_subscribe_logs(hass, connection, msg):
+    """Send buffered AGS log entries, then stream new ones as they arrive."""
+    after = ags_log_handler.cursor(msg.get("after"), msg.get("boot_id"))
+    backlog = ags_log_handler.query(level=msg.get("level"), after=after)
+    min_seq = backlog[-1]["seq"] if backlog else int(after or 0)
+    min_level = ags_log_handler.level_number(msg.get("level"))
+
+    @callback
+    def _forward(entry):
+        if entry["seq"] <= min_seq or entry["levelno"] < min_level:
+            return
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"entries": [entry], "boot_id": ags_log_handler.boot_id})
+        )
+
+    def _listener(entry):
+        # Records can be emitted from executor threads.
+        hass.loop.call_soon_threadsafe(_forward, entry)
+
+    ags_log_handler.listeners.append(_listener)
+
+    @callback
+    def _unsubscribe():
+        if _listener in ags_log_handler.listeners:
+            ags_log_handler.listeners.remove(_listener)
+
+    connection.subscriptions[msg["id"]] = _unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(msg["id"], {"entries": backlog, "boot_id": ags_log_handler.boot_id})
+    )
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "ags_service/apply",
+    **APPLY_FIELDS,
+})
+@callback
+def ws_apply(hass, connection, msg):
+    """Apply room states, a source and a volume as one AGS transaction."""
+    async def _apply():
+        try:
+            result = await async_apply_transaction(hass, hass.data[DOMAIN], **_apply_arguments(msg))
+        except HomeAssistantError as err:
+            connection.send_error(msg["id"], "apply_failed", str(err))
+            return
+        connection.send_result(msg["id"], result)
+
+    hass.async_create_task(_apply())
 
 @websocket_api.websocket_command({
     vol.Required("type"): "ags_service/sources/refresh",
@@ -968,6 +1850,8 @@ def ws_refresh_sources(hass, connection, msg):
                     "source_favorites": len(config.get(CONF_SOURCE_FAVORITES, []) or []),
                     "last_discovered_sources": len(config.get(CONF_LAST_DISCOVERED_SOURCES, []) or []),
                     "default_source_id": config.get(CONF_DEFAULT_SOURCE_ID),
+                    "merge_stats": dict(getattr(media_player_entity, "_last_merge_stats", {}) or {}),
+                    "crawl_stats": dict(getattr(media_player_entity, "_last_crawl_stats", {}) or {}),
                 },
             )
         except Exception as err:
@@ -975,8 +1859,78 @@ def ws_refresh_sources(hass, connection, msg):
 
     hass.async_create_task(_refresh())
 
+@websocket_api.websocket_command({
+    vol.Required("type"): "ags_service/diagnostics/get",
+})
+@callback
+def ws_get_diagnostics(hass, connection, msg):
+    """Expose the on-demand AGS decision diagnostics."""
+    media_player_entity = hass.data.get(DOMAIN, {}).get("media_player_entity")
+    if media_player_entity is None or not hasattr(media_player_entity, "build_diagnostics"):
+        connection.send_error(
+            msg["id"],
+            "media_player_missing",
+            "AGS media player entity is not ready.",
+        )
+        return
+    persistence = hass.data[DOMAIN].get("_config_persistence")
+    connection.send_result(
+        msg["id"],
+        {
+            **media_player_entity.build_diagnostics(),
+            "persistence": persistence.as_dict() if persistence is not None else {},
+        },
+    )
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "ags_service/state/subscribe",
+})
+@callback
+def ws_subscribe_state(hass, connection, msg):
+    """Push an AGS state snapshot, then only the keys that change."""
+    ags_data = hass.data.setdefault(DOMAIN, {})
+    media_player_entity = ags_data.get("media_player_entity")
+    if media_player_entity is None or not hasattr(media_player_entity, "publish_state_snapshot"):
+        connection.send_error(
+            msg["id"],
+            "media_player_missing",
+            "AGS media player entity is not ready.",
+        )
+        return
+
+    revision, snapshot = media_player_entity.publish_state_snapshot()
+
+    @callback
+    def _forward(next_revision, changed):
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"revision": next_revision, "changed": changed})
+        )
+
+    unsub_dispatcher = async_dispatcher_connect(hass, SIGNAL_AGS_STATE, _forward)
+    ags_data["_state_subscribers"] = int(ags_data.get("_state_subscribers", 0) or 0) + 1
+    media_player_entity.sync_state_snapshot_listener()
+
+    @callback
+    def _unsubscribe():
+        unsub_dispatcher()
+        ags_data["_state_subscribers"] = max(0, int(ags_data.get("_state_subscribers", 1) or 1) - 1)
+        current_entity = ags_data.get("media_player_entity")
+        if current_entity is not None and hasattr(current_entity, "sync_state_snapshot_listener"):
+            current_entity.sync_state_snapshot_listener()
+
+    connection.subscriptions[msg["id"]] = _unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(msg["id"], {"revision": revision, "snapshot": snapshot})
+    )
+
 async def async_unload_entry(hass, entry):
     """Unload a config entry and cancel background tasks."""
     # Unload platforms (sensor, switch, media_player)
     unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor", "switch", "media_player"])
+    for unsub in hass.data.get(DOMAIN, {}).pop("_config_registry_listeners", None) or []:
+        unsub()
+    persistence = hass.data.get(DOMAIN, {}).get("_config_persistence")
+    if persistence is not None:
+        await persistence.async_flush()
     return unload_ok
@@ -1,20 +1,57 @@
 # ags_service .py
 import logging
 import asyncio
+import contextvars
+import itertools
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_state_change_event
 from .source_utils import (
     CONF_DEFAULT_SOURCE_ID,
+    CONF_HIDDEN_SOURCE_IDS,
+    CONF_SOURCE_DISPLAY_NAMES,
+    CONF_SOURCE_FAVORITES,
+    SourceAvailabilityMatrix,
     combine_source_inventory,
     find_source_by_name_or_id,
+    get_source_inventory_view,
+    source_revisions,
 )
+from .records import (
+    TV_MODE_NO_MUSIC,
+    TV_MODE_TV_AUDIO,
+    get_room_records,
+    room_switch_key,
+)
+from .runtime import CURRENT_ZONE, get_runtime, get_zone_data, zone_scope
 
 DOMAIN = "ags_service"
 
-CONF_TV_MODE = 'tv_mode'
-TV_MODE_TV_AUDIO = 'tv_audio'
-TV_MODE_NO_MUSIC = 'no_music'
+CONF_ZONES = 'zones'
+CONF_ZONE = 'zone'
+CONF_ZONE_ID = 'zone_id'
+
+# Global options a zone inherits from the main config. Runtime bookkeeping
+# (stores, caches, futures) stays on hass.data and is never copied.
+ZONE_SHARED_CONFIG_KEYS = (
+    CONF_SOURCE_FAVORITES,
+    CONF_HIDDEN_SOURCE_IDS,
+    CONF_SOURCE_DISPLAY_NAMES,
+    CONF_DEFAULT_SOURCE_ID,
+    'off_override',
+    'create_sensors',
+    'default_on',
+    'disable_tv_source',
+    'interval_sync',
+    'schedule_entity',
+    'default_source_schedule',
+    'batch_unjoin',
+    'native_room_popup',
+    'portal_media_player',
+    'compact_attributes',
+)
 
 SONOS_FAVORITE_PREFIX = "FV:"
 
@@ -22,14 +59,129 @@ SONOS_FAVORITE_PREFIX = "FV:"
 TV_IGNORE_STATES = ['off', 'unavailable', 'unknown', 'standby', 'none', 'power_off', 'sleeping']
 TV_ACTIVE_IGNORE_STATES = TV_IGNORE_STATES + ['idle', 'paused']
 
+# The last AGS decision is persisted so a restart can diff against it
+# instead of regrouping from scratch.
+DECISION_SNAPSHOT_KEYS = (
+    "ags_status",
+    "active_rooms",
+    "primary_speaker",
+    "ags_media_player_source",
+    "ags_media_player_source_id",
+)
+DECISION_SAVE_DELAY = 5
+
 SHORT_ACTION_DELAY = 0.15
 GROUP_SETTLE_DELAY = 0.35
 UNGROUP_TIMEOUT = 3
 GROUP_TIMEOUT = 2.5
+# Switch flips arriving within this window share one recompute.
+SWITCH_COALESCE_DELAY = 0.25
 
 
 _LOGGER = logging.getLogger(__name__)
 
+# Ties together the log records of one sync pass and the media actions it
+# queued, so the panel log view can group them.
+LOG_CORRELATION_ID = contextvars.ContextVar("ags_log_correlation_id", default=None)
+_SYNC_COUNTER = itertools.count(1)
+
+def zone_slug(zone_name: str) -> str:
+    """Return the id used for a zone's entities and runtime state."""
+    safe_zone_id = "".join(c for c in str(zone_name).lower().replace(' ', '_') if c.isalnum() or c == '_')
+    while "__" in safe_zone_id:
+        safe_zone_id = safe_zone_id.replace("__", "_")
+    return safe_zone_id.strip("_")
+
+
+def get_zone_configs(ags_data) -> dict[str, dict]:
+    """Return the config of every extra zone, keyed by zone id.
+
+    A zone config is the main config with the zone's own rooms and name, so
+    the decision engine runs on it unchanged. Sources and global options are
+    shared with the main system. Configs are rebuilt only when the config
+    revision changes.
+    """
+    revision = ags_data.get("config_revision")
+    cached = ags_data.get("_zone_configs")
+    if cached is not None and cached[0] == revision:
+        return cached[1]
+    shared = {key: ags_data[key] for key in ZONE_SHARED_CONFIG_KEYS if key in ags_data}
+    configs = {}
+    for zone in ags_data.get(CONF_ZONES) or []:
+        zone_id = zone_slug(zone.get(CONF_ZONE, ""))
+        if not zone_id:
+            continue
+        configs[zone_id] = {
+            **shared,
+            'rooms': zone.get('rooms', []),
+            'static_name': zone.get('static_name') or zone.get(CONF_ZONE),
+            CONF_ZONE_ID: zone_id,
+        }
+    ags_data["_zone_configs"] = (revision, configs)
+    return configs
+
+
+def get_room_config(ags_data, room_name) -> dict:
+    """Return the config of the zone that owns ``room_name``."""
+    for zone_config in get_zone_configs(ags_data).values():
+        if any(room.get('room') == room_name for room in zone_config['rooms']):
+            return zone_config
+    return ags_data
+
+
+def get_tracked_entity_ids(ags_config) -> set[str]:
+    """Return every entity whose state changes should trigger an AGS update."""
+    tracked = {"zone.home"}
+    schedule_cfg = ags_config.get("schedule_entity")
+    if schedule_cfg and schedule_cfg.get("entity_id"):
+        tracked.add(schedule_cfg["entity_id"])
+    if ags_config.get("create_sensors"):
+        tracked.add("switch.ags_actions")
+    for room in ags_config.get("rooms", []):
+        if room.get("room"):
+            tracked.add(room_switch_key(room["room"]))
+        for device in room.get("devices", []):
+            tracked.add(device["device_id"])
+    return tracked
+
+
+class IncrementalStateTracker:
+    """State-change subscriptions that follow a changing set of entity ids.
+
+    Each entity gets its own subscription, so a reload only subscribes the
+    ids that were added and drops the ones that were removed; listeners for
+    everything else stay in place.
+    """
+
+    def __init__(self, hass, action):
+        self.hass = hass
+        self.action = action
+        self._unsubs = {}
+
+    @property
+    def entity_ids(self) -> set[str]:
+        return set(self._unsubs)
+
+    def update(self, entity_ids) -> tuple[set[str], set[str]]:
+        """Subscribe new ids, unsubscribe missing ones, and return both sets."""
+        wanted = set(entity_ids)
+        added = wanted - self._unsubs.keys()
+        removed = self._unsubs.keys() - wanted
+        for entity_id in removed:
+            self._unsubs.pop(entity_id)()
+        for entity_id in sorted(added):
+            self._unsubs[entity_id] = async_track_state_change_event(
+                self.hass, [entity_id], self.action
+            )
+        if added or removed:
+            _LOGGER.debug("AGS tracker: +%s -%s", sorted(added), sorted(removed))
+        return added, removed
+
+    def clear(self) -> None:
+        """Drop every subscription."""
+        self.update(())
+
+
 def is_active_tv_state(state_obj) -> bool:
     """Return True when a TV media_player should count as actively driving TV mode."""
     return state_obj is not None and state_obj.state.lower() not in TV_ACTIVE_IGNORE_STATES
@@ -59,26 +211,23 @@ def has_active_music_playback(hass: HomeAssistant, speaker_ids: list[str] | None
 
 def get_active_tv_primary_speaker(rooms, hass):
     """Return the highest-priority speaker in an active room with an active TV."""
-    active_rooms = set(hass.data.get("active_rooms", []) or [])
+    runtime = get_runtime(hass)
+    active_rooms = set(runtime.active_rooms or [])
     candidates = []
 
-    for room in rooms:
-        if room.get("room") not in active_rooms:
+    for room in get_room_records(rooms).rooms:
+        if room.name not in active_rooms:
             continue
 
         tv_active = any(
-            device.get("device_type") == "tv"
-            and is_tv_mode_state(hass.states.get(device["device_id"]))
-            and device.get("tv_mode", TV_MODE_TV_AUDIO) == TV_MODE_TV_AUDIO
-            for device in room.get("devices", [])
+            device.tv_mode == TV_MODE_TV_AUDIO and is_tv_mode_state(hass.states.get(device.device_id))
+            for device in room.tvs
         )
         if not tv_active:
             continue
 
-        for device in room.get("devices", []):
-            if device.get("device_type") != "speaker":
-                continue
-            state = hass.states.get(device["device_id"])
+        for device in room.speakers:
+            state = hass.states.get(device.device_id)
             if state is None or state.state.lower() in TV_IGNORE_STATES:
                 continue
             candidates.append(device)
@@ -86,19 +235,12 @@ def get_active_tv_primary_speaker(rooms, hass):
     if not candidates:
         return None
 
-    candidates.sort(key=lambda item: item.get("priority", 999))
-    return candidates[0]["device_id"]
+    return min(candidates, key=lambda device: device.priority).device_id
 
 
 def get_ranked_speaker_entity_ids(rooms) -> list[str]:
     """Return configured speakers by priority across the whole AGS setup."""
-    speakers = []
-    for room in rooms or []:
-        for device in room.get("devices", []) or []:
-            if device.get("device_type") == "speaker" and device.get("device_id") and not device.get("disabled"):
-                speakers.append(device)
-    speakers.sort(key=lambda item: item.get("priority", 999))
-    return [speaker["device_id"] for speaker in speakers]
+    return list(get_room_records(rooms).ranked_speaker_ids)
 
 
 def get_first_available_speaker(rooms, hass) -> str | None:
@@ -112,12 +254,12 @@ def get_first_available_speaker(rooms, hass) -> str | None:
             return entity_id
     return ranked_speakers[0]
 
-async def _action_worker(hass: HomeAssistant) -> None:
+async def _action_worker(hass: HomeAssistant, queue: asyncio.Queue) -> None:
     """Process queued media_player actions sequentially."""
-    queue = hass.data["ags_service"]["action_queue"]
     while True:
         try:
-            service, data = await queue.get()
+            service, data, correlation_id = await queue.get()
+            LOG_CORRELATION_ID.set(correlation_id)
             try:
                 if service == "delay":
                     await asyncio.sleep(data.get("seconds", 1))
@@ -143,28 +285,33 @@ async def _action_worker(hass: HomeAssistant) -> None:
 
 
 async def ensure_action_queue(hass: HomeAssistant) -> None:
-    """Initialize the media action queue in hass.data if needed."""
-    if "ags_service" not in hass.data:
-        hass.data["ags_service"] = {}
+    """Initialize the current zone's media action queue if needed.
+
+    Every zone has its own queue and worker, so a slow join in one zone
+    never holds up another zone's actions.
+    """
+    zone_data = get_zone_data(hass)
 
-    if "action_queue" not in hass.data["ags_service"]:
-        hass.data["ags_service"]["action_queue"] = asyncio.Queue()
+    if "action_queue" not in zone_data:
+        zone_data["action_queue"] = asyncio.Queue()
 
-    if "action_worker" not in hass.data["ags_service"]:
-        worker = hass.loop.create_task(_action_worker(hass))
-        hass.data["ags_service"]["action_worker"] = worker
+    if "action_worker" not in zone_data:
+        worker = hass.loop.create_task(_action_worker(hass, zone_data["action_queue"]))
+        zone_data["action_worker"] = worker
 
 
 async def enqueue_media_action(hass: HomeAssistant, service: str, data: dict) -> None:
-    """Add a media_player service call to the action queue."""
+    """Add a media_player service call to the current zone's action queue."""
     await ensure_action_queue(hass)
-    await hass.data["ags_service"]["action_queue"].put((service, data))
+    await get_zone_data(hass)["action_queue"].put(
+        (service, data, LOG_CORRELATION_ID.get())
+    )
 
 
 async def wait_for_actions(hass: HomeAssistant) -> None:
-    """Pause until the action queue has been processed."""
+    """Pause until the current zone's action queue has been processed."""
     await ensure_action_queue(hass)
-    await hass.data["ags_service"]["action_queue"].join()
+    await get_zone_data(hass)["action_queue"].join()
 
 
 async def restore_speaker_to_tv_input(
@@ -254,25 +401,28 @@ async def _wait_until_grouped(
 
 def _handle_status_transition(prev_status, new_status, hass):
     """Store and restore the AGS source when toggling TV mode."""
+    runtime = get_runtime(hass)
     if new_status == "ON TV" and prev_status != "ON TV":
-        hass.data["ags_source_before_tv"] = hass.data.get("ags_media_player_source")
+        runtime.ags_source_before_tv = runtime.ags_media_player_source
     elif new_status == "ON" and prev_status == "ON TV":
-        prev_source = hass.data.pop("ags_source_before_tv", None)
+        prev_source = runtime.ags_source_before_tv
+        runtime.ags_source_before_tv = None
         if prev_source not in (None, "", "TV", "Unknown"):
-            hass.data["ags_media_player_source"] = prev_source
-        elif hass.data.get("ags_media_player_source") in ("TV", "Unknown", ""):
-            hass.data.pop("ags_media_player_source", None)
+            runtime.ags_media_player_source = prev_source
+        elif runtime.ags_media_player_source in ("TV", "Unknown", ""):
+            runtime.ags_media_player_source = None
 
 
 def resolve_music_source_name(ags_config, hass, preferred_source=None):
     """Return the best configured non-TV source for music playback."""
+    runtime = get_runtime(hass, (ags_config or {}).get(CONF_ZONE_ID))
     ags_data = hass.data.get("ags_service", {})
-    configured_sources = combine_source_inventory(ags_data)
+    configured_sources = get_source_inventory_view(ags_data).visible
 
     source = preferred_source
 
     if source in (None, "", "TV", "Unknown"):
-        selected_id = hass.data.get("ags_media_player_source_id")
+        selected_id = runtime.ags_media_player_source_id
         selected_source = find_source_by_name_or_id(ags_data, selected_id)
         if selected_source:
             source = selected_source["Source"]
@@ -280,9 +430,9 @@ def resolve_music_source_name(ags_config, hass, preferred_source=None):
     if source in (None, "", "TV", "Unknown"):
         selected_source = find_source_by_name_or_id(
             ags_data,
-            hass.data.get("ags_media_player_source"),
+            runtime.ags_media_player_source,
         )
-        source = selected_source["Source"] if selected_source else hass.data.get("ags_media_player_source")
+        source = selected_source["Source"] if selected_source else runtime.ags_media_player_source
 
     # If no preferred or current source, check the single AGS default source.
     if source in (None, "", "TV", "Unknown"):
@@ -300,46 +450,63 @@ def resolve_music_source_name(ags_config, hass, preferred_source=None):
     return source
 
 
-def _ranked_available_speakers_for_source(ags_config, hass):
-    """Return active speakers first, then configured speakers, in AGS rank order."""
-    ranked = get_ranked_speaker_entity_ids(ags_config.get("rooms", []))
-    active = set(hass.data.get("active_speakers", []) or [])
-    ordered = [entity_id for entity_id in ranked if entity_id in active] or ranked
-    available = []
-    for entity_id in ordered:
-        state = hass.states.get(entity_id)
-        if state is not None and state.state.lower() not in TV_IGNORE_STATES:
-            available.append(entity_id)
-    return available
+def _speaker_is_available(hass, entity_id):
+    state = hass.states.get(entity_id)
+    return state is not None and state.state.lower() not in TV_IGNORE_STATES
 
 
-def _source_available_on_speaker(source, speaker_entity_id):
-    """Return true when source discovery knows a source is available on a speaker."""
-    available_on = source.get("available_on") or []
-    if not available_on:
-        return True
-    return speaker_entity_id in available_on
+def refresh_speaker_availability(matrix, hass):
+    """Update the matrix speaker masks from live speaker states."""
+    runtime = get_runtime(hass)
+    matrix.update_speakers(
+        [entity_id for entity_id in matrix.speakers if _speaker_is_available(hass, entity_id)],
+        runtime.active_speakers or [],
+    )
 
 
-def _pick_source_and_speaker(configured_sources, source_entry, primary_speaker, ags_config, hass):
+def get_source_availability_matrix(ags_config, hass):
+    """Return the speaker x source matrix, rebuilding it only when inputs change."""
+    ags_data = hass.data.setdefault(DOMAIN, {})
+    rooms = ags_config.get("rooms", []) or []
+    view = get_source_inventory_view(ags_data)
+    inputs = source_revisions(ags_data)
+    matrices = ags_data.setdefault("_source_availability", {})
+    cached = matrices.get(ags_config.get(CONF_ZONE_ID))
+    if cached is not None and cached[0] == inputs:
+        return cached[1]
+
+    matrix = SourceAvailabilityMatrix(
+        view.visible,
+        get_ranked_speaker_entity_ids(rooms),
+    )
+    refresh_speaker_availability(matrix, hass)
+    matrices[ags_config.get(CONF_ZONE_ID)] = (inputs, matrix)
+    return matrix
+
+
+def _pick_source_and_speaker(source_entry, primary_speaker, ags_config, hass):
     """Fail over source playback using per-speaker browser discovery metadata."""
+    runtime = get_runtime(hass)
     if not source_entry or not primary_speaker:
         return source_entry, primary_speaker
 
-    if _source_available_on_speaker(source_entry, primary_speaker):
+    matrix = get_source_availability_matrix(ags_config, hass)
+    if matrix.is_available_on(source_entry, primary_speaker):
         return source_entry, primary_speaker
 
-    ranked_speakers = _ranked_available_speakers_for_source(ags_config, hass)
-    for entity_id in ranked_speakers:
-        if _source_available_on_speaker(source_entry, entity_id):
-            hass.data["primary_speaker"] = entity_id
-            return source_entry, entity_id
+    entity_id = matrix.best_speaker(source_entry)
+    if entity_id is not None and not _speaker_is_available(hass, entity_id):
+        # The masks are refreshed on every recompute; catch a speaker that
+        # dropped out since then before handing it the source.
+        refresh_speaker_availability(matrix, hass)
+        entity_id = matrix.best_speaker(source_entry)
+    if entity_id is not None:
+        runtime.primary_speaker = entity_id
+        return source_entry, entity_id
 
-    for fallback_source in configured_sources:
-        if fallback_source.get("id") == source_entry.get("id"):
-            continue
-        if _source_available_on_speaker(fallback_source, primary_speaker):
-            return fallback_source, primary_speaker
+    fallback_source = matrix.fallback_source(primary_speaker, source_entry.get("id"))
+    if fallback_source is not None:
+        return fallback_source, primary_speaker
 
     return source_entry, primary_speaker
 
@@ -452,21 +619,139 @@ async def _resolve_folder_source_to_playable(hass, entity_id, source_info):
 ### Sensor Functions ###
 
 ## update all Sensors Function ##
+def build_decision_snapshot(hass) -> dict:
+    """Return the parts of the current AGS decision worth restoring."""
+    return get_runtime(hass).snapshot(DECISION_SNAPSHOT_KEYS)
+
+
+def seed_warm_start(hass, snapshot) -> None:
+    """Restore the last persisted decision before the first pass after boot.
+
+    The primary speaker and source are put back so the election and source
+    restore pick the same ones again. The first ``update_ags_sensors`` pass
+    then treats the snapshot as the previous state and only acts on real
+    differences.
+    """
+    runtime = get_runtime(hass)
+    if not isinstance(snapshot, dict) or runtime.ags_status is not None:
+        return
+    for key in ("primary_speaker", "ags_media_player_source", "ags_media_player_source_id"):
+        if snapshot.get(key) is not None and getattr(runtime, key) is None:
+            setattr(runtime, key, snapshot[key])
+    runtime.ags_warm_start = snapshot
+    hass.data.setdefault(DOMAIN, {})["_decision_snapshot"] = {
+        key: snapshot.get(key) for key in DECISION_SNAPSHOT_KEYS
+    }
+
+
+def persist_decision_snapshot(hass) -> None:
+    """Schedule a write of the current decision when it changed."""
+    ags_data = hass.data.get(DOMAIN, {})
+    store = ags_data.get("decision_store")
+    if store is None:
+        return
+    snapshot = build_decision_snapshot(hass)
+    if snapshot == ags_data.get("_decision_snapshot"):
+        return
+    ags_data["_decision_snapshot"] = snapshot
+    store.async_delay_save(lambda: snapshot, DECISION_SAVE_DELAY)
+
+
 async def update_ags_sensors(ags_config, hass):
     """Refresh sensor data and trigger the status handler when needed."""
+    token = LOG_CORRELATION_ID.set(f"sync-{next(_SYNC_COUNTER)}")
+    try:
+        with zone_scope(ags_config):
+            return await _update_ags_sensors(ags_config, hass)
+    finally:
+        LOG_CORRELATION_ID.reset(token)
+
+
+async def async_request_update(ags_config, hass):
+    """Run one ``update_ags_sensors`` pass for a burst of switch changes.
+
+    The first request in a zone opens a short window; requests arriving
+    before it closes wait on the same pass instead of queueing their own
+    recompute and status plan. Every caller returns once that pass is done.
+    """
+    with zone_scope(ags_config):
+        zone_data = get_zone_data(hass)
+    pending = zone_data.get("pending_update")
+    if pending is None:
+        pending = zone_data["pending_update"] = hass.loop.create_future()
+
+        async def _run():
+            try:
+                await asyncio.sleep(SWITCH_COALESCE_DELAY)
+                zone_data.pop("pending_update", None)
+                pending.set_result(await update_ags_sensors(ags_config, hass))
+            except Exception as exc:
+                pending.set_exception(exc)
+            except BaseException:
+                # Cancelled on unload or shutdown; release every waiter.
+                pending.cancel()
+                raise
+            finally:
+                if zone_data.get("pending_update") is pending:
+                    zone_data.pop("pending_update", None)
 
+        hass.async_create_background_task(_run(), "ags_service switch update")
+    return await asyncio.shield(pending)
+
+
+async def update_all_zones(hass):
+    """Request a coalesced refresh of the main system and every zone."""
+    ags_data = hass.data.get(DOMAIN)
+    if ags_data is None:
+        return
+    await asyncio.gather(
+        async_request_update(ags_data, hass),
+        *(
+            async_request_update(zone_config, hass)
+            for zone_config in get_zone_configs(ags_data).values()
+        ),
+    )
+
+
+def schedule_startup_refresh(hass) -> None:
+    """Refresh every zone once after HA startup, never during platform setup.
+
+    Platforms and restored switches all ask for this; requests made before the
+    refresh runs share it.
+    """
+    ags_data = hass.data.get(DOMAIN)
+    if ags_data is None or ags_data.get("startup_refresh_pending"):
+        return
+    ags_data["startup_refresh_pending"] = True
+
+    async def _after_started(_event=None):
+        ags_data.pop("startup_refresh_pending", None)
+        if hass.data.get(DOMAIN) is not ags_data:
+            return
+        try:
+            await update_all_zones(hass)
+        except Exception as err:
+            _LOGGER.debug("Deferred AGS startup refresh failed: %s", err)
+
+    if getattr(hass, "is_running", False):
+        hass.async_create_task(_after_started())
+    else:
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _after_started)
+
+
+async def _update_ags_sensors(ags_config, hass):
+    """Recompute AGS status, rooms and speakers for the current zone."""
     # Safety check for domain data during unload or failed setup
     if 'ags_service' not in hass.data:
         _LOGGER.debug("AGS service data not found during sensor update")
         return None, None
 
+    runtime = get_runtime(hass)
     rooms = ags_config.get('rooms', [])
     # We allow the update to proceed even without rooms so that the global
     # system state (switch_media_system_state) can still be managed.
 
-    lock = hass.data.setdefault('ags_service', {}).setdefault(
-        'sensor_lock', asyncio.Lock()
-    )
+    lock = get_zone_data(hass).setdefault('sensor_lock', asyncio.Lock())
 
     should_handle_status = False
     prev_status = None
@@ -476,30 +761,43 @@ async def update_ags_sensors(ags_config, hass):
     async with lock:
         # Call and execute the functions to set sensor values for all of AGS
         get_configured_rooms(rooms, hass)
-        prev_rooms = list(hass.data.get('active_rooms', []) or [])
+        prev_rooms = list(runtime.active_rooms or [])
         get_active_rooms(rooms, hass)
-        new_rooms = list(hass.data.get('active_rooms', []) or [])
-        prev_status = hass.data.get('ags_status')
+        new_rooms = list(runtime.active_rooms or [])
+        prev_status = runtime.ags_status
+        warm_start = runtime.ags_warm_start if prev_status is None else None
+        runtime.ags_warm_start = None
         update_ags_status(ags_config, hass)
         update_speaker_states(rooms, hass)
         get_preferred_primary_speaker(rooms, hass)
         determine_primary_speaker(ags_config, hass)
         get_inactive_tv_speakers(rooms, hass)
         get_browsing_fallback_speaker(rooms, hass)
-        new_status = hass.data.get('ags_status')
+        refresh_speaker_availability(
+            get_source_availability_matrix(ags_config, hass),
+            hass,
+        )
+        new_status = runtime.ags_status
+
+        # After a restart, diff against the persisted decision rather than
+        # "nothing" so an unchanged OFF or ON state sends no actions.
+        if warm_start is not None:
+            prev_status = warm_start.get("ags_status")
+            prev_rooms = list(warm_start.get("active_rooms") or [])
 
         # FIX 7: Startup "Resume" Trigger
         should_handle_status = (
             new_status != prev_status
             or new_rooms != prev_rooms
             or prev_status is None
+            or warm_start is not None
         )
         ## Use in Future release ###
-        #if hass.data.get('primary_speaker') == "none" and hass.data.get('active_speakers') != [] and hass.data.get('preferred_primary_speaker') != "none":
+        #if runtime.primary_speaker == "none" and runtime.active_speakers != [] and runtime.preferred_primary_speaker != "none":
         #    _LOGGER.error("ags source change has been called")
         #    ags_select_source(ags_config, hass)
 
-        sensors = list(hass.data.get('ags_sensors', []) or [])
+        sensors = list(runtime.ags_sensors or [])
         for sensor in sensors:
             try:
                 hass.loop.call_soon_threadsafe(
@@ -512,6 +810,8 @@ async def update_ags_sensors(ags_config, hass):
         await handle_ags_status_change(
             hass, ags_config, new_status, prev_status
         )
+    if CURRENT_ZONE.get() is None:
+        persist_decision_snapshot(hass)
 
     for sensor in sensors:
         try:
@@ -529,38 +829,32 @@ async def update_ags_sensors(ags_config, hass):
 
 ## Get Configured Rooms ##
 def get_configured_rooms(rooms, hass):
-    """Get the list of configured rooms and store it in hass.data."""
+    """Get the list of configured rooms and store it in the runtime state."""
 
+    runtime = get_runtime(hass)
     configured_rooms = [room.get('room') for room in rooms if room.get('room')]
 
-    hass.data['configured_rooms'] = configured_rooms
+    runtime.configured_rooms = configured_rooms
 
     return configured_rooms
 
 ## Function for Active room ###
 def get_active_rooms(rooms, hass):
-    """Fetch the list of active rooms based on switches in hass.data."""
+    """Fetch the list of active rooms based on the room switch flags."""
 
+    runtime = get_runtime(hass)
     active_rooms = []
 
-    for room in rooms:
-        safe_room_id = "".join(c for c in room['room'].lower().replace(' ', '_') if c.isalnum() or c == '_')
-        while "__" in safe_room_id:
-            safe_room_id = safe_room_id.replace("__", "_")
-        room_key = f"switch.{safe_room_id}_media"
-        if not hass.data.get(room_key):
+    for room in get_room_records(rooms).rooms:
+        if not runtime.switch_states.get(room.switch_key):
             continue
 
         skip_room = False
-        for device in room['devices']:
-            if device.get('disabled'):
-                continue
-            if device.get('device_type') != 'tv':
-                continue
-            state = hass.states.get(device['device_id'])
+        for device in room.tvs:
+            state = hass.states.get(device.device_id)
             # FIX 6: Ghost TV expansion
             if is_tv_mode_state(state):
-                if device.get('tv_mode', TV_MODE_TV_AUDIO) == TV_MODE_TV_AUDIO:
+                if device.tv_mode == TV_MODE_TV_AUDIO:
                     skip_room = False
                     break
                 else:
@@ -568,17 +862,18 @@ def get_active_rooms(rooms, hass):
         if skip_room:
             continue
 
-        active_rooms.append(room['room'])
+        active_rooms.append(room.name)
 
-    # Store the list of active rooms in hass.data
-    hass.data['active_rooms'] = active_rooms
+    # Store the list of active rooms in the runtime state
+    runtime.active_rooms = active_rooms
     return active_rooms
 
 ### Function to Update Status ###
 def update_ags_status(ags_config, hass):
+    runtime = get_runtime(hass)
     rooms = ags_config.get('rooms', [])
-    active_rooms = hass.data.get('active_rooms', [])
-    prev_status = hass.data.get('ags_status')
+    active_rooms = runtime.active_rooms or []
+    prev_status = runtime.ags_status
 
     # Default status to OFF
     ags_status = "OFF"
@@ -590,36 +885,28 @@ def update_ags_status(ags_config, hass):
             _LOGGER.warning("zone.home entity not found; skipping zone check")
         elif str(zone_state.state) == '0' or (zone_state.state.isdigit() and int(zone_state.state) == 0):
             ags_status = "OFF"
-            hass.data['ags_status'] = ags_status
+            runtime.ags_status = ags_status
             return ags_status
 
     # Prepare a dictionary of device states
-    device_states = {device['device_id']: hass.states.get(device['device_id']) for room in rooms for device in room['devices'] if not device.get('disabled')}
+    room_index = get_room_records(rooms)
+    all_devices = [device for room in room_index.rooms for device in room.devices]
+    device_states = {device.device_id: hass.states.get(device.device_id) for device in all_devices}
 
     # OFF OVERRIDE LOGIC: If off_override is enabled AND any speaker is playing, force system ON
     if ags_config.get('off_override', False):
-        any_playing = False
-        for room in rooms:
-            for device in room['devices']:
-                if device.get('disabled'):
-                    continue
-                if device.get('device_type') == 'speaker':
-                    state = device_states.get(device['device_id'])
-                    if state and state.state.lower() not in TV_IGNORE_STATES:
-                        any_playing = True
-                        break
-            if any_playing:
-                break
+        any_playing = any(
+            (state := device_states.get(device.device_id)) and state.state.lower() not in TV_IGNORE_STATES
+            for room in room_index.rooms
+            for device in room.speakers
+        )
 
         if any_playing:
-            hass.data['switch_media_system_state'] = True
+            runtime.switch_media_system_state = True
 
     # Check for override on any device
-    all_devices = [device for room in rooms for device in room['devices'] if not device.get('disabled')]
-    sorted_devices = sorted(all_devices, key=lambda x: x.get('priority', 0))
-
-    for device in sorted_devices:
-        device_state = device_states.get(device['device_id'])
+    for device in all_devices:
+        device_state = device_states.get(device.device_id)
         if device_state:
             attrs = device_state.attributes
             media_content_id = attrs.get('media_content_id', '')
@@ -627,23 +914,23 @@ def update_ags_status(ags_config, hass):
             media_title = attrs.get('media_title', '')
 
             # FIX 4: Expand override check
-            override_val = device.get('override_content')
+            override_val = device.override_content
             if override_val:
                 if (override_val in str(media_content_id) or
                     override_val in str(source) or
                     override_val in str(media_title)):
                     # Force the media system switch ON if an override is actively playing
-                    hass.data['switch_media_system_state'] = True
+                    runtime.switch_media_system_state = True
                     ags_status = "Override"
                     _handle_status_transition(prev_status, ags_status, hass)
-                    hass.data['ags_status'] = ags_status
+                    runtime.ags_status = ags_status
                     return ags_status
 
 
     # Determine schedule entity state if configured
     schedule_cfg = hass.data['ags_service'].get('schedule_entity')
     schedule_on = True
-    prev_schedule_state = hass.data.get('schedule_prev_state')
+    prev_schedule_state = runtime.schedule_prev_state
     if schedule_cfg:
         state_obj = hass.states.get(schedule_cfg['entity_id'])
         if state_obj is not None:
@@ -664,12 +951,12 @@ def update_ags_status(ags_config, hass):
         and not prev_schedule_state
         and schedule_on
     ):
-        hass.data['switch_media_system_state'] = True
+        runtime.switch_media_system_state = True
 
-    media_system_state = hass.data.get('switch_media_system_state')
+    media_system_state = runtime.switch_media_system_state
     if media_system_state is None:
         media_system_state = ags_config.get('default_on', False)
-        hass.data['switch_media_system_state'] = media_system_state
+        runtime.switch_media_system_state = media_system_state
 
     if schedule_cfg:
 
@@ -681,10 +968,10 @@ def update_ags_status(ags_config, hass):
             # from "on" to "off" so manual re-enablement is possible
             if not schedule_on and prev_schedule_state:
                 media_system_state = False
-                hass.data['switch_media_system_state'] = False
+                runtime.switch_media_system_state = False
 
-            hass.data['schedule_prev_state'] = schedule_on
-            hass.data['schedule_state'] = schedule_on
+            runtime.schedule_prev_state = schedule_on
+            runtime.schedule_state = schedule_on
 
         else:
             # If schedule is OFF and we are not in override mode, the system defaults to OFF
@@ -692,18 +979,18 @@ def update_ags_status(ags_config, hass):
             if not schedule_on and not media_system_state:
                 ags_status = "OFF"
                 _handle_status_transition(prev_status, ags_status, hass)
-                hass.data['ags_status'] = ags_status
-                hass.data['schedule_prev_state'] = schedule_on
-                hass.data['schedule_state'] = schedule_on
+                runtime.ags_status = ags_status
+                runtime.schedule_prev_state = schedule_on
+                runtime.schedule_state = schedule_on
                 return ags_status
 
-            hass.data['schedule_prev_state'] = schedule_on
-            hass.data['schedule_state'] = schedule_on
+            runtime.schedule_prev_state = schedule_on
+            runtime.schedule_state = schedule_on
 
     if not media_system_state:
         ags_status = "OFF"
         _handle_status_transition(prev_status, ags_status, hass)
-        hass.data['ags_status'] = ags_status
+        runtime.ags_status = ags_status
         return ags_status
 
 
@@ -712,27 +999,17 @@ def update_ags_status(ags_config, hass):
     # continues to hold when the room itself is enabled.
     tv_found = False
     active_tv_mode = None
-    for room in rooms:
-        safe_room_id = "".join(c for c in room['room'].lower().replace(' ', '_') if c.isalnum() or c == '_')
-        while "__" in safe_room_id:
-            safe_room_id = safe_room_id.replace("__", "_")
-        room_key = f"switch.{safe_room_id}_media"
-        if not hass.data.get(room_key):
+    for room in room_index.rooms:
+        if not runtime.switch_states.get(room.switch_key):
             continue
 
         room_tv_on = False
         room_tv_audio = False
-        for device in room['devices']:
-            if device.get('disabled'):
-                continue
-            device_state = device_states.get(device['device_id'])
+        for device in room.tvs:
             # FIX 6: Ghost TV expansion
-            if (
-                device.get('device_type') == 'tv'
-                and is_tv_mode_state(device_state)
-            ):
+            if is_tv_mode_state(device_states.get(device.device_id)):
                 room_tv_on = True
-                if device.get('tv_mode', TV_MODE_TV_AUDIO) == TV_MODE_TV_AUDIO:
+                if device.tv_mode == TV_MODE_TV_AUDIO:
                     room_tv_audio = True
 
         if room_tv_on:
@@ -742,40 +1019,40 @@ def update_ags_status(ags_config, hass):
             elif active_tv_mode != TV_MODE_TV_AUDIO and active_tv_mode is None:
                 active_tv_mode = TV_MODE_NO_MUSIC
 
-    hass.data['current_tv_mode'] = active_tv_mode if tv_found else None
+    runtime.current_tv_mode = active_tv_mode if tv_found else None
 
     if tv_found:
         if active_tv_mode != TV_MODE_NO_MUSIC:
             ags_status = "ON TV"
             _handle_status_transition(prev_status, ags_status, hass)
-            hass.data['ags_status'] = ags_status
+            runtime.ags_status = ags_status
             return ags_status
 
     ags_status = "ON"
     _handle_status_transition(prev_status, ags_status, hass)
-    hass.data['ags_status'] = ags_status
+    runtime.ags_status = ags_status
     return ags_status
 
 def check_primary_speaker_logic(ags_config, hass):
+    runtime = get_runtime(hass)
     rooms = ags_config.get('rooms', [])
-    ags_status = hass.data.get('ags_status')
-    active_rooms_entity = hass.data.get('active_rooms')
+    room_index = get_room_records(rooms)
+    ags_status = runtime.ags_status
+    active_rooms_entity = runtime.active_rooms
     active_rooms = active_rooms_entity if active_rooms_entity is not None else None
 
     # Get the current primary speaker to check for stickiness
-    current_primary = hass.data.get('primary_speaker')
-    active_speakers = hass.data.get('active_speakers', [])
+    current_primary = runtime.primary_speaker
+    active_speakers = runtime.active_speakers or []
 
     if ags_status == 'Override':
         # ... (keep override logic as is)
         override_devices = []
-        for room in rooms:
-            for device in room['devices']:
-                if device.get('disabled'):
-                    continue
-                override_val = device.get('override_content')
+        for room in room_index.rooms:
+            for device in room.devices:
+                override_val = device.override_content
                 if override_val:
-                    state = hass.states.get(device['device_id'])
+                    state = hass.states.get(device.device_id)
                     if state:
                         attrs = state.attributes
                         if (override_val in str(attrs.get('media_content_id', '')) or
@@ -783,9 +1060,8 @@ def check_primary_speaker_logic(ags_config, hass):
                             override_val in str(attrs.get('media_title', ''))):
                             override_devices.append(device)
 
-        override_devices = sorted(override_devices, key=lambda x: x['priority'])
         if override_devices:
-            return override_devices[0]['device_id']
+            return min(override_devices, key=lambda device: device.priority).device_id
 
     elif ags_status == 'ON TV':
         tv_primary = get_active_tv_primary_speaker(rooms, hass)
@@ -814,56 +1090,42 @@ def check_primary_speaker_logic(ags_config, hass):
                 elif ags_status == "ON" and current_source == "TV":
                     # Only rogue if an actual TV in this room is ACTIVE
                     is_rogue = False
-                    for room in rooms:
-                        if any(d['device_id'] == current_primary for d in room['devices']):
-                            # FIX 6: Ghost TV
-                            if any(
-                                d['device_type'] == 'tv'
-                                and is_tv_mode_state(hass.states.get(d['device_id']))
-                                for d in room['devices']
-                            ):
-                                is_rogue = True
-                            break
+                    primary_room = room_index.device_rooms.get(current_primary)
+                    # FIX 6: Ghost TV
+                    if primary_room is not None and any(
+                        is_tv_mode_state(hass.states.get(d.device_id)) for d in primary_room.tvs
+                    ):
+                        is_rogue = True
 
                 if not is_rogue:
                     # Check if this speaker is in an active room
-                    is_active = False
-                    for room in rooms:
-                        if room['room'] in (active_rooms or []):
-                            if any(d['device_id'] == current_primary for d in room['devices']):
-                                is_active = True
-                                break
+                    is_active = any(
+                        room.name in (active_rooms or [])
+                        and any(d.device_id == current_primary for d in room.devices)
+                        for room in room_index.rooms
+                    )
                     if is_active:
                         return current_primary
 
         # If no sticky master, find the best playing speaker
-        for room in rooms:
-            if active_rooms is not None and room['room'] in active_rooms:
-                sorted_devices = sorted(room["devices"], key=lambda x: x['priority'])
-                tv_on = False
-                for device in sorted_devices:
-                    device_state = hass.states.get(device['device_id'])
-                    # FIX 6: Ghost TV
-                    if device['device_type'] == 'tv' and is_tv_mode_state(device_state):
-                        tv_on = True
-                        break
+        for room in room_index.rooms:
+            if active_rooms is not None and room.name in active_rooms:
+                # FIX 6: Ghost TV
+                tv_on = any(is_tv_mode_state(hass.states.get(d.device_id)) for d in room.tvs)
 
-                for device in sorted_devices:
-                    device_state = hass.states.get(device['device_id'])
+                for device in room.speakers:
+                    device_state = hass.states.get(device.device_id)
                     if device_state is None:
                         continue
 
                     # FIX 5: Allow idle states for initial music from dead stop
-                    if (
-                        device['device_type'] == 'speaker' and
-                        device_state.state.lower() not in ['off', 'unavailable', 'unknown', 'standby']
-                    ):
+                    if device_state.state.lower() not in ['off', 'unavailable', 'unknown', 'standby']:
                         source = device_state.attributes.get('source')
                         if tv_on or (not tv_on and (source is None or source != 'TV')):
-                            return device['device_id']
+                            return device.device_id
 
         # FIX 5: Standalone Room Fallback
-        preferred_primary = hass.data.get('preferred_primary_speaker')
+        preferred_primary = runtime.preferred_primary_speaker
         if preferred_primary and preferred_primary != "none":
             return preferred_primary
 
@@ -873,47 +1135,48 @@ def check_primary_speaker_logic(ags_config, hass):
 def determine_primary_speaker(ags_config, hass):
     """Determine the primary speaker without blocking Home Assistant."""
 
+    runtime = get_runtime(hass)
     # First pass through the logic
     primary_speaker = check_primary_speaker_logic(ags_config, hass)
 
 
     # Store the immediate result
-    hass.data['primary_speaker'] = primary_speaker
+    runtime.primary_speaker = primary_speaker
 
     return primary_speaker
 
 ### Function for Active and Inactive list ###
 def update_speaker_states(rooms, hass):
     # Retrieve the AGS status and media system state
-    ags_status = hass.data.get('ags_status', 'OFF')
+    runtime = get_runtime(hass)
+    ags_status = runtime.ags_status or 'OFF'
 
-    # Fetch the list of active rooms from hass.data
-    active_rooms = hass.data.get('active_rooms', [])
+    # Fetch the list of active rooms from the runtime state
+    active_rooms = runtime.active_rooms or []
 
     # Initialize empty lists for active and inactive speakers
     active_speakers = []
     inactive_speakers = []
 
-    # All speakers list
-    all_speakers = [device['device_id'] for room in rooms for device in room['devices'] if device['device_type'] == 'speaker' and not device.get('disabled')]
+    room_index = get_room_records(rooms)
 
     # If AGS system status is 'OFF' or the media system state is 'off', all speakers are inactive
     if ags_status == 'OFF':
-        inactive_speakers = all_speakers
+        inactive_speakers = list(room_index.speaker_ids)
     else:
-        for room in rooms:
-            for device in room['devices']:
-                if device.get('disabled'):
-                    continue
-                if device['device_type'] == 'speaker':
-                    if room['room'] in active_rooms:
-                        active_speakers.append(device['device_id'])
-                    elif not hass.states.get(device['device_id']) or hass.states.get(device['device_id']).state != 'on':
-                        inactive_speakers.append(device['device_id'])
+        active_names = set(active_rooms)
+        for room in room_index.rooms:
+            if room.name in active_names:
+                active_speakers.extend(device.device_id for device in room.speakers)
+                continue
+            for device in room.speakers:
+                state = hass.states.get(device.device_id)
+                if not state or state.state != 'on':
+                    inactive_speakers.append(device.device_id)
 
-    # Store the lists in hass.data
-    hass.data['active_speakers'] = active_speakers
-    hass.data['inactive_speakers'] = inactive_speakers
+    # Store the lists in the runtime state
+    runtime.active_speakers = active_speakers
+    runtime.inactive_speakers = inactive_speakers
 
     return active_speakers, inactive_speakers
 
@@ -922,107 +1185,105 @@ def update_speaker_states(rooms, hass):
 
 ### Function for Preferred primary speaker ###
 def get_preferred_primary_speaker(rooms, hass):
-    active_speakers = hass.data.get('active_speakers')
+    runtime = get_runtime(hass)
+    active_speakers = runtime.active_speakers
 
     if not active_speakers:
         preferred_primary_speaker = "none"
     else:
-        # Generate a list of all devices in active speakers
-        all_devices = [device for room in rooms for device in room['devices'] if device['device_id'] in active_speakers and not device.get('disabled')]
-
-        # Sort the devices by priority (lowest number first)
-        sorted_devices = sorted(all_devices, key=lambda x: x['priority'])
-
-        # Return the device_id of the highest priority device
-        preferred_primary_speaker = sorted_devices[0]['device_id'] if sorted_devices else "none"
+        # Pick the lowest priority number among the active devices; ties keep
+        # config order.
+        active_ids = set(active_speakers)
+        candidates = [
+            device
+            for room in get_room_records(rooms).rooms
+            for device in room.devices
+            if device.device_id in active_ids
+        ]
+        preferred_primary_speaker = (
+            min(candidates, key=lambda device: device.priority).device_id if candidates else "none"
+        )
 
-    # Write the preferred primary speaker's state to hass.data
-    hass.data['preferred_primary_speaker'] = preferred_primary_speaker
+    # Write the preferred primary speaker's state to the runtime state
+    runtime.preferred_primary_speaker = preferred_primary_speaker
 
     return preferred_primary_speaker
 
 ### Function for Inactive tv Speakers ###
 def get_inactive_tv_speakers(rooms, hass):
-    ags_status = hass.data.get('ags_status')
+    runtime = get_runtime(hass)
+    ags_status = runtime.ags_status
+
+    room_records = get_room_records(rooms).rooms
 
     # If ags_status is OFF, consider all rooms as inactive
     if ags_status == "OFF":
-        inactive_rooms = rooms
+        inactive_rooms = room_records
     else:
-        active_rooms = hass.data.get('active_rooms')
-        inactive_rooms = [room for room in rooms if active_rooms is not None and room['room'] not in active_rooms]
+        active_rooms = runtime.active_rooms
+        inactive_rooms = [room for room in room_records if active_rooms is not None and room.name not in active_rooms]
 
-    inactive_tv_speakers = [device['device_id'] for room in inactive_rooms for device in room['devices'] if device['device_type'] == 'speaker' and not device.get('disabled') and any(d['device_type'] == 'tv' and not d.get('disabled') for d in room['devices'])]
+    inactive_tv_speakers = [device.device_id for room in inactive_rooms if room.tvs for device in room.speakers]
 
-    # Write the inactive TV speakers' state to hass.data
-    hass.data['ags_inactive_tv_speakers'] = inactive_tv_speakers
+    # Write the inactive TV speakers' state to the runtime state
+    runtime.ags_inactive_tv_speakers = inactive_tv_speakers
 
     return inactive_tv_speakers
 
 
+def get_room_tv_control_device(room, hass) -> str | None:
+    """Return the device controlling the top TV of a room record, if any.
+
+    A playing OTT box wins, then the one on the TV's current input, then the
+    highest ranked OTT; without OTT devices the TV itself is used.
+    """
+    if not room.tvs:
+        return None
+    tv_device = room.tvs[0]
+    ott_devices = room.otts_for(tv_device)
+    if not ott_devices:
+        return tv_device.device_id
+
+    # 1. Active Promotion: If any OTT device is playing, it takes priority
+    for ott in ott_devices:
+        ott_state = hass.states.get(ott.device_id)
+        if ott_state and ott_state.state == "playing":
+            return ott.device_id
+
+    # 2. Source Matching: If TV's source matches an OTT's TV Input Name
+    tv_state = hass.states.get(tv_device.device_id)
+    current_input = tv_state.attributes.get('source') if tv_state else None
+    if current_input:
+        for ott in ott_devices:
+            if str(ott.tv_input).strip().lower() == str(current_input).strip().lower():
+                return ott.device_id
+
+    # 3. Ranked Fallback: Pick the highest ranked (lowest priority number) OTT device
+    return ott_devices[0].device_id
+
+
 def get_control_device_id(ags_config, hass):
     """Return the device that should receive control commands."""
-    ags_status = hass.data.get('ags_status')
-    primary_speaker = hass.data.get('primary_speaker')
+    runtime = get_runtime(hass)
+    ags_status = runtime.ags_status
+    primary_speaker = runtime.primary_speaker
 
     if not primary_speaker or primary_speaker == 'none':
-        primary_speaker = hass.data.get('preferred_primary_speaker')
+        primary_speaker = runtime.preferred_primary_speaker
         if not primary_speaker or primary_speaker == 'none':
             primary_speaker = get_first_available_speaker(ags_config.get("rooms", []), hass)
         if primary_speaker:
-            hass.data['primary_speaker'] = primary_speaker
+            runtime.primary_speaker = primary_speaker
 
     if not primary_speaker or primary_speaker == 'none':
         return None
 
-    primary_room = None
-    primary_room_devices = None
-    for room in ags_config.get('rooms', []):
-        for device in room['devices']:
-            if device.get('disabled'):
-                continue
-            if device['device_id'] == primary_speaker:
-                primary_room = room
-                primary_room_devices = room['devices']
-                break
-        if primary_room:
-            break
+    primary_room = get_room_records(ags_config.get('rooms', [])).device_rooms.get(primary_speaker)
 
-    if ags_status == 'ON TV' and primary_room_devices:
-        # Filter and sort TV devices by rank
-        tvs = sorted(
-            [d for d in primary_room_devices if d.get('device_type') == 'tv' and not d.get('disabled')],
-            key=lambda x: x.get('priority', 999),
-        )
-
-        if tvs:
-            tv_device = tvs[0]
-
-            # Find OTT devices linked to this TV
-            ott_devices = sorted(
-                [d for d in primary_room_devices if d.get('device_type') == 'ott' and d.get('parent_tv') == tv_device['device_id'] and not d.get('disabled')],
-                key=lambda x: x.get('priority', 999)
-            )
-
-            if ott_devices:
-                # 1. Active Promotion: If any OTT device is playing, it takes priority
-                for ott in ott_devices:
-                    ott_state = hass.states.get(ott.get('device_id'))
-                    if ott_state and ott_state.state == "playing":
-                        return ott['device_id']
-
-                # 2. Source Matching: If TV's source matches an OTT's TV Input Name
-                tv_state = hass.states.get(tv_device['device_id'])
-                current_input = tv_state.attributes.get('source') if tv_state else None
-                if current_input:
-                    for ott in ott_devices:
-                        if str(ott.get('tv_input')).strip().lower() == str(current_input).strip().lower():
-                            return ott['device_id']
-
-                # 3. Ranked Fallback: Pick the highest ranked (lowest priority number) OTT device
-                return ott_devices[0]['device_id']
-
-            return tv_device['device_id']
+    if ags_status == 'ON TV' and primary_room is not None:
+        tv_control = get_room_tv_control_device(primary_room, hass)
+        if tv_control:
+            return tv_control
 
     primary_state = hass.states.get(primary_speaker) if primary_speaker else None
     if primary_state is not None and primary_state.state.lower() not in TV_IGNORE_STATES:
@@ -1045,7 +1306,13 @@ async def ags_select_source(ags_config, hass, ignore_playing: bool = False):
     is already playing.  Otherwise the function returns early whenever a music
     source is selected while playback is active.
     """
+    with zone_scope(ags_config):
+        await _ags_select_source(ags_config, hass, ignore_playing)
 
+
+async def _ags_select_source(ags_config, hass, ignore_playing):
+    """Internal implementation for ``ags_select_source``."""
+    runtime = get_runtime(hass)
     try:
         actions_switch = hass.states.get("switch.ags_actions")
         actions_enabled = actions_switch.state == "on" if actions_switch else True
@@ -1057,7 +1324,7 @@ async def ags_select_source(ags_config, hass, ignore_playing: bool = False):
         source = resolve_music_source_name(
             ags_config,
             hass,
-            preferred_source=hass.data.get("ags_media_player_source"),
+            preferred_source=runtime.ags_media_player_source,
         )
 
         if not source:
@@ -1066,13 +1333,13 @@ async def ags_select_source(ags_config, hass, ignore_playing: bool = False):
         source_entry = find_source_by_name_or_id(ags_data, source)
         if source_entry:
             source = source_entry["Source"]
-            hass.data["ags_media_player_source_id"] = source_entry["id"]
-        hass.data["ags_media_player_source"] = source
-        status = hass.data.get("ags_status", "OFF")
+            runtime.ags_media_player_source_id = source_entry["id"]
+        runtime.ags_media_player_source = source
+        status = runtime.ags_status or "OFF"
 
         primary_speaker_entity_id = get_control_device_id(ags_config, hass)
         if not primary_speaker_entity_id or primary_speaker_entity_id == "none":
-            primary_speaker_entity_id = hass.data.get("preferred_primary_speaker", "")
+            primary_speaker_entity_id = runtime.preferred_primary_speaker or ""
 
         state = hass.states.get(primary_speaker_entity_id)
         if state is None or state.state == "unavailable":
@@ -1080,11 +1347,11 @@ async def ags_select_source(ags_config, hass, ignore_playing: bool = False):
                 "Primary master %s is unavailable, searching for failover",
                 primary_speaker_entity_id,
             )
-            for spk in hass.data.get("active_speakers", []):
+            for spk in (runtime.active_speakers or []):
                 speaker_state = hass.states.get(spk)
                 if speaker_state and speaker_state.state != "unavailable":
                     primary_speaker_entity_id = spk
-                    hass.data["primary_speaker"] = spk
+                    runtime.primary_speaker = spk
                     state = speaker_state
                     _LOGGER.info("Failover elected: %s", spk)
                     break
@@ -1123,15 +1390,14 @@ async def ags_select_source(ags_config, hass, ignore_playing: bool = False):
 
         if source_entry:
             source_entry, primary_speaker_entity_id = _pick_source_and_speaker(
-                configured_sources,
                 source_entry,
                 primary_speaker_entity_id,
                 ags_config,
                 hass,
             )
             source = source_entry["Source"]
-            hass.data["ags_media_player_source_id"] = source_entry["id"]
-            hass.data["ags_media_player_source"] = source
+            runtime.ags_media_player_source_id = source_entry["id"]
+            runtime.ags_media_player_source = source
             state = hass.states.get(primary_speaker_entity_id)
 
         source_dict = {
@@ -1255,27 +1521,26 @@ async def handle_ags_status_change(hass, ags_config, new_status, old_status):
        status.  If the devices are already grouped and playing the right
        source nothing is sent.
     """
-    handler_lock = hass.data.get(DOMAIN, {}).get("status_handler_lock")
-    if handler_lock is None:
-        handler_lock = asyncio.Lock()
-        hass.data.setdefault(DOMAIN, {})["status_handler_lock"] = handler_lock
+    with zone_scope(ags_config):
+        handler_lock = get_zone_data(hass).setdefault("status_handler_lock", asyncio.Lock())
 
-    async with handler_lock:
-        try:
-            await _handle_ags_status_change(hass, ags_config, new_status, old_status)
-        except Exception as exc:  # pragma: no cover - safety net
-            _LOGGER.exception("Error handling AGS status change: %s", exc)
+        async with handler_lock:
+            try:
+                await _handle_ags_status_change(hass, ags_config, new_status, old_status)
+            except Exception as exc:  # pragma: no cover - safety net
+                _LOGGER.exception("Error handling AGS status change: %s", exc)
 
 
 async def _handle_ags_status_change(hass, ags_config, new_status, old_status):
     """Internal implementation for ``handle_ags_status_change``."""
+    runtime = get_runtime(hass)
     try:
         _LOGGER.debug("AGS status transition: %s -> %s", old_status, new_status)
         # Ensure any prior media actions have finished before evaluating the
         # new state.
         await wait_for_actions(hass)
 
-        current_status = hass.data.get("ags_status")
+        current_status = runtime.ags_status
         if current_status != new_status:
             _LOGGER.debug(
                 "Skipping stale AGS transition %s -> %s; current status is %s",
@@ -1371,8 +1636,8 @@ async def _handle_ags_status_change(hass, ags_config, new_status, old_status):
         # For ON/ON TV decide which speaker should lead the group. Start with
         # the current primary speaker but fall back to the preferred speaker
         # when needed.
-        primary = hass.data.get("primary_speaker")
-        preferred = hass.data.get("preferred_primary_speaker")
+        primary = runtime.primary_speaker
+        preferred = runtime.preferred_primary_speaker
 
         if new_status == "ON TV":
             calculated = get_active_tv_primary_speaker(rooms, hass)
@@ -1384,7 +1649,7 @@ async def _handle_ags_status_change(hass, ags_config, new_status, old_status):
         if not calculated or calculated == "none":
             # FIX 1: Fix "TV_MODE_NO_MUSIC" cleanup loop
             extras = []
-            active_rooms = hass.data.get("active_rooms", [])
+            active_rooms = runtime.active_rooms or []
             for room in rooms:
                 room_tv_no_music = False
                 for device in room['devices']:
@@ -1450,7 +1715,7 @@ async def _handle_ags_status_change(hass, ags_config, new_status, old_status):
 
         active_speakers = [
             spk
-            for spk in hass.data.get("active_speakers", [])
+            for spk in (runtime.active_speakers or [])
             if (spk_state := hass.states.get(spk)) is not None
             and spk_state.state != "unavailable"
         ]
@@ -1535,12 +1800,12 @@ async def _handle_ags_status_change(hass, ags_config, new_status, old_status):
         # Source selection depends on the current status. Browser playback
         # queues its own play_media action after grouping, so avoid racing it
         # with the saved/default AGS source.
-        if hass.data.get("ags_browser_play_pending"):
+        if runtime.ags_browser_play_pending:
             _LOGGER.debug(
                 "Skipping automatic source selection while browser playback is pending"
             )
         elif new_status == "ON TV":
-            if hass.data.get("current_tv_mode", TV_MODE_TV_AUDIO) != TV_MODE_NO_MUSIC:
+            if (runtime.current_tv_mode or TV_MODE_TV_AUDIO) != TV_MODE_NO_MUSIC:
                 if "TV" in (state.attributes.get("source_list") or []) and actions_enabled:
                     if state.attributes.get("source") != "TV":
                         _LOGGER.info("Switching %s to TV source", calculated)
@@ -1553,13 +1818,18 @@ async def _handle_ags_status_change(hass, ags_config, new_status, old_status):
             if actions_enabled:
                 music_is_active = has_active_music_playback(
                     hass,
-                    hass.data.get("active_speakers", []),
+                    (runtime.active_speakers or []),
                 )
                 current_source = state.attributes.get("source")
+                # A bulk apply that names a source asks for it to be played
+                # even when music was already running.
+                source_requested = runtime.ags_source_change_pending
+                runtime.ags_source_change_pending = False
                 should_restore_music = (
                     old_status != "ON"
                     or current_source == "TV"
                     or not music_is_active
+                    or source_requested
                 )
                 if should_restore_music:
                     _LOGGER.info(
@@ -1579,21 +1849,168 @@ async def _handle_ags_status_change(hass, ags_config, new_status, old_status):
     except Exception as exc:  # pragma: no cover - safety net
         _LOGGER.warning("Error handling AGS status change: %s", exc)
 
+def _apply_room_flags(hass, ags_config, rooms, exclusive, source_entry, system) -> list:
+    """Write one zone's room flags, system switch and source for a bulk apply."""
+    runtime = get_runtime(hass)
+    configured = {
+        room.get("room"): room_switch_key(room.get("room"))
+        for room in ags_config.get("rooms", [])
+        if room.get("room")
+    }
+    desired = {
+        name: bool(rooms[name]) if name in rooms else (False if exclusive else None)
+        for name in configured
+    }
+    changed_rooms = []
+    for name, value in desired.items():
+        if value is None or bool(runtime.switch_states.get(configured[name])) == value:
+            continue
+        runtime.switch_states[configured[name]] = value
+        changed_rooms.append(name)
+
+    if system is None and any(desired.values()):
+        system = True
+    if system is not None:
+        runtime.switch_media_system_state = system
+
+    if source_entry is not None:
+        runtime.ags_media_player_source_id = source_entry["id"]
+        runtime.ags_media_player_source = source_entry["Source"]
+        runtime.ags_source_change_pending = True
+    return changed_rooms
+
+
+async def _apply_recompute(hass, ags_config, volume) -> tuple:
+    """Run one zone's update pass and queued source/volume for a bulk apply."""
+    runtime = get_runtime(hass)
+    try:
+        prev_status, new_status = await update_ags_sensors(ags_config, hass)
+        source_requested = runtime.ags_source_change_pending
+        runtime.ags_source_change_pending = False
+        if source_requested and new_status == "ON":
+            await ags_select_source(ags_config, hass, ignore_playing=True)
+    finally:
+        runtime.ags_source_change_pending = False
+
+    active_speakers = list(runtime.active_speakers or [])
+    if volume is not None and active_speakers and new_status != "OFF":
+        await enqueue_media_action(
+            hass,
+            "volume_set",
+            {"entity_id": active_speakers, "volume_level": volume},
+        )
+    return prev_status, new_status, list(runtime.active_rooms or []), active_speakers
+
+
+async def async_apply_transaction(
+    hass,
+    ags_config,
+    *,
+    rooms: dict | None = None,
+    exclusive: bool = False,
+    source: str | None = None,
+    volume: float | None = None,
+    system: bool | None = None,
+) -> dict:
+    """Apply several room states, a source and a volume as one AGS change.
+
+    All room flags and the source are written before a single
+    ``update_ags_sensors`` pass, so the status handler plans one set of
+    join/unjoin and source actions instead of one per toggled room. A
+    volume is queued behind that plan for whichever speakers end up active.
+    Turning any room on also turns the AGS system on unless ``system`` says
+    otherwise.
+
+    Rooms owned by an extra zone are applied to that zone, which gets its
+    own pass. The main system is applied when it owns a named room, when
+    no rooms are named, or when ``exclusive`` turns the others off.
+    """
+    ags_data = hass.data.setdefault(DOMAIN, {})
+    lock = ags_data.setdefault("apply_lock", asyncio.Lock())
+    rooms = rooms or {}
+
+    async with lock:
+        zone_configs = get_zone_configs(ags_data)
+        owners = {
+            room.get("room"): config
+            for config in (ags_config, *zone_configs.values())
+            for room in config.get("rooms", [])
+            if room.get("room")
+        }
+        unknown = sorted(name for name in rooms if name not in owners)
+        if unknown:
+            raise HomeAssistantError(f"Unknown AGS rooms: {', '.join(unknown)}")
+
+        source_entry = None
+        if source:
+            source_entry = find_source_by_name_or_id(ags_data, source)
+            if source_entry is None:
+                raise HomeAssistantError(f"Unknown AGS source: {source}")
+
+        targets = [
+            config
+            for config in (ags_config, *zone_configs.values())
+            if exclusive
+            or any(owners[name] is config for name in rooms)
+            or (config is ags_config and not rooms)
+        ]
+        changed_rooms = []
+        for config in targets:
+            with zone_scope(config):
+                changed_rooms.extend(
+                    _apply_room_flags(hass, config, rooms, exclusive, source_entry, system)
+                )
+
+        # Room switch entities mirror the flags without each toggle running
+        # its own update cycle.
+        for entity in list(ags_data.get("room_switch_entities", {}).values()):
+            entity.sync_from_data()
+
+        results = {}
+        for config in targets:
+            with zone_scope(config):
+                results[config.get(CONF_ZONE_ID)] = await _apply_recompute(hass, config, volume)
+
+    # The main system reports at the top level; a zones-only apply reports
+    # its first zone there and every zone under ``zones``.
+    prev_status, new_status, _rooms, _speakers = results.get(None) or next(iter(results.values()))
+    active_rooms = [name for result in results.values() for name in result[2]]
+    active_speakers = [entity for result in results.values() for entity in result[3]]
+    _LOGGER.info(
+        "AGS bulk apply: rooms changed %s, status %s -> %s, source %s",
+        changed_rooms,
+        prev_status,
+        new_status,
+        source_entry["Source"] if source_entry else None,
+    )
+    result = {
+        "previous_status": prev_status,
+        "status": new_status,
+        "changed_rooms": changed_rooms,
+        "active_rooms": active_rooms,
+        "active_speakers": active_speakers,
+        "source": source_entry["Source"] if source_entry else None,
+        "volume": volume,
+    }
+    zone_results = {
+        zone_id: {"previous_status": values[0], "status": values[1]}
+        for zone_id, values in results.items()
+        if zone_id is not None
+    }
+    if zone_results:
+        result["zones"] = zone_results
+    return result
+
+
 def get_browsing_fallback_speaker(rooms, hass):
     """Pick the highest priority speaker across all rooms for browsing when idle."""
-    all_speakers = []
-    for room in rooms:
-        for device in room['devices']:
-            if device.get('disabled'):
-                continue
-            if device.get('device_type') == 'speaker':
-                all_speakers.append(device)
+    runtime = get_runtime(hass)
+    ranked_speakers = get_room_records(rooms).ranked_speaker_ids
 
-    if not all_speakers:
-        hass.data['browsing_fallback_speaker'] = "none"
+    if not ranked_speakers:
+        runtime.browsing_fallback_speaker = "none"
         return "none"
 
-    sorted_spks = sorted(all_speakers, key=lambda x: x.get('priority', 999))
-    res = sorted_spks[0]['device_id']
-    hass.data['browsing_fallback_speaker'] = res
+    res = ranked_speakers[0]
+    runtime.browsing_fallback_speaker = res
     return res
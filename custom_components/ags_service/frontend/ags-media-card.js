@@ -1476,7 +1476,7 @@ class AgsMediaCard extends HTMLElement {
       source_favorites: sources,
       hidden_source_ids: hidden,
       default_source_id: nextDefault,
-    });
+    }, ["source_favorites", "hidden_source_ids", "default_source_id"]);
     if (this._browseView === 'favorites') {
       this.browseMedia();
     } else {
@@ -1502,7 +1502,8 @@ class AgsMediaCard extends HTMLElement {
       [itemId]: newName.trim(),
     };
     sources[existingIdx].Source = newName.trim();
-    await this.saveConfig({ ...this._config, source_favorites: sources, source_display_names: displayNames });
+    await this.saveConfig({ ...this._config, source_favorites: sources, source_display_names: displayNames },
+      ["source_favorites", "source_display_names"]);
   }
 
   async setAsDefaultSource(index) {
@@ -1516,7 +1517,8 @@ class AgsMediaCard extends HTMLElement {
       source_default: this.getSourceId(s) === itemId
     }));
 
-    await this.saveConfig({ ...this._config, source_favorites: sources, default_source_id: itemId });
+    await this.saveConfig({ ...this._config, source_favorites: sources, default_source_id: itemId },
+      ["source_favorites", "default_source_id"]);
   }
 
   getDefaultSourceEntry() {
@@ -1540,7 +1542,7 @@ class AgsMediaCard extends HTMLElement {
     });
   }
 
-  async saveConfig(config) {
+  async saveConfig(config, changedKeys = null) {
     const payload = this.normalizeServiceConfig(config);
     delete payload.Sources;
     delete payload.favorite_sources;
@@ -1550,7 +1552,17 @@ class AgsMediaCard extends HTMLElement {
     this._config = this.normalizeServiceConfig(config);
     this._preferLocalSourceConfigUntil = Date.now() + 5000;
     try {
-      await this._hass.callWS({ type: "ags_service/config/save", config: payload });
+      if (Array.isArray(changedKeys) && changedKeys.length) {
+        // Source edits only touch a few keys; patching them avoids a full
+        // save and entity reload on the backend.
+        const changes = {};
+        changedKeys.forEach((key) => {
+          if (key in payload) changes[key] = payload[key];
+        });
+        await this._hass.callWS({ type: "ags_service/config/patch", changes });
+      } else {
+        await this._hass.callWS({ type: "ags_service/config/save", config: payload });
+      }
       this.render(true);
     } catch (e) {
       console.error("Failed to save AGS config from card", e);
@@ -1944,7 +1956,9 @@ class AgsMediaCard extends HTMLElement {
       last_discovered_sources: sources,
       default_source_id: sources[0].id,
     };
-    await this.saveConfig(nextConfig);
+    // The discovered catalog belongs to the backend crawler, so only the
+    // favorites and default are patched.
+    await this.saveConfig(nextConfig, ["source_favorites", "default_source_id"]);
     this._browseCache.delete("favorites:root");
   }
 
@@ -6,7 +6,14 @@ class AGSPanel extends HTMLElement {
     this._hasRendered = false;
     this._lastAgsSignature = "";
     this.config = null;
+    this._configRevision = null;
+    this._configBootId = null;
     this.logs = [];
+    this.diagnostics = null;
+    this._diagnosticsRequestId = 0;
+    this._agsStateRevision = null;
+    this._agsStateUnsub = null;
+    this._agsStateSubscribing = false;
     this.activeTab = "home";
     this.selectedRoomIdx = 0;
     this.loading = false;
@@ -48,12 +55,15 @@ class AGSPanel extends HTMLElement {
     this.shadowRoot.addEventListener("keydown", this._stopInputPropagation, true);
     this.shadowRoot.addEventListener("keypress", this._stopInputPropagation, true);
     this.shadowRoot.addEventListener("keyup", this._stopInputPropagation, true);
+    this.subscribeAgsState();
   }
 
   disconnectedCallback() {
     this.shadowRoot.removeEventListener("keydown", this._stopInputPropagation, true);
     this.shadowRoot.removeEventListener("keypress", this._stopInputPropagation, true);
     this.shadowRoot.removeEventListener("keyup", this._stopInputPropagation, true);
+    this.unsubscribeAgsState();
+    this.unsubscribeLogs();
     if (this._configDirty) {
       this.saveConfig({ silent: true });
     }
@@ -76,6 +86,7 @@ class AGSPanel extends HTMLElement {
     this._hass = hass;
 
     if (!oldHass && hass) {
+      this.subscribeAgsState();
       this.initData();
       return;
     }
@@ -98,7 +109,9 @@ class AGSPanel extends HTMLElement {
         this.updateLiveHeader();
         this.updateHomeEntitiesContent();
         this.bindEmbeddedDashboard();
-      } else if ((this.activeTab === "diagnostics" || this.activeTab === "sources") && nextSignature !== this._lastAgsSignature) {
+      } else if (this.activeTab === "diagnostics" && nextSignature !== this._lastAgsSignature) {
+        this.loadDiagnostics();
+      } else if (this.activeTab === "sources" && nextSignature !== this._lastAgsSignature) {
         this.render();
       }
 
@@ -111,6 +124,69 @@ class AGSPanel extends HTMLElement {
     return this._hass;
   }
 
+  subscribeAgsState() {
+    const connection = this.hass?.connection;
+    if (!this.isConnected || this._agsStateUnsub || this._agsStateSubscribing || !connection?.subscribeMessage) {
+      return;
+    }
+    this._agsStateSubscribing = true;
+    connection
+      .subscribeMessage((message) => this.handleAgsStatePush(message), { type: "ags_service/state/subscribe" })
+      .then((unsub) => {
+        this._agsStateSubscribing = false;
+        if (!this.isConnected) {
+          unsub();
+          return;
+        }
+        this._agsStateUnsub = unsub;
+      })
+      .catch(() => {
+        // Older backends: fall back to comparing the entity attributes.
+        this._agsStateSubscribing = false;
+        this._agsStateRevision = null;
+      });
+  }
+
+  unsubscribeAgsState() {
+    if (this._agsStateUnsub) {
+      this._agsStateUnsub();
+      this._agsStateUnsub = null;
+    }
+    this._agsStateRevision = null;
+  }
+
+  handleAgsStatePush(message) {
+    if (!message) return;
+    // Only the revision is kept: views render from the entity attributes,
+    // and a new revision tells them those attributes moved.
+    this._agsStateRevision = message.revision;
+    if (!this.config || !this._hasRendered) return;
+    if (this.activeTab === "diagnostics") {
+      this.loadDiagnostics();
+    } else if (this.activeTab === "sources") {
+      this._lastAgsSignature = this.getAgsStateSignature();
+      this.render();
+    }
+  }
+
+  async loadDiagnostics() {
+    if (!this.hass) {
+      return;
+    }
+    const requestId = ++this._diagnosticsRequestId;
+    try {
+      const diagnostics = await this.hass.callWS({ type: "ags_service/diagnostics/get" });
+      if (requestId !== this._diagnosticsRequestId) return;
+      this.diagnostics = diagnostics || null;
+    } catch (_error) {
+      if (requestId !== this._diagnosticsRequestId) return;
+      this.diagnostics = null;
+    }
+    if (this.activeTab === "diagnostics") {
+      this.render();
+    }
+  }
+
   isScrollableNode(node) {
     if (!(node instanceof HTMLElement)) {
       return false;
@@ -292,7 +368,7 @@ class AGSPanel extends HTMLElement {
       let lastError = null;
       for (let attempt = 0; attempt < 3; attempt += 1) {
         try {
-          config = await this.hass.callWS({ type: "ags_service/config/get" });
+          config = await this.fetchServiceConfig();
           lastError = null;
           break;
         } catch (error) {
@@ -306,7 +382,9 @@ class AGSPanel extends HTMLElement {
       if (runId !== this._initRunId) {
         return;
       }
-      this.config = this.normalizeConfig(config);
+      if (config !== null) {
+        this.config = this.normalizeConfig(config);
+      }
       this.ensureRoomSelection();
       this._configDirty = false;
       this._saveStatus = "";
@@ -314,13 +392,7 @@ class AGSPanel extends HTMLElement {
       this.loading = false;
       this.render();
 
-      this.hass.callWS({ type: "ags_service/get_logs" })
-        .then((logs) => {
-          if (runId !== this._initRunId) return;
-          this.logs = Array.isArray(logs) ? logs : [];
-          this.render();
-        })
-        .catch(() => {});
+      this.fetchLogs();
       return;
     } catch (error) {
       this.error = error.message || String(error);
@@ -330,6 +402,21 @@ class AGSPanel extends HTMLElement {
     this.render();
   }
 
+  async fetchServiceConfig() {
+    // Send the revision we hold so an unchanged config comes back as a tiny
+    // not-modified reply; null means "keep this.config". The boot id makes a
+    // revision from before an HA restart never match the new counter.
+    const request = { type: "ags_service/config/get" };
+    if (this.config && this._configRevision !== null) {
+      request.revision = this._configRevision;
+      request.boot_id = this._configBootId;
+    }
+    const result = await this.hass.callWS(request);
+    this._configRevision = result?.config_revision ?? null;
+    this._configBootId = result?.config_boot_id ?? null;
+    return result?.not_modified ? null : result;
+  }
+
   normalizeConfig(config) {
     const normalizeEntityValue = (value) => {
       const text = String(value || "").trim().toLowerCase();
@@ -359,9 +446,20 @@ class AGSPanel extends HTMLElement {
         batch_unjoin: false,
         native_room_popup: true,
         portal_media_player: "ha_default",
+        discovery_max_nodes: 2000,
+        discovery_max_depth: 4,
+        discovery_time_limit: 90,
+        compact_attributes: false,
+        log_buffer_size: 2000,
+        zones: [],
       };
     }
 
+    const positiveNumber = (value, fallback) => {
+      const number = Number(value);
+      return Number.isFinite(number) && number > 0 ? Math.round(number) : fallback;
+    };
+
     const normalized = {
       rooms: Array.isArray(config.rooms) ? config.rooms : [],
       source_favorites: this.normalizeSourceEntries(
@@ -394,6 +492,13 @@ class AGSPanel extends HTMLElement {
       portal_media_player: ["ha_default", "custom"].includes(config.portal_media_player)
         ? config.portal_media_player
         : "ha_default",
+      discovery_max_nodes: positiveNumber(config.discovery_max_nodes, 2000),
+      discovery_max_depth: positiveNumber(config.discovery_max_depth, 4),
+      discovery_time_limit: positiveNumber(config.discovery_time_limit, 90),
+      compact_attributes: Boolean(config.compact_attributes),
+      log_buffer_size: positiveNumber(config.log_buffer_size, 2000),
+      // Zones have no editor here yet; keep them intact across panel saves.
+      zones: Array.isArray(config.zones) ? config.zones : [],
     };
     normalized.rooms = normalized.rooms.map((room) => {
       const devices = Array.isArray(room?.devices)
@@ -710,14 +815,18 @@ class AGSPanel extends HTMLElement {
     this.render();
     try {
       const result = await this.hass.callWS({ type: "ags_service/sources/refresh" });
-      const config = await this.hass.callWS({ type: "ags_service/config/get" });
-      this.config = this.normalizeConfig(config);
+      const config = await this.fetchServiceConfig();
+      if (config !== null) {
+        this.config = this.normalizeConfig(config);
+      }
       this._sourceCatalogLoaded = false;
       await this.ensureSourceCatalogLoaded(true);
-      this.logs = await this.hass.callWS({ type: "ags_service/get_logs" });
+      await this.fetchLogs();
       this.hass.callService("persistent_notification", "create", {
         title: "AGS Source Refresh",
-        message: `Discovered ${result.last_discovered_sources || 0} source(s); ${result.source_favorites || 0} visible.`,
+        message: result.crawl_stats?.partial
+          ? `Discovery stopped early (${result.crawl_stats.exhausted || "budget"}) after ${result.crawl_stats.entities_completed || 0} of ${result.crawl_stats.entities || 0} speaker(s); it will resume automatically. ${result.last_discovered_sources || 0} source(s) known so far.`
+          : `Discovered ${result.last_discovered_sources || 0} source(s); ${result.source_favorites || 0} visible.`,
       });
     } catch (error) {
       this.error = error.message || String(error);
@@ -779,6 +888,12 @@ class AGSPanel extends HTMLElement {
       return "missing-ags";
     }
 
+    if (this._agsStateRevision !== null) {
+      // Subscribed: the pushed revision marks real AGS changes, and
+      // last_updated catches the hass update that lands after the push.
+      return `${agsState.entity_id}|${agsState.last_updated}|${this._agsStateRevision}`;
+    }
+
     const attributes = agsState.attributes || {};
     return JSON.stringify({
       entity_id: agsState.entity_id,
@@ -796,9 +911,6 @@ class AGSPanel extends HTMLElement {
       ags_all_sources: attributes.ags_all_sources || [],
       dynamic_title: attributes.dynamic_title,
       room_details: attributes.room_details || [],
-      room_diagnostics: attributes.room_diagnostics || [],
-      logic_flags: attributes.logic_flags || [],
-      speaker_candidates: attributes.speaker_candidates || [],
     });
   }
 
@@ -1320,6 +1432,12 @@ class AGSPanel extends HTMLElement {
     this.activeTab = tab;
     this._resetScrollAfterRender = true;
     this.render();
+    if (tab === "diagnostics") {
+      this.loadDiagnostics();
+      this.subscribeLogs();
+    } else {
+      this.unsubscribeLogs();
+    }
     requestAnimationFrame(() => {
       const shell = this.shadowRoot?.querySelector(".shell");
       if (shell) shell.scrollTop = 0;
@@ -2109,10 +2227,78 @@ class AGSPanel extends HTMLElement {
     this.render();
   }
 
+  mergeLogEntries(entries, bootId = null) {
+    if (!Array.isArray(entries)) return false;
+    // Sequence numbers restart with Home Assistant; a new boot id means the
+    // cursor we hold belongs to the previous run.
+    bootId = bootId || entries.find((entry) => entry?.boot_id)?.boot_id;
+    if (bootId && bootId !== this._logBootId) {
+      this._logBootId = bootId;
+      this._logCursor = 0;
+    }
+    if (!entries.length) return false;
+    const cursor = this._logCursor || 0;
+    // Older backends return preformatted strings without a cursor.
+    const fresh = entries.filter((entry) => typeof entry === "string" || (entry?.seq || 0) > cursor);
+    if (!fresh.length) return false;
+    this.logs = [...this.logs, ...fresh].slice(-200);
+    const last = fresh[fresh.length - 1];
+    if (typeof last === "object" && last?.seq) this._logCursor = last.seq;
+    return true;
+  }
+
+  formatLogEntry(entry) {
+    if (typeof entry === "string") return entry;
+    const time = entry?.time ? new Date(entry.time * 1000).toLocaleTimeString() : "";
+    const tag = entry?.correlation_id ? ` [${entry.correlation_id}]` : "";
+    return `${time} - ${entry?.level || ""}${tag} - ${entry?.message || ""}`;
+  }
+
+  renderLogLines() {
+    return this.logs.slice(-20).map((entry) => `<div style="padding:2px 0; border-bottom:1px solid var(--ags-border); white-space:nowrap; overflow:hidden; text-overflow:ellipsis;">${this.escapeHtml(this.formatLogEntry(entry))}</div>`).join("");
+  }
+
+  updateLogView() {
+    const view = this.shadowRoot?.querySelector(".log-view");
+    if (view) view.innerHTML = this.renderLogLines();
+  }
+
+  subscribeLogs() {
+    const connection = this.hass?.connection;
+    if (this._logsUnsub || this._logsSubscribing || !connection?.subscribeMessage) return;
+    this._logsSubscribing = true;
+    const message = { type: "ags_service/logs/subscribe" };
+    if (this._logCursor) Object.assign(message, { after: this._logCursor, boot_id: this._logBootId });
+    connection
+      .subscribeMessage((event) => {
+        if (this.mergeLogEntries(event?.entries, event?.boot_id)) this.updateLogView();
+      }, message)
+      .then((unsub) => {
+        this._logsSubscribing = false;
+        if (!this.isConnected || this.activeTab !== "diagnostics") {
+          unsub();
+          return;
+        }
+        this._logsUnsub = unsub;
+      })
+      .catch(() => {
+        this._logsSubscribing = false;
+      });
+  }
+
+  unsubscribeLogs() {
+    if (this._logsUnsub) {
+      this._logsUnsub();
+      this._logsUnsub = null;
+    }
+  }
+
   async fetchLogs() {
     try {
-      this.logs = await this.hass.callWS({ type: "ags_service/get_logs" });
-      this.render();
+      const message = { type: "ags_service/get_logs", limit: 200 };
+      if (this._logCursor) Object.assign(message, { after: this._logCursor, boot_id: this._logBootId });
+      const entries = await this.hass.callWS(message);
+      if (this.mergeLogEntries(entries)) this.updateLogView();
     } catch (error) {
       // no-op, the logs panel is optional
       // eslint-disable-next-line no-console
@@ -2749,9 +2935,10 @@ class AGSPanel extends HTMLElement {
     const activeRooms = Array.isArray(attributes.active_rooms) ? attributes.active_rooms : [];
     const activeSpeakers = Array.isArray(attributes.active_speakers) ? attributes.active_speakers : [];
     const configuredRooms = Array.isArray(attributes.configured_rooms) ? attributes.configured_rooms : [];
-    const roomDiagnostics = Array.isArray(attributes.room_diagnostics) ? attributes.room_diagnostics : [];
-    const logicFlags = Array.isArray(attributes.logic_flags) ? attributes.logic_flags : [];
-    const speakerCandidates = Array.isArray(attributes.speaker_candidates) ? attributes.speaker_candidates : [];
+    const diagnostics = this.diagnostics || attributes;
+    const roomDiagnostics = Array.isArray(diagnostics.room_diagnostics) ? diagnostics.room_diagnostics : [];
+    const logicFlags = Array.isArray(diagnostics.logic_flags) ? diagnostics.logic_flags : [];
+    const speakerCandidates = Array.isArray(diagnostics.speaker_candidates) ? diagnostics.speaker_candidates : [];
     const master = attributes.primary_speaker || "None";
     const dynamicTitle = attributes.dynamic_title || "AGS System";
 
@@ -2858,7 +3045,7 @@ class AGSPanel extends HTMLElement {
           <button class="secondary-btn" style="padding:4px 12px; font-size:0.8rem;" onclick="this.getRootNode().host.fetchLogs()">Refresh</button>
         </div>
         <div class="log-view" style="max-height:200px; font-size:0.75rem; padding:12px;">
-          ${this.logs.slice(-20).map(line => `<div style="padding:2px 0; border-bottom:1px solid var(--ags-border); white-space:nowrap; overflow:hidden; text-overflow:ellipsis;">${this.escapeHtml(line)}</div>`).join("")}
+          ${this.renderLogLines()}
         </div>
       </section>
     `;
@@ -3573,6 +3760,14 @@ class AGSPanel extends HTMLElement {
                 <input type="checkbox" style="width:20px; height:20px;" ${this.config.native_room_popup !== false ? "checked" : ""} onchange="this.getRootNode().host.updateConfig('native_room_popup', this.checked)" />
               </label>
 
+              <label class="list-select" style="margin:0;">
+                <span>
+                  <span style="display:block; font-weight:800;">Compact entity attributes</span>
+                  <span class="section-help" style="display:block; margin-top:4px;">Leave the hidden and full source catalogs off the AGS media player state. Room details and visible sources stay on the state because the media card and room popup render from them; this panel rebuilds the hidden and full lists from its saved source catalog.</span>
+                </span>
+                <input type="checkbox" style="width:20px; height:20px;" ${this.config.compact_attributes ? "checked" : ""} onchange="this.getRootNode().host.updateConfig('compact_attributes', this.checked)" />
+              </label>
+
               <label>
                 <span>AGS portal media player</span>
                 <select onchange="this.getRootNode().host.updateConfig('portal_media_player', this.value)">
@@ -7,12 +7,29 @@ from homeassistant.components.media_player import (
     MediaPlayerEntityFeature,
 )
 from homeassistant.const import EVENT_HOMEASSISTANT_STARTED, STATE_IDLE
+from homeassistant.core import callback
 from homeassistant.helpers.event import async_call_later, async_track_state_change_event
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
 from homeassistant.helpers import entity_registry as er
 
-from . import DOMAIN, SIGNAL_AGS_RELOAD, _async_save_config_with_backup
+from . import (
+    DEFAULT_DISCOVERY_MAX_DEPTH,
+    DEFAULT_DISCOVERY_MAX_NODES,
+    DEFAULT_DISCOVERY_TIME_LIMIT,
+    DOMAIN,
+    SIGNAL_AGS_CONFIG_PATCHED,
+    SIGNAL_AGS_RELOAD,
+    SIGNAL_AGS_STATE,
+    _async_save_config_with_backup,
+    _runtime_config_values,
+    async_ensure_source_catalog,
+)
 from .ags_service import (
+    IncrementalStateTracker,
+    get_ranked_speaker_entity_ids,
+    get_room_tv_control_device,
+    get_tracked_entity_ids,
+    get_zone_configs,
     update_ags_sensors,
     ags_select_source,
     enqueue_media_action,
@@ -34,22 +51,93 @@ from .source_utils import (
     SOURCE_ORIGIN_MEDIA_BROWSER,
     combine_source_inventory,
     find_source_by_name_or_id,
+    get_source_inventory_view,
+    inputs_unchanged,
     is_legacy_config_source,
     make_browser_source_id,
     normalize_source_entry,
     normalize_source_list,
     split_source_inventory,
 )
+from .records import DeviceType, get_room_records
+from .runtime import get_runtime, zone_scope
 from .source_art import apply_default_source_art, source_artwork_url
 import asyncio
-import copy
 import logging
+import time
 _LOGGER = logging.getLogger(__name__)
 
 STATE_REFRESH_DEBOUNCE = 0.15
 BROWSE_CALL_TIMEOUT = 6
-FAVORITES_CRAWL_DEPTH = 4
 FAVORITES_CRAWL_LIMIT = 250
+DISCOVERY_RESUME_DELAY = 30
+
+# Attributes pushed to ags_service/state/subscribe clients; they cover what
+# the panel and room popup redraw from.
+STATE_SNAPSHOT_KEYS = (
+    "ags_status",
+    "dynamic_title",
+    "active_rooms",
+    "active_speakers",
+    "primary_speaker",
+    "preferred_primary_speaker",
+    "selected_source_name",
+    "source_mode",
+    "source_list_revision",
+    "room_details",
+    "ags_sources",
+)
+
+
+class CrawlBudget:
+    """Node, depth and wall-clock budget shared by one source discovery run."""
+
+    __slots__ = (
+        "max_nodes",
+        "max_depth",
+        "deadline",
+        "started",
+        "nodes",
+        "browse_calls",
+        "depth_reached",
+        "exhausted_reason",
+    )
+
+    def __init__(self, max_nodes, max_depth, time_limit):
+        self.max_nodes = int(max_nodes or 0)
+        self.max_depth = int(max_depth if max_depth is not None else DEFAULT_DISCOVERY_MAX_DEPTH)
+        self.started = time.monotonic()
+        self.deadline = self.started + time_limit if time_limit else None
+        self.nodes = 0
+        self.browse_calls = 0
+        self.depth_reached = 0
+        self.exhausted_reason = None
+
+    def exhausted(self):
+        """Return true once the node or time budget has run out."""
+        if self.exhausted_reason is None:
+            if self.max_nodes and self.nodes >= self.max_nodes:
+                self.exhausted_reason = "max_nodes"
+            elif self.deadline is not None and time.monotonic() >= self.deadline:
+                self.exhausted_reason = "time_limit"
+        return self.exhausted_reason is not None
+
+    def visit(self, depth):
+        """Charge one browse node; return false when the crawl should stop."""
+        if self.exhausted():
+            return False
+        self.nodes += 1
+        self.depth_reached = max(self.depth_reached, depth)
+        return True
+
+    def as_dict(self):
+        return {
+            "nodes": self.nodes,
+            "browse_calls": self.browse_calls,
+            "depth_reached": self.depth_reached,
+            "elapsed": round(time.monotonic() - self.started, 3),
+            "exhausted": self.exhausted_reason,
+        }
 
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """Set up the media player platform."""
@@ -58,7 +146,33 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
     ags_media_player = AGSPrimarySpeakerMediaPlayer(hass, {})
     hass.data.setdefault(DOMAIN, {})["media_player_entity"] = ags_media_player
     async_add_entities([ags_media_player])
+    _attach_media_player(hass, ags_media_player)
+
+    # Every extra zone gets its own player; zones added by a reload get one
+    # on the fly.
+    zone_players = {}
 
+    @callback
+    def add_zone_players():
+        new_players = []
+        for zone_id in get_zone_configs(hass.data[DOMAIN]):
+            if zone_id in zone_players:
+                continue
+            zone_players[zone_id] = AGSPrimarySpeakerMediaPlayer(hass, {}, zone_id=zone_id)
+            new_players.append(zone_players[zone_id])
+        if new_players:
+            async_add_entities(new_players)
+            for player in new_players:
+                _attach_media_player(hass, player)
+
+    add_zone_players()
+    ags_media_player.async_on_remove(
+        async_dispatcher_connect(hass, SIGNAL_AGS_RELOAD, add_zone_players)
+    )
+
+
+def _attach_media_player(hass, ags_media_player):
+    """Keep a player in step with reloads, config patches and its entities."""
     # Ensure the media player is properly registered
     async def reload_handler(_):
         await ags_media_player.async_update()
@@ -68,40 +182,22 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         async_dispatcher_connect(hass, SIGNAL_AGS_RELOAD, reload_handler)
     )
 
-    tracked_entities = set()
-    unsubs = []
-
-    def update_tracked_entities():
-        nonlocal unsubs, tracked_entities
-
-        # Unsubscribe old trackers
-        for unsub in unsubs:
-            unsub()
-        unsubs = []
-        tracked_entities = set(['zone.home'])
-
-        cfg = hass.data[DOMAIN]
-        rooms = cfg.get('rooms', [])
-
-        schedule_cfg = cfg.get('schedule_entity')
-        if schedule_cfg and schedule_cfg.get('entity_id'):
-            tracked_entities.add(schedule_cfg['entity_id'])
+    # Patched config keeps the same tracked entities, so only the entity
+    # itself needs to pick up the new values.
+    async def config_patched_handler(scopes):
+        _LOGGER.debug("AGS: Applying patched config scopes %s", sorted(scopes))
+        await ags_media_player.async_update()
+        ags_media_player.async_write_ha_state()
 
-        if cfg.get("create_sensors"):
-            tracked_entities.add("switch.ags_actions")
+    ags_media_player.async_on_remove(
+        async_dispatcher_connect(hass, SIGNAL_AGS_CONFIG_PATCHED, config_patched_handler)
+    )
 
-        for room in rooms:
-            safe_room_id = "".join(c for c in room.get('room', '').lower().replace(' ', '_') if c.isalnum() or c == '_')
-            if safe_room_id:
-                tracked_entities.add(f"switch.{safe_room_id}_media")
-            for device in room.get("devices", []):
-                tracked_entities.add(device["device_id"])
+    tracker = IncrementalStateTracker(hass, ags_media_player.async_primary_speaker_changed)
 
-        # Create new trackers
-        if tracked_entities:
-            unsubs.append(async_track_state_change_event(
-                hass, list(tracked_entities), ags_media_player.async_primary_speaker_changed
-            ))
+    def update_tracked_entities():
+        tracker.update(get_tracked_entity_ids(ags_media_player.ags_config))
+        ags_media_player.sync_state_snapshot_listener()
 
     # Initial tracking
     update_tracked_entities()
@@ -111,11 +207,8 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         async_dispatcher_connect(hass, SIGNAL_AGS_RELOAD, update_tracked_entities)
     )
 
-    def remove_tracked_entities():
-        for unsub in unsubs:
-            unsub()
-
-    ags_media_player.async_on_remove(remove_tracked_entities)
+    ags_media_player.async_on_remove(tracker.clear)
+    ags_media_player.async_on_remove(ags_media_player.stop_state_snapshot_listener)
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
@@ -124,6 +217,14 @@ async def async_setup_entry(hass, entry, async_add_entities):
 
 class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
     _attr_device_class = MediaPlayerDeviceClass.TV
+    # Large catalog/dashboard payloads stay on the live state but are kept out
+    # of the recorder; automations only need the compact core attributes.
+    _unrecorded_attributes = frozenset({
+        "ags_sources",
+        "ags_hidden_sources",
+        "ags_all_sources",
+        "room_details",
+    })
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
@@ -136,7 +237,7 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
             if restored_source in (None, "", "TV", "Unknown"):
                 restored_source = last_state.attributes.get("source")
             if restored_source not in (None, "", "TV", "Unknown"):
-                self.hass.data["ags_media_player_source"] = restored_source
+                self.runtime.ags_media_player_source = restored_source
         self._refresh_from_data()
         if self.entity_id:
             self.async_write_ha_state()
@@ -157,14 +258,22 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
     @property
     def ags_config(self):
         """Always return the latest config from hass.data."""
-        return self.hass.data.get(DOMAIN, {})
+        ags_data = self.hass.data.get(DOMAIN, {})
+        if self.zone_id is None:
+            return ags_data
+        # A zone removed by a reload leaves its player idle with no rooms.
+        return get_zone_configs(ags_data).get(self.zone_id) or {"rooms": [], "zone_id": self.zone_id}
 
-    def __init__(self, hass, _unused_config):
+    def __init__(self, hass, _unused_config, zone_id=None):
         """Initialize the media player."""
         self.hass = hass
         self._hass = hass
+        self.zone_id = zone_id
+        self.runtime = get_runtime(hass, zone_id)
         self._attr_name = "Whole Home Audio"
-        self.entity_id = "media_player.ags_media_player"
+        self.entity_id = (
+            f"media_player.ags_media_player_{zone_id}" if zone_id else "media_player.ags_media_player"
+        )
         self._state = STATE_IDLE
         self.primary_speaker_entity_id = None
         self.primary_speaker_state = None   # Initialize the attribute
@@ -182,13 +291,19 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
         self._pending_refresh_unsub = None
         self._favorite_refresh_retry_unsub = None
         self._source_inventory_refresh_unsub = None
+        self._state_snapshot_unsub = None
         self._source_inventory_enabled = False
+        self._last_merge_stats = {}
+        self._last_crawl_stats = {}
+        self._attribute_cache = {}
+        self._attribute_entity_ids = None
         self._last_source_mode = None
         self._last_browse_target = None
 
     async def _async_after_homeassistant_started(self):
         """Start non-critical AGS refresh work after HA has completed startup."""
-        self._source_inventory_enabled = True
+        # The source catalog is shared, so only the main player crawls it.
+        self._source_inventory_enabled = self.zone_id is None
         try:
             await update_ags_sensors(self.ags_config, self.hass)
             self._refresh_from_data()
@@ -196,7 +311,8 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
                 self.async_schedule_update_ha_state(True)
         except Exception as err:
             _LOGGER.debug("AGS post-start sensor refresh failed: %s", err)
-        self._schedule_source_inventory_refresh(delay=5, force=True)
+        if self._source_inventory_enabled:
+            self._schedule_source_inventory_refresh(delay=5, force=True)
 
     async def async_will_remove_from_hass(self):
         """Cancel scheduled refresh callbacks."""
@@ -237,94 +353,48 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
 
     async def async_update(self):
         """Fetch latest state."""
-        # Use existing data from hass.data instead of triggering a full sensor update
+        # Use existing runtime state instead of triggering a full sensor update
         # which can lead to circular dependencies.
         self._refresh_from_data()
 
     def _refresh_from_data(self) -> None:
-        """Update cached attributes from ``hass.data`` after sensors refresh."""
-        self.configured_rooms = self.hass.data.get('configured_rooms', None)
-        self.active_rooms = self.hass.data.get('active_rooms', None)
-        self.active_speakers = self.hass.data.get('active_speakers', None)
-        self.inactive_speakers = self.hass.data.get('inactive_speakers', None)
-        self.primary_speaker = self.hass.data.get('primary_speaker', "")
+        """Update cached attributes from the runtime state after sensors refresh."""
+        self.configured_rooms = self.runtime.configured_rooms
+        self.active_rooms = self.runtime.active_rooms
+        self.active_speakers = self.runtime.active_speakers
+        self.inactive_speakers = self.runtime.inactive_speakers
+        self.primary_speaker = self.runtime.primary_speaker or ""
         self.primary_speaker_entity_id = self.primary_speaker if self.primary_speaker and self.primary_speaker != "none" else None
-        self.preferred_primary_speaker = self.hass.data.get('preferred_primary_speaker', None)
-        self.browsing_fallback_speaker = self.hass.data.get('browsing_fallback_speaker', None)
+        self.preferred_primary_speaker = self.runtime.preferred_primary_speaker
+        self.browsing_fallback_speaker = self.runtime.browsing_fallback_speaker
         self.primary_speaker_room = None
         self.primary_speaker_state = None
 
         selected_source = resolve_music_source_name(self.ags_config, self.hass)
         if selected_source is not None:
-            self.hass.data['ags_media_player_source'] = selected_source
+            self.runtime.ags_media_player_source = selected_source
         self.ags_source = self.get_source_value_by_name(selected_source)
-        self.ags_inactive_tv_speakers = self.hass.data.get('ags_inactive_tv_speakers', None)
-        self.ags_status = self.hass.data.get('ags_status', 'OFF')
+        self.ags_inactive_tv_speakers = self.runtime.ags_inactive_tv_speakers
+        self.ags_status = self.runtime.ags_status or 'OFF'
 
-        found_room_obj = None
-        rooms = self.ags_config.get('rooms', [])
-        for room in rooms:
-            for device in room.get("devices", []):
-                if device.get("device_id") == self.hass.data.get('primary_speaker'):
-                    self.primary_speaker_room = room.get("room") or room.get("name") or "Unknown"
-                    found_room_obj = room
-                    break
-            if found_room_obj:
-                break
+        primary_room = get_room_records(self.ags_config.get('rooms', [])).device_rooms.get(
+            self.runtime.primary_speaker
+        )
+        if primary_room is not None:
+            self.primary_speaker_room = primary_room.name or "Unknown"
 
-        tv_mode = self.hass.data.get("current_tv_mode", TV_MODE_TV_AUDIO)
+        tv_mode = self.runtime.current_tv_mode or TV_MODE_TV_AUDIO
 
         if (
             self.ags_status == "ON TV"
             and tv_mode != TV_MODE_NO_MUSIC
-            and self.primary_speaker_room
-            and found_room_obj
+            and primary_room is not None
         ):
-            selected_device_id = None
-
-            sorted_devices = sorted(
-                [device for device in found_room_obj.get("devices", []) if device.get("device_type") == "tv"],
-                key=lambda x: x.get('priority', 999)
+            self.primary_speaker_entity_id = (
+                get_room_tv_control_device(primary_room, self.hass) or self.runtime.primary_speaker
             )
-
-            if sorted_devices:
-                tv_device = sorted_devices[0]
-
-                # Find OTT devices linked to this TV
-                ott_devices = sorted(
-                    [d for d in found_room_obj.get("devices", []) if d.get('device_type') == 'ott' and d.get('parent_tv') == tv_device['device_id']],
-                    key=lambda x: x.get('priority', 999)
-                )
-
-                if ott_devices:
-                    # 1. Active Promotion: If any OTT device is playing, it takes priority
-                    found_ott = None
-                    for ott in ott_devices:
-                        ott_state = self.hass.states.get(ott.get('device_id'))
-                        if ott_state and ott_state.state == "playing":
-                            found_ott = ott['device_id']
-                            break
-
-                    if not found_ott:
-                        # 2. Source Matching: If TV's source matches an OTT's TV Input Name
-                        tv_state = self.hass.states.get(tv_device['device_id'])
-                        current_input = tv_state.attributes.get('source') if tv_state else None
-                        if current_input:
-                            for ott in ott_devices:
-                                if str(ott.get('tv_input')).strip().lower() == str(current_input).strip().lower():
-                                    found_ott = ott['device_id']
-                                    break
-
-                    # 3. Ranked Fallback: Pick the highest ranked (lowest priority number) OTT device
-                    selected_device_id = found_ott if found_ott else ott_devices[0]['device_id']
-                else:
-                    selected_device_id = tv_device["device_id"]
-            else:
-                selected_device_id = self.hass.data.get('primary_speaker', None)
-
-            self.primary_speaker_entity_id = selected_device_id
         else:
-            self.primary_speaker_entity_id = self.hass.data.get('primary_speaker', None)
+            self.primary_speaker_entity_id = self.runtime.primary_speaker
 
         if self.primary_speaker_entity_id:
             self.primary_speaker_state = self.hass.states.get(self.primary_speaker_entity_id)
@@ -365,7 +435,7 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
 
     def _has_active_rooms(self):
         """Return true when AGS has at least one room enabled."""
-        return bool(self.hass.data.get("active_rooms") or self.active_rooms or [])
+        return bool(self.runtime.active_rooms or self.active_rooms or [])
 
     def _real_media_value(self, attrs, *keys):
         """Return metadata only when the player has a non-empty value."""
@@ -382,7 +452,7 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
         return (
             self._real_media_value(attrs, "app_name", "media_channel", "source")
             or self._derive_app_name_from_id(attrs.get("app_id"))
-            or self.hass.data.get("ags_media_player_source")
+            or self.runtime.ags_media_player_source
         )
 
     def _get_command_target_entity_id(self):
@@ -423,13 +493,7 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
 
     def _get_configured_speaker_entity_ids(self):
         """Return all configured speakers in priority order."""
-        speakers = []
-        for room in self.ags_config.get("rooms", []) or []:
-            for device in room.get("devices", []) or []:
-                if device.get("device_type") == "speaker" and device.get("device_id"):
-                    speakers.append(device)
-        speakers.sort(key=lambda item: item.get("priority", 999))
-        return [speaker.get("device_id") for speaker in speakers]
+        return get_ranked_speaker_entity_ids(self.ags_config.get("rooms", []))
 
     def _get_top_configured_speaker_entity_id(self):
         """Return the highest-priority configured speaker even when AGS is idle."""
@@ -673,9 +737,12 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
         seen_nodes=None,
         folder_path=None,
         include_folders=False,
+        budget=None,
     ):
         if depth > max_depth or len(results) >= max_items:
             return
+        if budget is not None and budget.exhausted():
+            return
         if seen_nodes is None:
             seen_nodes = set()
         folder_path = list(folder_path or [])
@@ -683,6 +750,8 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
         for child in self._browse_children(node):
             if len(results) >= max_items:
                 return
+            if budget is not None and not budget.visit(depth):
+                return
             favorite = self._normalize_favorite_source(
                 child,
                 folder_path,
@@ -714,14 +783,19 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
                         seen_nodes=seen_nodes,
                         folder_path=child_path,
                         include_folders=include_folders,
+                        budget=budget,
                     )
 
-                if not content_id:
+                if not content_id or depth + 1 > max_depth:
                     continue
 
                 node_key = (str(content_type or ""), str(content_id or ""))
                 if node_key in seen_nodes:
                     continue
+                if budget is not None:
+                    if budget.exhausted():
+                        return
+                    budget.browse_calls += 1
                 seen_nodes.add(node_key)
                 try:
                     expanded = await self._async_browse_on_entity(
@@ -741,6 +815,7 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
                             seen_nodes=seen_nodes,
                             folder_path=child_path,
                             include_folders=include_folders,
+                            budget=budget,
                         )
                 except Exception as err:
                     _LOGGER.debug("Unable to crawl favorite folder %s: %s", content_id, err)
@@ -790,10 +865,13 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
         max_depth=3,
         depth=0,
         seen_nodes=None,
+        budget=None,
     ):
         """Find and expand a Favorites folder anywhere near the browser root."""
         if node is None or depth > max_depth:
             return None
+        if budget is not None and budget.exhausted():
+            return None
         if seen_nodes is None:
             seen_nodes = set()
 
@@ -802,6 +880,8 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
             return expanded if self._browse_result_has_real_content(expanded) else node
 
         for child in self._browse_children(node):
+            if budget is not None and not budget.visit(depth):
+                return None
             if self._browse_node_looks_like_favorites(child):
                 expanded = await self._expand_browse_node(entity_id, child)
                 return expanded if self._browse_result_has_real_content(expanded) else child
@@ -815,6 +895,8 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
                 continue
             seen_nodes.add(node_key)
             try:
+                if not child_children and budget is not None:
+                    budget.browse_calls += 1
                 child_root = child if child_children else await self._expand_browse_node(entity_id, child)
                 found = await self._async_find_favorites_browse_root(
                     entity_id,
@@ -822,6 +904,7 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
                     max_depth=max_depth,
                     depth=depth + 1,
                     seen_nodes=seen_nodes,
+                    budget=budget,
                 )
                 if found is not None:
                     return found
@@ -829,22 +912,37 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
                 _LOGGER.debug("Unable to inspect favorites candidate %s: %s", child_id, err)
         return None
 
-    def _match_catalog_source(self, catalog, source):
+    @staticmethod
+    def _catalog_match_keys(source):
+        """Return the keys a source is matched on: raw id, casefolded name and value."""
+        return (
+            str(source.get("id") or "").strip(),
+            str(source.get("Source") or "").strip().casefold(),
+            str(source.get("Source_Value") or "").strip().casefold(),
+        )
+
+    def _build_catalog_index(self, catalog):
+        """Index catalog items by every match key, keeping the first position."""
+        index = {}
+        for position, candidate in enumerate(catalog):
+            for key in self._catalog_match_keys(candidate):
+                index.setdefault(key, position)
+        return index
+
+    def _match_catalog_source(self, catalog, source, index=None):
         """Return the browser-backed catalog item that best matches a legacy source."""
         if not source:
             return None
-        name = str(source.get("Source") or "").strip().casefold()
-        value = str(source.get("Source_Value") or "").strip().casefold()
-        source_id = str(source.get("id") or "").strip()
-        for candidate in catalog:
-            candidate_values = {
-                str(candidate.get("id") or "").strip(),
-                str(candidate.get("Source") or "").strip().casefold(),
-                str(candidate.get("Source_Value") or "").strip().casefold(),
-            }
-            if source_id in candidate_values or name in candidate_values or value in candidate_values:
-                return candidate
-        return None
+        if index is None:
+            index = self._build_catalog_index(catalog)
+        # Any key may match any candidate field, so one shared index mirrors
+        # the old field-agnostic scan; the earliest catalog position wins.
+        positions = [
+            index[key]
+            for key in self._catalog_match_keys(source)
+            if key in index
+        ]
+        return catalog[min(positions)] if positions else None
 
     def _merge_browser_favorites(self, ags_data, catalog, native_favorites):
         """Build the visible AGS favorites list from AGS favorites or native Favorites."""
@@ -858,12 +956,22 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
         browser_catalog = normalize_source_list([*native_favorites, *catalog])
 
         existing = normalize_source_list(ags_data.get(CONF_SOURCE_FAVORITES, []) or [])
+        catalog_index = self._build_catalog_index(browser_catalog)
 
         merged = []
         seen_ids = set()
         seen_names = set()
         legacy_default_id = str(ags_data.get(CONF_DEFAULT_SOURCE_ID) or "").strip()
         matched_default_id = None
+        stats = {
+            "catalog": len(browser_catalog),
+            "existing": len(existing),
+            "matched": 0,
+            "kept_user": 0,
+            "native_added": 0,
+            "hidden_skipped": 0,
+            "duplicates_skipped": 0,
+        }
 
         def add_source(source, *, default=False):
             nonlocal matched_default_id
@@ -875,9 +983,11 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
             value = str(normalized.get("Source_Value") or "").strip()
 
             if source_id in hidden_ids or value in hidden_ids:
+                stats["hidden_skipped"] += 1
                 return
 
             if source_id in seen_ids or name_key in seen_names:
+                stats["duplicates_skipped"] += 1
                 return
 
             seen_ids.add(source_id)
@@ -891,8 +1001,9 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
         # Legacy config-only source rows are migration hints; they are never
         # exposed unless a real Media Browser item matches them.
         for source in existing:
-            matched = self._match_catalog_source(browser_catalog, source)
+            matched = self._match_catalog_source(browser_catalog, source, catalog_index)
             if matched:
+                stats["matched"] += 1
                 add_source(
                     {
                         **matched,
@@ -913,6 +1024,7 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
                     ),
                 )
             elif source.get("origin") == "user_favorite" and not is_legacy_config_source(source):
+                stats["kept_user"] += 1
                 add_source(source, default=source.get("source_default", False))
 
         # First successful discovery defaults AGS favorites to the native Media
@@ -921,6 +1033,7 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
         if not merged:
             for source in native_favorites:
                 add_source(source)
+            stats["native_added"] = len(merged)
 
         default_id = matched_default_id or str(ags_data.get(CONF_DEFAULT_SOURCE_ID) or "").strip()
         if default_id and default_id not in seen_ids:
@@ -932,7 +1045,20 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
         for source in merged:
             source["source_default"] = bool(default_id and source["id"] == default_id)
 
-        _LOGGER.info("AGS: Merged sources result: %s items", len(merged))
+        stats["merged"] = len(merged)
+        self._last_merge_stats = stats
+        _LOGGER.info(
+            "AGS: Merged sources result: %s items (catalog %s, existing %s, matched %s, "
+            "kept %s, native %s, hidden %s, duplicates %s)",
+            len(merged),
+            stats["catalog"],
+            stats["existing"],
+            stats["matched"],
+            stats["kept_user"],
+            stats["native_added"],
+            stats["hidden_skipped"],
+            stats["duplicates_skipped"],
+        )
         return merged, default_id
 
     def _append_discovered_sources(self, sources, results, seen):
@@ -997,34 +1123,64 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
             return
 
         ags_data["_source_inventory_refreshing"] = True
+        self._last_merge_stats = {}
+        budget = CrawlBudget(
+            ags_data.get("discovery_max_nodes", DEFAULT_DISCOVERY_MAX_NODES),
+            ags_data.get("discovery_max_depth", DEFAULT_DISCOVERY_MAX_DEPTH),
+            ags_data.get("discovery_time_limit", DEFAULT_DISCOVERY_TIME_LIMIT),
+        )
         try:
-            all_native_favorites = []
+            await async_ensure_source_catalog(self.hass)
             candidates = self._get_browse_target_candidates()
-            _LOGGER.info("AGS source discovery starting with candidates: %s", candidates)
+            # Resume a run that ran out of budget: skip speakers it finished
+            # and start from the favorites it had already collected.
+            checkpoint = ags_data.pop("_discovery_checkpoint", None) or {}
+            completed = [
+                entity_id
+                for entity_id in checkpoint.get("completed", [])
+                if entity_id in candidates
+            ]
+            all_native_favorites = list(checkpoint.get("favorites", []))
+            completed_this_run = 0
+            _LOGGER.info(
+                "AGS source discovery starting with candidates: %s (resuming after %s)",
+                candidates,
+                completed,
+            )
 
             for entity_id in candidates:
+                if entity_id in completed:
+                    continue
+                if budget.exhausted():
+                    break
                 try:
                     state = self.hass.states.get(entity_id)
                     if not state or state.state == "unavailable":
                         continue
 
+                    budget.browse_calls += 1
                     root = await self._async_browse_on_entity(entity_id)
                     if not self._browse_result_has_real_content(root):
                         continue
 
                     # 1. Search for native Favorites folder
                     favorite_results = []
-                    browse_root = await self._async_find_favorites_browse_root(entity_id, root)
+                    browse_root = await self._async_find_favorites_browse_root(
+                        entity_id,
+                        root,
+                        budget=budget,
+                    )
                     if browse_root is not None and self._browse_result_has_real_content(browse_root):
                         await self._async_crawl_favorite_sources(
                             entity_id,
                             browse_root,
                             favorite_results,
                             set(),
-                            max_depth=FAVORITES_CRAWL_DEPTH,
+                            max_depth=budget.max_depth,
                             max_items=FAVORITES_CRAWL_LIMIT,
                             folder_path=["Favorites"],
                             include_folders=True,
+                            budget=budget,
                         )
 
                     if favorite_results:
@@ -1034,9 +1190,35 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
 
                 except Exception as err:
                     _LOGGER.debug("Discovery error on %s: %s", entity_id, err)
+                finally:
+                    # A speaker cut short by the budget is retried on resume,
+                    # unless it is the only progress this run could make.
+                    if not budget.exhausted() or not completed_this_run:
+                        completed.append(entity_id)
+                        completed_this_run += 1
 
             native_favorites = normalize_source_list(all_native_favorites)
             discovered = normalize_source_list(native_favorites)
+            remaining = [entity_id for entity_id in candidates if entity_id not in completed]
+
+            self._last_crawl_stats = {
+                **budget.as_dict(),
+                "entities": len(candidates),
+                "entities_completed": len(completed),
+                "resumed": bool(checkpoint),
+                "partial": bool(remaining),
+                "sources": len(native_favorites),
+            }
+            _LOGGER.info("AGS: Discovery crawl stats: %s", self._last_crawl_stats)
+
+            if remaining:
+                ags_data["_discovery_checkpoint"] = {
+                    "completed": completed,
+                    "favorites": native_favorites,
+                }
+                await self._async_checkpoint_discovered_sources(ags_data, discovered)
+                self._schedule_source_inventory_refresh(delay=DISCOVERY_RESUME_DELAY)
+                return
 
             _LOGGER.info("AGS: Discovery cycle found %s Media Browser favorite source(s)", len(native_favorites))
 
@@ -1061,56 +1243,79 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
                 next_default_id == ags_data.get(CONF_DEFAULT_SOURCE_ID)):
                 return
 
-            # Safely build the new config for persistence
-            stored_cache = ags_data.get("_stored_config_cache")
-            if isinstance(stored_cache, dict) and stored_cache.get("rooms"):
-                active_config = copy.deepcopy(stored_cache)
-            else:
-                # Fallback to reconstructing from live data
-                safe_keys = ("rooms", CONF_HIDDEN_SOURCE_IDS, CONF_SOURCE_DISPLAY_NAMES,
-                           "off_override", "create_sensors", "default_on", "static_name",
-                           "disable_tv_source", "interval_sync", "schedule_entity",
-                           "default_source_schedule", "batch_unjoin", "native_room_popup")
-                active_config = {k: copy.deepcopy(ags_data[k]) for k in safe_keys if k in ags_data}
-
-            active_config.update({
-                CONF_LAST_DISCOVERED_SOURCES: discovered,
-                CONF_SOURCE_FAVORITES: next_favorites,
-                CONF_DEFAULT_SOURCE_ID: next_default_id,
-            })
-            valid_hidden_ids = {
-                str(source.get("id") or "").strip()
-                for source in [*discovered, *next_favorites]
-                if str(source.get("id") or "").strip()
-            }
-            valid_hidden_values = {
-                str(source.get("Source_Value") or "").strip()
-                for source in [*discovered, *next_favorites]
-                if str(source.get("Source_Value") or "").strip()
-            }
-            active_config[CONF_HIDDEN_SOURCE_IDS] = [
-                hidden_id
-                for hidden_id in active_config.get(CONF_HIDDEN_SOURCE_IDS, []) or []
-                if hidden_id in valid_hidden_ids or hidden_id in valid_hidden_values
-            ]
+            await self._async_persist_source_inventory(
+                ags_data,
+                discovered,
+                next_favorites,
+                next_default_id,
+            )
+
+        finally:
+            ags_data.pop("_source_inventory_refreshing", None)
+
+    async def _async_checkpoint_discovered_sources(self, ags_data, partial):
+        """Persist partial discovery results without dropping known catalog items.
 
-            # Cleanup internal keys
-            for key in ("Sources", "favorite_sources", "ExcludedSources", "homekit_player", "media_player_entity"):
-                active_config.pop(key, None)
+        Favorites are left untouched until a run covers every speaker, so a
+        partial crawl can grow the catalog but never hide a favorite.
+        """
+        existing_discovered = normalize_source_list(ags_data.get(CONF_LAST_DISCOVERED_SOURCES, []) or [])
+        discovered = normalize_source_list([*partial, *existing_discovered])
+        if discovered == existing_discovered:
+            return
+        await self._async_persist_source_inventory(
+            ags_data,
+            discovered,
+            normalize_source_list(ags_data.get(CONF_SOURCE_FAVORITES, []) or []),
+            ags_data.get(CONF_DEFAULT_SOURCE_ID),
+        )
 
-            apply_config = ags_data.get("apply_config")
-            if apply_config:
-                apply_config(active_config)
+    async def _async_persist_source_inventory(self, ags_data, discovered, next_favorites, next_default_id):
+        """Apply and save a new discovered catalog and favorites list."""
+        # Safely build the new config for persistence
+        stored_cache = ags_data.get("_stored_config_cache")
+        if isinstance(stored_cache, dict) and stored_cache:
+            active_config = dict(stored_cache)
+        else:
+            # Fallback to reconstructing from live data, using the same keys
+            # apply_config writes so zones and newer settings are kept.
+            active_config = _runtime_config_values(ags_data)
+
+        active_config.update({
+            CONF_LAST_DISCOVERED_SOURCES: discovered,
+            CONF_SOURCE_FAVORITES: next_favorites,
+            CONF_DEFAULT_SOURCE_ID: next_default_id,
+        })
+        valid_hidden_ids = {
+            str(source.get("id") or "").strip()
+            for source in [*discovered, *next_favorites]
+            if str(source.get("id") or "").strip()
+        }
+        valid_hidden_values = {
+            str(source.get("Source_Value") or "").strip()
+            for source in [*discovered, *next_favorites]
+            if str(source.get("Source_Value") or "").strip()
+        }
+        active_config[CONF_HIDDEN_SOURCE_IDS] = [
+            hidden_id
+            for hidden_id in active_config.get(CONF_HIDDEN_SOURCE_IDS, []) or []
+            if hidden_id in valid_hidden_ids or hidden_id in valid_hidden_values
+        ]
 
-            ags_data["_stored_config_cache"] = copy.deepcopy(active_config)
-            ags_data["source_list_revision"] = int(ags_data.get("source_list_revision", 0)) + 1
+        # Cleanup internal keys
+        for key in ("Sources", "favorite_sources", "ExcludedSources", "homekit_player", "media_player_entity"):
+            active_config.pop(key, None)
 
-            await _async_save_config_with_backup(self.hass, active_config, store=ags_data.get("store"))
-            if self.entity_id:
-                self.async_schedule_update_ha_state(True)
+        apply_config = ags_data.get("apply_config")
+        if apply_config:
+            apply_config(active_config)
 
-        finally:
-            ags_data.pop("_source_inventory_refreshing", None)
+        ags_data["_stored_config_cache"] = active_config
+        ags_data["source_list_revision"] = int(ags_data.get("source_list_revision", 0)) + 1
+
+        await _async_save_config_with_backup(self.hass, active_config, store=ags_data.get("store"))
+        if self.entity_id:
+            self.async_schedule_update_ha_state(True)
 
     def _schedule_source_inventory_refresh(self, *, delay: int = 1, force: bool = False):
         """Schedule source discovery without blocking HA startup."""
@@ -1258,6 +1463,61 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
             self.hass, STATE_REFRESH_DEBOUNCE, _refresh
         )
 
+    def _room_details(self):
+        """Return the full room details, rebuilt only when their inputs change."""
+        return self._memoized_attribute(
+            "room_details",
+            (
+                self._config_revision(),
+                tuple(self.active_rooms or []),
+                tuple(self.active_speakers or []),
+                self._attribute_state_inputs(),
+            ),
+            self._build_room_details,
+        )
+
+    def _source_details(self, source_inputs):
+        """Return the full visible source details for ``source_inputs``."""
+        return self._memoized_attribute("ags_sources", source_inputs, self._build_source_details)
+
+    def _config_revision(self):
+        """Return the AGS config revision, bumped by every config write."""
+        return self.hass.data.get(DOMAIN, {}).get("config_revision", 0)
+
+    def _memoized_attribute(self, name, inputs, builder):
+        """Return a cached attribute value while its inputs are unchanged."""
+        cached = self._attribute_cache.get(name)
+        if cached is not None and inputs_unchanged(cached[0], inputs):
+            return cached[1]
+        value = builder()
+        self._attribute_cache[name] = (inputs, value)
+        return value
+
+    def _attribute_state_inputs(self):
+        """Return the live states the room and speaker builders read.
+
+        HA replaces State objects on every change, so this tuple compares equal
+        exactly when none of the rooms' switches or devices changed.
+        """
+        rooms = self.ags_config.get("rooms", [])
+        revision = self._config_revision()
+        cached = self._attribute_entity_ids
+        if cached is None or cached[0] != revision:
+            entity_ids = []
+            for room in get_room_records(rooms).rooms:
+                raw_room_id = "".join(
+                    c for c in room.name.lower().replace(" ", "_") if c.isalnum() or c == "_"
+                )
+                entity_ids.append(f"switch.{raw_room_id}_media")
+                entity_ids.append(room.switch_key)
+                entity_ids.extend(device.device_id for device in room.devices)
+            cached = self._attribute_entity_ids = (revision, tuple(entity_ids))
+        get_state = self.hass.states.get
+        return tuple(get_state(entity_id) for entity_id in cached[1])
+
+    def _source_details_inputs(self):
+        return (get_source_inventory_view(self.hass.data.get(DOMAIN, {})),)
+
     def _build_source_details(self):
         """Expose visible generated AGS music sources for richer frontend rendering."""
         return [
@@ -1318,14 +1578,6 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
             if source.get("Source")
         ]
 
-    def _get_room_switch_entity_id(self, room_name: str) -> str | None:
-        safe_room_id = "".join(
-            c for c in room_name.lower().replace(" ", "_") if c.isalnum() or c == "_"
-        )
-        while "__" in safe_room_id:
-            safe_room_id = safe_room_id.replace("__", "_")
-        return f"switch.{safe_room_id}_media" if safe_room_id else None
-
     def _get_global_block_reason(self) -> str | None:
         """Return the global reason AGS is not actively including rooms."""
         if self.ags_status != "OFF":
@@ -1340,10 +1592,10 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
             return "Zone check is pausing AGS because nobody is home"
 
         schedule_cfg = self.hass.data[DOMAIN].get("schedule_entity")
-        if schedule_cfg and self.hass.data.get("schedule_state") is False:
+        if schedule_cfg and self.runtime.schedule_state is False:
             return "Schedule is currently outside its active window"
 
-        if self.hass.data.get("switch_media_system_state") is False:
+        if self.runtime.switch_media_system_state is False:
             return "AGS system switch is turned off"
 
         return "AGS is idle"
@@ -1358,7 +1610,7 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
             if schedule_cfg and schedule_cfg.get("entity_id")
             else None
         )
-        selected_source = self.hass.data.get("ags_media_player_source")
+        selected_source = self.runtime.ags_media_player_source
 
         return [
             {
@@ -1393,7 +1645,7 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
             },
             {
                 "label": "TV Mode",
-                "value": self.hass.data.get("current_tv_mode") or "None",
+                "value": self.runtime.current_tv_mode or "None",
                 "tone": "info" if self.ags_status == "ON TV" else "neutral",
                 "detail": "TV mode can include rooms or intentionally isolate them",
             },
@@ -1411,26 +1663,21 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
         global_block_reason = self._get_global_block_reason()
         room_diagnostics = []
 
-        for room in self.ags_config.get("rooms", []):
-            room_name = room.get("room", "")
-            switch_entity_id = self._get_room_switch_entity_id(room_name)
-            switch_on = bool(self.hass.data.get(switch_entity_id))
-            speaker_states = []
+        for room in get_room_records(self.ags_config.get("rooms", [])).rooms:
+            room_name = room.name
+            switch_entity_id = room.switch_key
+            switch_on = bool(self.runtime.switch_states.get(switch_entity_id))
+            speaker_states = [self.hass.states.get(device.device_id) for device in room.speakers]
             active_tv_names = []
             no_music_tv = False
 
-            for device in room.get("devices", []):
-                state = self.hass.states.get(device["device_id"])
-                if device.get("device_type") == "speaker":
-                    speaker_states.append(state)
-                if (
-                    device.get("device_type") == "tv"
-                    and is_tv_mode_state(state)
-                ):
+            for device in room.tvs:
+                state = self.hass.states.get(device.device_id)
+                if is_tv_mode_state(state):
                     active_tv_names.append(
-                        state.attributes.get("friendly_name", device["device_id"])
+                        state.attributes.get("friendly_name", device.device_id)
                     )
-                    if device.get("tv_mode", TV_MODE_TV_AUDIO) == TV_MODE_NO_MUSIC:
+                    if device.tv_mode == TV_MODE_NO_MUSIC:
                         no_music_tv = True
 
             available_speakers = [
@@ -1482,10 +1729,8 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
                     "tone": tone,
                     "reason": reason,
                     "active_tv_names": active_tv_names,
-                    "speaker_count": len(
-                        [device for device in room.get("devices", []) if device.get("device_type") == "speaker"]
-                    ),
-                    "device_count": len(room.get("devices", [])),
+                    "speaker_count": len(room.speakers),
+                    "device_count": len(room.devices),
                 }
             )
 
@@ -1499,29 +1744,17 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
         selected = self.primary_speaker
         index = 1
 
-        for room in self.ags_config.get("rooms", []):
-            if room.get("room") not in active_rooms:
+        for room in get_room_records(self.ags_config.get("rooms", [])).rooms:
+            if room.name not in active_rooms:
                 continue
 
             tv_active = any(
-                (
-                    device.get("device_type") == "tv"
-                    and is_tv_mode_state(self.hass.states.get(device["device_id"]))
-                )
-                for device in room.get("devices", [])
-            )
-
-            speakers = sorted(
-                [
-                    device
-                    for device in room.get("devices", [])
-                    if device.get("device_type") == "speaker"
-                ],
-                key=lambda item: item.get("priority", 999),
+                is_tv_mode_state(self.hass.states.get(device.device_id)) for device in room.tvs
             )
 
-            for device in speakers:
-                state = self.hass.states.get(device["device_id"])
+            for device in room.speakers:
+                entity_id = device.device_id
+                state = self.hass.states.get(entity_id)
                 speaker_state = state.state if state else "missing"
                 source = state.attributes.get("source") if state else None
                 available = (
@@ -1530,12 +1763,12 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
                 )
 
                 reason_parts = []
-                if device["device_id"] == selected:
+                if entity_id == selected:
                     reason_parts.append("Selected as current primary")
-                if device["device_id"] == preferred:
+                if entity_id == preferred:
                     reason_parts.append("Best priority in active rooms")
                 if (
-                    device["device_id"] == selected
+                    entity_id == selected
                     and selected not in (None, "none")
                     and preferred not in (None, "none")
                     and selected != preferred
@@ -1549,19 +1782,19 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
                 candidates.append(
                     {
                         "rank": index,
-                        "entity_id": device["device_id"],
+                        "entity_id": entity_id,
                         "friendly_name": (
                             state.attributes.get("friendly_name")
                             if state
-                            else device["device_id"]
+                            else entity_id
                         ),
-                        "room": room.get("room"),
-                        "priority": device.get("priority"),
+                        "room": room.name,
+                        "priority": device.raw.get("priority"),
                         "state": speaker_state,
                         "source": self._get_state_source_label(state),
                         "available": available,
-                        "selected": device["device_id"] == selected,
-                        "preferred": device["device_id"] == preferred,
+                        "selected": entity_id == selected,
+                        "preferred": entity_id == preferred,
                         "reason": "; ".join(reason_parts),
                     }
                 )
@@ -1575,10 +1808,10 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
         active_speakers = set(self.active_speakers or [])
         room_details = []
 
-        for room in self.ags_config.get("rooms", []):
+        for room in get_room_records(self.ags_config.get("rooms", [])).rooms:
             safe_room_id = "".join(
                 c
-                for c in room.get("room", "").lower().replace(" ", "_")
+                for c in room.name.lower().replace(" ", "_")
                 if c.isalnum() or c == "_"
             )
             switch_entity_id = f"switch.{safe_room_id}_media" if safe_room_id else None
@@ -1586,40 +1819,36 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
 
             devices = []
             tv_active = False
-            for device in room.get("devices", []):
-                if device.get("disabled"):
-                    continue
-                state = self.hass.states.get(device["device_id"])
-                device_type = device.get("device_type", "speaker")
-                if (
-                    device_type == "tv"
-                    and is_tv_mode_state(state)
-                ):
+            for device in room.devices:
+                entity_id = device.device_id
+                state = self.hass.states.get(entity_id)
+                is_tv = device.device_type is DeviceType.TV
+                if is_tv and is_tv_mode_state(state):
                     tv_active = True
 
                 devices.append(
                     {
-                        "entity_id": device["device_id"],
+                        "entity_id": entity_id,
                         "friendly_name": (
                             state.attributes.get("friendly_name")
                             if state
-                            else device["device_id"]
+                            else entity_id
                         ),
-                        "device_type": device_type,
-                        "priority": device.get("priority"),
+                        "device_type": device.device_type.value,
+                        "priority": device.raw.get("priority"),
                         "state": state.state if state else None,
                         "source": self._get_state_source_label(state),
-                        "active": device["device_id"] in active_speakers,
-                        "tv_mode": device.get("tv_mode"),
+                        "active": entity_id in active_speakers,
+                        "tv_mode": device.tv_mode if is_tv else None,
                     }
                 )
 
             room_details.append(
                 {
-                    "name": room.get("room"),
+                    "name": room.name,
                     "switch_entity_id": switch_entity_id,
                     "switch_state": switch_state.state if switch_state else "off",
-                    "active": room.get("room") in active_rooms,
+                    "active": room.name in active_rooms,
                     "tv_active": tv_active,
                     "devices": devices,
                 }
@@ -1648,12 +1877,120 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
                 return [device["entity_id"] for device in room.get("devices", [])]
         return []
 
+    def build_diagnostics(self):
+        """Return the on-demand diagnostics tier for the AGS panel.
+
+        These lists explain AGS decisions but are only needed while the panel
+        is open, so they are served over websocket instead of being written
+        with every state change.
+        """
+        rooms = self.ags_config.get("rooms", [])
+        revision = self._config_revision()
+        active_rooms = tuple(self.active_rooms or [])
+        states = self._attribute_state_inputs()
+        return {
+            "logic_flags": self._build_logic_flags(),
+            "room_diagnostics": self._memoized_attribute(
+                "room_diagnostics",
+                (
+                    revision,
+                    active_rooms,
+                    self._get_global_block_reason(),
+                    tuple(
+                        bool(self.runtime.switch_states.get(room.switch_key))
+                        for room in get_room_records(rooms).rooms
+                    ),
+                    states,
+                ),
+                self._build_room_diagnostics,
+            ),
+            "speaker_candidates": self._memoized_attribute(
+                "speaker_candidates",
+                (
+                    revision,
+                    active_rooms,
+                    self.preferred_primary_speaker,
+                    self.primary_speaker,
+                    states,
+                ),
+                self._build_speaker_candidates,
+            ),
+        }
+
+    def build_state_snapshot(self):
+        """Return the compact AGS state pushed to websocket subscribers."""
+        attributes = self.extra_state_attributes
+        snapshot = {key: attributes.get(key) for key in STATE_SNAPSHOT_KEYS}
+        snapshot["state"] = self.state
+        speakers = {}
+        for entity_id in self._snapshot_speaker_ids():
+            state = self.hass.states.get(entity_id)
+            speakers[entity_id] = (
+                [
+                    state.state,
+                    state.attributes.get("volume_level"),
+                    state.attributes.get("is_volume_muted"),
+                ]
+                if state
+                else None
+            )
+        snapshot["speakers"] = speakers
+        return snapshot
+
+    def _snapshot_speaker_ids(self):
+        """Return the speakers whose state is part of the pushed snapshot."""
+        return list(get_room_records(self.ags_config.get("rooms", [])).speaker_ids)
+
+    def publish_state_snapshot(self):
+        """Send changed snapshot keys to subscribers and return the current snapshot."""
+        ags_data = self.hass.data.setdefault(DOMAIN, {})
+        revision, previous = ags_data.get("_state_snapshot") or (0, None)
+        snapshot = self.build_state_snapshot()
+        changed = {
+            key: value
+            for key, value in snapshot.items()
+            if previous is None or previous.get(key) != value
+        }
+        if not changed:
+            return revision, previous
+        revision += 1
+        ags_data["_state_snapshot"] = (revision, snapshot)
+        if previous is not None:
+            async_dispatcher_send(self.hass, SIGNAL_AGS_STATE, revision, changed)
+        return revision, snapshot
+
+    def sync_state_snapshot_listener(self):
+        """Follow this entity and its speakers while state subscribers exist.
+
+        Every write of the AGS entity, whether direct or scheduled, and every
+        speaker volume/mute change arrives as a state_changed event, so the
+        snapshot diff is published from there.
+        """
+        self.stop_state_snapshot_listener()
+        if self.zone_id is not None or not self.hass.data.get(DOMAIN, {}).get("_state_subscribers"):
+            return
+        self._state_snapshot_unsub = async_track_state_change_event(
+            self.hass,
+            [self.entity_id, *self._snapshot_speaker_ids()],
+            self._async_state_snapshot_changed,
+        )
+
+    def stop_state_snapshot_listener(self):
+        """Stop following state changes for subscribers."""
+        if self._state_snapshot_unsub is not None:
+            self._state_snapshot_unsub()
+            self._state_snapshot_unsub = None
+
+    async def _async_state_snapshot_changed(self, _event):
+        """Publish the snapshot diff after a followed entity changed."""
+        if self.hass.data.get(DOMAIN, {}).get("_state_subscribers"):
+            self.publish_state_snapshot()
 
     @property
     def extra_state_attributes(self):
         """Return entity specific state attributes."""
 
-        room_count = len(self.hass.data.get('active_rooms', []))
+        room_count = len(self.runtime.active_rooms or [])
         configured_name = self.name
         if self.primary_speaker_room is None and self.ags_status != "OFF":
             dynamic_title = "All Rooms are Off"
@@ -1668,7 +2005,9 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
             else:
                 dynamic_title = "All Rooms are Off"
 
-        room_details = self._build_room_details()
+        room_details = self._room_details()
+        source_inputs = self._source_details_inputs()
+        ags_sources = self._source_details(source_inputs)
         active_tv_entities = self._build_active_tv_entities(room_details)
         primary_room_devices = self._build_primary_room_devices(room_details)
 
@@ -1687,7 +2026,7 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
             # skip calling ``play_media`` rather than passing an invalid
             # favourite reference.
             "ags_source": self.ags_source,
-            "selected_source_name": self.hass.data.get("ags_media_player_source"),
+            "selected_source_name": self.runtime.ags_media_player_source,
             "ags_inactive_tv_speakers": self.ags_inactive_tv_speakers or [],
             "primary_speaker_room": self.primary_speaker_room,
             "control_device_id": self._get_command_target_entity_id(),
@@ -1695,32 +2034,36 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
             "source_mode": self._get_source_mode(),
             "native_room_popup": self.hass.data.get(DOMAIN, {}).get("native_room_popup", True),
             "source_list_revision": self.hass.data.get(DOMAIN, {}).get("source_list_revision", 0),
-            "current_tv_mode": self.hass.data.get("current_tv_mode"),
+            "current_tv_mode": self.runtime.current_tv_mode,
             "active_tv_entities": active_tv_entities,
             "primary_room_devices": primary_room_devices,
             "primary_room_tv_entities": [
                 entity_id for entity_id in primary_room_devices if entity_id in active_tv_entities
             ],
-            "ags_sources": self._build_source_details(),
-            "ags_hidden_sources": self._build_hidden_source_details(),
-            "ags_all_sources": self._build_all_source_details(),
-            "logic_flags": self._build_logic_flags(),
-            "room_diagnostics": self._build_room_diagnostics(),
-            "speaker_candidates": self._build_speaker_candidates(),
+            "ags_sources": ags_sources,
             "room_details": room_details,
         }
+        # The card and room popup render from room_details and ags_sources,
+        # so compact mode only drops the catalogs the panel can rebuild.
+        if not self.ags_config.get("compact_attributes", False):
+            attributes["ags_hidden_sources"] = self._memoized_attribute(
+                "ags_hidden_sources", source_inputs, self._build_hidden_source_details
+            )
+            attributes["ags_all_sources"] = self._memoized_attribute(
+                "ags_all_sources", source_inputs, self._build_all_source_details
+            )
         return attributes
 
 
 
     @property
     def unique_id(self):
-        return "ags_media_player"
+        return f"ags_media_player_{self.zone_id}" if self.zone_id else "ags_media_player"
 
     @property
     def name(self):
         """Return the name of the device."""
-        ags_config = self.hass.data.get(DOMAIN, {})
+        ags_config = self.ags_config
         static_name = ags_config.get('static_name')
         if static_name:
             return static_name
@@ -1729,7 +2072,7 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
     @property
     def icon(self):
         """Return the icon of the device."""
-        ags_status = self.hass.data.get('ags_status', 'OFF')
+        ags_status = self.runtime.ags_status or 'OFF'
         if ags_status == 'ON TV':
             return "mdi:television-play"
         if ags_status != 'OFF':
@@ -1739,26 +2082,21 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
     @property
     def group_members(self):
         """Return one representative media player per active room for HA's group badge."""
-        active_rooms = set(self.hass.data.get("active_rooms", []) or [])
-        active_speakers = set(self.hass.data.get("active_speakers", []) or [])
+        active_rooms = set(self.runtime.active_rooms or [])
+        active_speakers = set(self.runtime.active_speakers or [])
         if not active_rooms or not active_speakers:
             return []
 
         representatives = []
-        for room in self.ags_config.get("rooms", []) or []:
-            if room.get("room") not in active_rooms:
+        for room in get_room_records(self.ags_config.get("rooms", [])).rooms:
+            if room.name not in active_rooms:
                 continue
-            speakers = [
-                device.get("device_id")
-                for device in room.get("devices", []) or []
-                if (
-                    device.get("device_type") == "speaker"
-                    and not device.get("disabled")
-                    and device.get("device_id") in active_speakers
-                )
-            ]
-            if speakers:
-                representatives.append(speakers[0])
+            representative = next(
+                (device.device_id for device in room.speakers if device.device_id in active_speakers),
+                None,
+            )
+            if representative:
+                representatives.append(representative)
         return representatives
 
     @property
@@ -1831,7 +2169,7 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
             return native_art
         return source_artwork_url(
             self.source,
-            self.hass.data.get("ags_media_player_source"),
+            self.runtime.ags_media_player_source,
             attrs.get("app_name"),
             attrs.get("source"),
             attrs.get("media_channel"),
@@ -1847,7 +2185,7 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
 
     async def async_set_volume_level(self, volume):
         """Set the volume level for all active speakers."""
-        active_speakers = self.hass.data.get('active_speakers', [])
+        active_speakers = self.runtime.active_speakers or []
         if active_speakers:
             await self.hass.services.async_call('media_player', 'volume_set', {
                 'entity_id': active_speakers,
@@ -1858,7 +2196,7 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
     @property
     def volume_level(self):
         """Return the volume level of the media player."""
-        active_speakers = self.hass.data.get('active_speakers', [])
+        active_speakers = self.runtime.active_speakers or []
         total_volume = 0
         count = 0
 
@@ -1948,17 +2286,17 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
             return
 
         if content_type == "source":
-            self.hass.data["switch_media_system_state"] = True
+            self.runtime.switch_media_system_state = True
             source_entry = find_source_by_name_or_id(
                 self.hass.data.get(DOMAIN, {}),
                 content_id,
             )
             if source_entry:
-                self.hass.data["ags_media_player_source_id"] = source_entry["id"]
-                self.hass.data["ags_media_player_source"] = source_entry["Source"]
+                self.runtime.ags_media_player_source_id = source_entry["id"]
+                self.runtime.ags_media_player_source = source_entry["Source"]
             else:
-                self.hass.data.pop("ags_media_player_source_id", None)
-                self.hass.data["ags_media_player_source"] = content_id
+                self.runtime.ags_media_player_source_id = None
+                self.runtime.ags_media_player_source = content_id
             await update_ags_sensors(self.ags_config, self.hass)
             self._refresh_from_data()
             if not self._has_active_rooms():
@@ -1983,12 +2321,12 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
                 await self.async_update()
             return
 
-        self.hass.data["switch_media_system_state"] = True
-        self.hass.data["ags_browser_play_pending"] = True
+        self.runtime.switch_media_system_state = True
+        self.runtime.ags_browser_play_pending = True
 
         try:
             await update_ags_sensors(self.ags_config, self.hass)
-            status = self.hass.data.get("ags_status", "OFF")
+            status = self.runtime.ags_status or "OFF"
 
             if status == "OFF":
                 _LOGGER.warning(
@@ -2004,7 +2342,7 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
             )
             self._refresh_from_data()
 
-            active_speakers = self.hass.data.get("active_speakers", [])
+            active_speakers = self.runtime.active_speakers or []
             if not active_speakers:
                 _LOGGER.warning(
                     "Ignoring browser play request because no AGS rooms are active"
@@ -2020,19 +2358,20 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
                 )
                 return
 
-            await enqueue_media_action(
-                self.hass,
-                "play_media",
-                {
-                    "entity_id": target_entity_id,
-                    "media_content_id": content_id,
-                    "media_content_type": content_type,
-                    **kwargs,
-                },
-            )
-            await wait_for_actions(self.hass)
+            with zone_scope(self.ags_config):
+                await enqueue_media_action(
+                    self.hass,
+                    "play_media",
+                    {
+                        "entity_id": target_entity_id,
+                        "media_content_id": content_id,
+                        "media_content_type": content_type,
+                        **kwargs,
+                    },
+                )
+                await wait_for_actions(self.hass)
         finally:
-            self.hass.data.pop("ags_browser_play_pending", None)
+            self.runtime.ags_browser_play_pending = None
 
         await self.async_update()
 
@@ -2050,7 +2389,7 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
         """Unjoin this player from any group."""
         # When unjoin is called on the AGS player, we unjoin all active speakers
         # because the AGS player represents the whole group.
-        active_speakers = self.hass.data.get('active_speakers', [])
+        active_speakers = self.runtime.active_speakers or []
         if active_speakers:
             await self.hass.services.async_call('media_player', 'unjoin', {
                 'entity_id': active_speakers
@@ -2157,14 +2496,14 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
     async def async_turn_on(self):
         """Turn on."""
         _LOGGER.info("AGS: Turning on system via media player")
-        self.hass.data['switch_media_system_state'] = True
+        self.runtime.switch_media_system_state = True
         await update_ags_sensors(self.ags_config, self.hass)
         self.async_write_ha_state()
 
     async def async_turn_off(self):
         """Turn off."""
         _LOGGER.info("AGS: Turning off system via media player")
-        self.hass.data['switch_media_system_state'] = False
+        self.runtime.switch_media_system_state = False
         await update_ags_sensors(self.ags_config, self.hass)
         self.async_write_ha_state()
 
@@ -2219,24 +2558,24 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
         active_source = self._get_state_source_label(reference_state)
         if self.ags_status == "ON TV":
             if self.hass.data.get(DOMAIN, {}).get("disable_tv_source", False):
-                return self.hass.data.get("ags_media_player_source")
+                return self.runtime.ags_media_player_source
             return active_source or "TV"
 
         ags_data = self.hass.data.get(DOMAIN, {})
         selected_source = find_source_by_name_or_id(
             ags_data,
-            self.hass.data.get("ags_media_player_source_id"),
+            self.runtime.ags_media_player_source_id,
         )
         if not selected_source:
             selected_source = find_source_by_name_or_id(
                 ags_data,
-                self.hass.data.get("ags_media_player_source"),
+                self.runtime.ags_media_player_source,
             )
         if selected_source:
             return selected_source["Source"]
 
         if self.ags_status != 'OFF' and not self._has_active_rooms():
-            return self.hass.data.get("ags_media_player_source")
+            return self.runtime.ags_media_player_source
 
         matched_active = find_source_by_name_or_id(ags_data, active_source)
         if matched_active:
@@ -2270,10 +2609,10 @@ class AGSPrimarySpeakerMediaPlayer(MediaPlayerEntity, RestoreEntity):
         source_entry = find_source_by_name_or_id(ags_data, source)
         if source_entry or source == "TV":
             if source_entry:
-                self.hass.data["ags_media_player_source_id"] = source_entry["id"]
-                self.hass.data["ags_media_player_source"] = source_entry["Source"]
+                self.runtime.ags_media_player_source_id = source_entry["id"]
+                self.runtime.ags_media_player_source = source_entry["Source"]
             else:
-                self.hass.data["ags_media_player_source"] = source
+                self.runtime.ags_media_player_source = source
             self._refresh_from_data()
             if not self._has_active_rooms():
                 _LOGGER.info(
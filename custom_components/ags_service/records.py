@@ -0,0 +1,136 @@
+"""Compact records compiled from the validated AGS room config."""
+from __future__ import annotations
+
+import enum
+import sys
+
+CONF_TV_MODE = 'tv_mode'
+TV_MODE_TV_AUDIO = 'tv_audio'
+TV_MODE_NO_MUSIC = 'no_music'
+# Rank given to devices without a priority; sorts after every configured one.
+DEFAULT_PRIORITY = 999
+
+# Compiled room tables, keyed by the identity of the rooms list they were
+# built from. Every config write bumps the config revision, which calls
+# ``invalidate_room_records`` so edits to an existing list are picked up too.
+ROOM_RECORD_CACHE_SIZE = 8
+_room_records: dict[int, tuple[list, "RoomIndex"]] = {}
+
+
+class DeviceType(str, enum.Enum):
+    """Kinds of device a room can hold."""
+
+    SPEAKER = "speaker"
+    TV = "tv"
+    OTT = "ott"
+
+
+def room_switch_key(room_name: str) -> str:
+    """Return the ``switch.<room>_media`` key holding a room's on/off flag."""
+    safe_room_id = "".join(c for c in room_name.lower().replace(' ', '_') if c.isalnum() or c == '_')
+    while "__" in safe_room_id:
+        safe_room_id = safe_room_id.replace("__", "_")
+    return f"switch.{safe_room_id}_media"
+
+
+class DeviceRecord:
+    """An enabled room device with its defaults already applied."""
+
+    __slots__ = (
+        "device_id",
+        "device_type",
+        "priority",
+        "tv_mode",
+        "parent_tv",
+        "tv_input",
+        "override_content",
+        "raw",
+    )
+
+    def __init__(self, raw: dict) -> None:
+        self.raw = raw
+        self.device_id = sys.intern(str(raw["device_id"]))
+        try:
+            self.device_type = DeviceType(raw.get("device_type"))
+        except ValueError:
+            self.device_type = DeviceType.SPEAKER
+        self.priority = raw.get("priority", DEFAULT_PRIORITY)
+        self.tv_mode = raw.get(CONF_TV_MODE, TV_MODE_TV_AUDIO)
+        parent_tv = raw.get("parent_tv")
+        self.parent_tv = sys.intern(str(parent_tv)) if parent_tv else None
+        self.tv_input = raw.get("tv_input")
+        self.override_content = raw.get("override_content")
+
+    def as_dict(self) -> dict:
+        """Return the stored dict this record was compiled from."""
+        return self.raw
+
+
+class RoomRecord:
+    """A room with its enabled devices in priority order, split by type."""
+
+    __slots__ = ("name", "switch_key", "devices", "speakers", "tvs", "otts", "raw")
+
+    def __init__(self, raw: dict) -> None:
+        self.raw = raw
+        self.name = raw.get("room", "")
+        self.switch_key = room_switch_key(self.name)
+        self.devices = tuple(
+            sorted(
+                (
+                    DeviceRecord(device)
+                    for device in raw.get("devices", []) or []
+                    if device.get("device_id") and not device.get("disabled")
+                ),
+                key=lambda device: device.priority,
+            )
+        )
+        self.speakers = self._of_type(DeviceType.SPEAKER)
+        self.tvs = self._of_type(DeviceType.TV)
+        self.otts = self._of_type(DeviceType.OTT)
+
+    def _of_type(self, device_type: DeviceType) -> tuple[DeviceRecord, ...]:
+        return tuple(device for device in self.devices if device.device_type is device_type)
+
+    def otts_for(self, tv: DeviceRecord) -> tuple[DeviceRecord, ...]:
+        """Return the OTT devices attached to ``tv``, highest priority first."""
+        return tuple(ott for ott in self.otts if ott.parent_tv == tv.device_id)
+
+    def as_dict(self) -> dict:
+        """Return the stored dict this record was compiled from."""
+        return self.raw
+
+
+class RoomIndex:
+    """Every room of one config plus the speaker rankings derived from them."""
+
+    __slots__ = ("rooms", "speaker_ids", "ranked_speaker_ids", "device_rooms")
+
+    def __init__(self, rooms) -> None:
+        self.rooms = tuple(RoomRecord(room) for room in rooms or [])
+        self.device_rooms = {}
+        for room in self.rooms:
+            for device in room.devices:
+                self.device_rooms.setdefault(device.device_id, room)
+        speakers = [speaker for room in self.rooms for speaker in room.speakers]
+        self.speaker_ids = tuple(speaker.device_id for speaker in speakers)
+        self.ranked_speaker_ids = tuple(
+            speaker.device_id for speaker in sorted(speakers, key=lambda item: item.priority)
+        )
+
+
+def invalidate_room_records() -> None:
+    """Drop every compiled room table after a config change."""
+    _room_records.clear()
+
+
+def get_room_records(rooms) -> RoomIndex:
+    """Return the compiled records for a rooms list, building them once."""
+    cached = _room_records.get(id(rooms))
+    if cached is not None and cached[0] is rooms:
+        return cached[1]
+    index = RoomIndex(rooms)
+    if len(_room_records) >= ROOM_RECORD_CACHE_SIZE:
+        _room_records.pop(next(iter(_room_records)))
+    _room_records[id(rooms)] = (rooms, index)
+    return index
@@ -0,0 +1,108 @@
+"""Typed runtime state shared by the AGS platforms."""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+
+DOMAIN = "ags_service"
+
+# Zone whose decision state, queue and locks the current task works on.
+# ``None`` is the main AGS system.
+CURRENT_ZONE: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "ags_zone", default=None
+)
+
+
+class AGSRuntime:
+    """Live AGS decision state, stored once under ``hass.data[DOMAIN]``.
+
+    Every field the decision engine, sensors, switches and media player
+    exchange lives here as a slot instead of a loose top-level ``hass.data``
+    key. Fields left as ``None`` have not been computed yet.
+    """
+
+    __slots__ = (
+        "ags_status",
+        "configured_rooms",
+        "active_rooms",
+        "active_speakers",
+        "inactive_speakers",
+        "primary_speaker",
+        "preferred_primary_speaker",
+        "browsing_fallback_speaker",
+        "ags_inactive_tv_speakers",
+        "current_tv_mode",
+        "switch_media_system_state",
+        "schedule_state",
+        "schedule_prev_state",
+        "ags_media_player_source",
+        "ags_media_player_source_id",
+        "ags_source_before_tv",
+        "ags_browser_play_pending",
+        "ags_source_change_pending",
+        "ags_warm_start",
+        "ags_sensors",
+        "switch_states",
+    )
+
+    def __init__(self) -> None:
+        for name in self.__slots__:
+            setattr(self, name, None)
+        self.ags_browser_play_pending = False
+        self.ags_source_change_pending = False
+        # ``switch.<room>_media`` and ``switch.ags_actions`` on/off flags.
+        self.switch_states = {}
+
+    def snapshot(self, keys) -> dict:
+        """Return the named fields, copying lists so later edits don't leak."""
+        result = {}
+        for key in keys:
+            value = getattr(self, key)
+            result[key] = list(value) if isinstance(value, (list, tuple)) else value
+        return result
+
+
+def _main_runtime(ags_data) -> AGSRuntime:
+    runtime = ags_data.get("runtime")
+    if runtime is None:
+        runtime = ags_data["runtime"] = AGSRuntime()
+    return runtime
+
+
+def get_runtime(hass, zone_id: str | None = None) -> AGSRuntime:
+    """Return the AGS runtime state of a zone, creating it on first use.
+
+    Without ``zone_id`` the zone of the current task is used. Zones keep
+    their own decision state but share the room switch flags, since every
+    room switch is a single entity whichever zone owns the room.
+    """
+    ags_data = hass.data.setdefault(DOMAIN, {})
+    zone_id = zone_id or CURRENT_ZONE.get()
+    main = _main_runtime(ags_data)
+    if zone_id is None:
+        return main
+    zones = ags_data.setdefault("zone_runtimes", {})
+    runtime = zones.get(zone_id)
+    if runtime is None:
+        runtime = zones[zone_id] = AGSRuntime()
+        runtime.switch_states = main.switch_states
+    return runtime
+
+
+def get_zone_data(hass) -> dict:
+    """Return the dict holding the current zone's action queue and locks."""
+    ags_data = hass.data.setdefault(DOMAIN, {})
+    zone_id = CURRENT_ZONE.get()
+    if zone_id is None:
+        return ags_data
+    return ags_data.setdefault("zone_data", {}).setdefault(zone_id, {})
+
+
+@contextlib.contextmanager
+def zone_scope(ags_config):
+    """Run the enclosed AGS calls against the zone ``ags_config`` belongs to."""
+    token = CURRENT_ZONE.set((ags_config or {}).get("zone_id"))
+    try:
+        yield
+    finally:
+        CURRENT_ZONE.reset(token)
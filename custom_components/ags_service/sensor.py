@@ -3,34 +3,22 @@ from __future__ import annotations
 from datetime import timedelta
 
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
-from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
-from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
 from . import DOMAIN, SIGNAL_AGS_RELOAD
-from .ags_service import update_ags_sensors
+from .ags_service import (
+    IncrementalStateTracker,
+    get_tracked_entity_ids,
+    schedule_startup_refresh,
+    update_ags_sensors,
+)
+from .runtime import get_runtime
 
 # Sensors mostly update via the state change listener below, so heavy polling
 # isn't required. 30 seconds keeps them responsive without excessive work.
 SCAN_INTERVAL = timedelta(seconds=30)
 
 
-def schedule_ags_sensor_refresh_after_start(hass, ags_config):
-    """Refresh AGS sensor data after HA startup, never during platform setup."""
-    async def _refresh():
-        try:
-            await update_ags_sensors(ags_config, hass)
-        except Exception:
-            pass
-
-    async def _after_started(_event=None):
-        await _refresh()
-
-    if getattr(hass, "is_running", False):
-        hass.async_create_task(_after_started())
-        return None
-    return hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _after_started)
-
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     # Create your sensors
     ags_config = hass.data[DOMAIN]
@@ -80,43 +68,13 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         await update_ags_sensors(ags_config, hass)
 
     # Register sensors so other modules can refresh them immediately
-    hass.data['ags_sensors'] = sensors
-    startup_refresh_unsub = schedule_ags_sensor_refresh_after_start(hass, ags_config)
+    get_runtime(hass).ags_sensors = sensors
+    schedule_startup_refresh(hass)
 
-    tracked_entities = set()
-    unsubs = []
+    tracker = IncrementalStateTracker(hass, state_changed_listener)
 
     def update_tracked_entities():
-        nonlocal unsubs, tracked_entities
-
-        # Unsubscribe old trackers
-        for unsub in unsubs:
-            unsub()
-        unsubs = []
-        tracked_entities = set(['zone.home'])
-
-        cfg = hass.data[DOMAIN]
-        rooms = cfg.get('rooms', [])
-
-        schedule_cfg = cfg.get('schedule_entity')
-        if schedule_cfg and schedule_cfg.get('entity_id'):
-            tracked_entities.add(schedule_cfg['entity_id'])
-
-        if cfg.get("create_sensors"):
-            tracked_entities.add("switch.ags_actions")
-
-        for room in rooms:
-            safe_room_id = "".join(c for c in room.get('room', '').lower().replace(' ', '_') if c.isalnum() or c == '_')
-            if safe_room_id:
-                tracked_entities.add(f"switch.{safe_room_id}_media")
-            for device in room.get("devices", []):
-                tracked_entities.add(device["device_id"])
-
-        # Create new trackers
-        if tracked_entities:
-            unsubs.append(async_track_state_change_event(
-                hass, list(tracked_entities), state_changed_listener
-            ))
+        tracker.update(get_tracked_entity_ids(hass.data[DOMAIN]))
 
     # Initial tracking
     update_tracked_entities()
@@ -132,10 +90,7 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
             return
         cleanup_done = True
         reload_unsub()
-        if startup_refresh_unsub:
-            startup_refresh_unsub()
-        for unsub in unsubs:
-            unsub()
+        tracker.clear()
 
     for sensor in sensors:
         sensor.async_on_remove(remove_tracked_entities)
@@ -156,6 +111,7 @@ class ConfiguredRoomsSensor(SensorEntity):
     def __init__(self, hass):
         """Initialize the sensor."""
         self.hass = hass
+        self.runtime = get_runtime(hass)
     @property
     def unique_id(self):
         return "configured_rooms"
@@ -166,7 +122,7 @@ class ConfiguredRoomsSensor(SensorEntity):
     @property
     def state(self):
         """Return the state of the sensor."""
-        configured_rooms = self.hass.data.get('configured_rooms', None)
+        configured_rooms = self.runtime.configured_rooms
         return configured_rooms
 
 
@@ -176,6 +132,7 @@ class ActiveRoomsSensor(SensorEntity):
     def __init__(self, hass):
         """Initialize the sensor."""
         self.hass = hass
+        self.runtime = get_runtime(hass)
 
     @property
     def unique_id(self):
@@ -187,7 +144,7 @@ class ActiveRoomsSensor(SensorEntity):
 
     @property
     def state(self):
-        ags_status = self.hass.data.get('active_rooms', None)
+        ags_status = self.runtime.active_rooms
         return ags_status
 
 
@@ -197,6 +154,7 @@ class ActiveSpeakersSensor(SensorEntity):
     def __init__(self, hass):
         """Initialize the sensor."""
         self.hass = hass
+        self.runtime = get_runtime(hass)
 
     @property
 
@@ -210,7 +168,7 @@ class ActiveSpeakersSensor(SensorEntity):
 
     @property
     def state(self):
-        active_speakers = self.hass.data.get('active_speakers', None)
+        active_speakers = self.runtime.active_speakers
         return active_speakers
 
 # Sensor for inactive speakers
@@ -220,6 +178,7 @@ class InactiveSpeakersSensor(SensorEntity):
     def __init__(self, hass):
         """Initialize the sensor."""
         self.hass = hass
+        self.runtime = get_runtime(hass)
 
     @property
 
@@ -233,7 +192,7 @@ class InactiveSpeakersSensor(SensorEntity):
 
     @property
     def state(self):
-        inactive_speakers = self.hass.data.get('inactive_speakers', None)
+        inactive_speakers = self.runtime.inactive_speakers
         return inactive_speakers
 
 
@@ -247,6 +206,7 @@ class AGSStatusSensor(SensorEntity):
         """Initialize the sensor."""
 
         self.hass = hass
+        self.runtime = get_runtime(hass)
 
 
     @property
@@ -261,7 +221,7 @@ class AGSStatusSensor(SensorEntity):
 
     def state(self):
 
-        ags_status = self.hass.data.get('ags_status', "OFF")
+        ags_status = self.runtime.ags_status or "OFF"
 
         return ags_status
 
@@ -276,6 +236,7 @@ class PrimarySpeakerSensor(SensorEntity):
     def __init__(self, hass):
         """Initialize the sensor."""
         self.hass = hass
+        self.runtime = get_runtime(hass)
 
     @property
     def unique_id(self):
@@ -287,7 +248,7 @@ class PrimarySpeakerSensor(SensorEntity):
 
     @property
     def state(self):
-        primary_speaker = self.hass.data.get('primary_speaker', None)
+        primary_speaker = self.runtime.primary_speaker
         return primary_speaker
 
 
@@ -298,6 +259,7 @@ class PreferredPrimarySpeakerSensor(SensorEntity):
     def __init__(self, hass):
         """Initialize the sensor."""
         self.hass = hass
+        self.runtime = get_runtime(hass)
 
     @property
     def unique_id(self):
@@ -309,7 +271,7 @@ class PreferredPrimarySpeakerSensor(SensorEntity):
 
     @property
     def state(self):
-        preferred_primary_speaker = self.hass.data.get('preferred_primary_speaker', None)
+        preferred_primary_speaker = self.runtime.preferred_primary_speaker
         return preferred_primary_speaker
 
 
@@ -319,6 +281,7 @@ class AGSSourceSensor(SensorEntity):
     def __init__(self, hass):
         """Initialize the sensor."""
         self.hass = hass
+        self.runtime = get_runtime(hass)
 
     @property
     def unique_id(self):
@@ -330,7 +293,7 @@ class AGSSourceSensor(SensorEntity):
 
     @property
     def state(self):
-        ags_source = self.hass.data.get('ags_media_player_source', None)
+        ags_source = self.runtime.ags_media_player_source
         return ags_source
 
 # sensor to see speakers for tv's that are inactive #
@@ -339,6 +302,7 @@ class AGSInactiveTVSpeakersSensor(SensorEntity):
     def __init__(self, hass):
         """Initialize the sensor."""
         self.hass = hass
+        self.runtime = get_runtime(hass)
 
     @property
     def unique_id(self):
@@ -350,5 +314,5 @@ class AGSInactiveTVSpeakersSensor(SensorEntity):
 
     @property
     def state(self):
-        ags_inactive_tv_speakers = self.hass.data.get('ags_inactive_tv_speakers', None)
+        ags_inactive_tv_speakers = self.runtime.ags_inactive_tv_speakers
         return ags_inactive_tv_speakers
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 
+from .source_utils import SourceView
+
 SOURCE_ART_BASE = "/ags-static/assets/source-art"
 
 _SOURCE_ART_ALIASES = {
@@ -71,9 +74,13 @@ def source_artwork_url(*values: Any) -> str | None:
     return None
 
 
-def apply_default_source_art(source: dict | None) -> dict | None:
-    """Return a source copy with default thumbnail artwork when no art exists."""
-    if not isinstance(source, dict):
+def apply_default_source_art(source: Mapping | None) -> Mapping | None:
+    """Return a source copy with default thumbnail artwork when no art exists.
+
+    Presented ``SourceView`` records get an overlay instead of a copy, so
+    attribute builders keep sharing the underlying catalog entries.
+    """
+    if not isinstance(source, Mapping):
         return source
     if source.get("thumbnail"):
         return source
@@ -87,4 +94,6 @@ def apply_default_source_art(source: dict | None) -> dict | None:
     )
     if not artwork:
         return source
+    if isinstance(source, SourceView):
+        return source.with_overrides(thumbnail=artwork)
     return {**source, "thumbnail": artwork}
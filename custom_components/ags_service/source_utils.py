@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from copy import deepcopy
+from collections.abc import Iterator, Mapping
 from typing import Any
 
 CONF_SOURCE_FAVORITES = "source_favorites"
@@ -19,8 +19,8 @@ SOURCE_ORIGIN_LEGACY_CONFIG = "legacy_config"
 SOURCE_ORIGIN_MEDIA_BROWSER = "media_browser"
 
 
-def _source_folder_parts(source: dict | None) -> list[str]:
-    folder_path = source.get("folder_path") if isinstance(source, dict) else None
+def _source_folder_parts(source: Mapping | None) -> list[str]:
+    folder_path = source.get("folder_path") if isinstance(source, Mapping) else None
     if isinstance(folder_path, (list, tuple)):
         return [
             str(part).strip()
@@ -32,9 +32,9 @@ def _source_folder_parts(source: dict | None) -> list[str]:
     return []
 
 
-def is_media_browser_favorite_source(source: dict | None) -> bool:
+def is_media_browser_favorite_source(source: Mapping | None) -> bool:
     """Return true for items discovered from the native Favorites subtree."""
-    if not isinstance(source, dict):
+    if not isinstance(source, Mapping):
         return False
     parts = _source_folder_parts(source)
     values = [
@@ -48,9 +48,9 @@ def is_media_browser_favorite_source(source: dict | None) -> bool:
     return any("favorite" in str(value or "").casefold() for value in values)
 
 
-def looks_like_global_media_source(source: dict | None) -> bool:
+def looks_like_global_media_source(source: Mapping | None) -> bool:
     """Return true for broad HA library rows that should not become AGS sources."""
-    if not isinstance(source, dict):
+    if not isinstance(source, Mapping):
         return False
     value = str(source.get("Source_Value") or "").strip()
     media_type = str(source.get("media_content_type") or "").strip()
@@ -103,9 +103,9 @@ def make_browser_source_id(
     return f"browser::{key}"
 
 
-def normalize_source_entry(source: dict | None) -> dict | None:
+def normalize_source_entry(source: Mapping | None) -> dict | None:
     """Normalize legacy and current AGS source shapes."""
-    if not isinstance(source, dict):
+    if not isinstance(source, Mapping):
         return None
 
     value = str(
@@ -180,7 +180,7 @@ def normalize_source_entry(source: dict | None) -> dict | None:
 
 def merge_source_metadata(existing: dict, incoming: dict) -> dict:
     """Merge source metadata collected from multiple browser targets."""
-    merged = deepcopy(existing)
+    merged = dict(existing)
     available = []
     for source in (existing, incoming):
         for entity_id in source.get("available_on") or []:
@@ -190,7 +190,7 @@ def merge_source_metadata(existing: dict, incoming: dict) -> dict:
         merged["available_on"] = available
     for key in ("can_play", "can_expand", "media_class", "origin", "folder_path", "thumbnail"):
         if key not in merged and incoming.get(key) is not None:
-            merged[key] = deepcopy(incoming[key])
+            merged[key] = incoming[key]
     return merged
 
 
@@ -229,9 +229,9 @@ def source_matches_hidden(source: dict, hidden_ids: set[str]) -> bool:
     return bool(source_id and source_id in hidden_ids) or bool(value and value in hidden_ids)
 
 
-def is_legacy_config_source(source: dict | None) -> bool:
+def is_legacy_config_source(source: Mapping | None) -> bool:
     """Return true for pre-browser source-list entries kept only as migration hints."""
-    if not isinstance(source, dict):
+    if not isinstance(source, Mapping):
         return False
     if source.get("origin") == SOURCE_ORIGIN_LEGACY_CONFIG:
         return True
@@ -248,23 +248,227 @@ def is_legacy_config_source(source: dict | None) -> bool:
     )
 
 
+class SourceView(Mapping):
+    """Read-only source record layered over a shared catalog entry.
+
+    Presentation only changes a couple of fields, so the view stores those
+    overrides and reads everything else from the underlying source dict.
+    """
+
+    __slots__ = ("_base", "_overrides")
+
+    def __init__(self, base: Mapping, overrides: dict | None = None) -> None:
+        if isinstance(base, SourceView):
+            overrides = {**base._overrides, **(overrides or {})}
+            base = base._base
+        self._base = base
+        self._overrides = overrides or {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._overrides:
+            return self._overrides[key]
+        return self._base[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._base
+        for key in self._overrides:
+            if key not in self._base:
+                yield key
+
+    def __len__(self) -> int:
+        return len(self._base) + sum(1 for key in self._overrides if key not in self._base)
+
+    def __repr__(self) -> str:
+        return f"SourceView({self.to_dict()!r})"
+
+    def with_overrides(self, **overrides: Any) -> SourceView:
+        """Return a new view with additional field overrides."""
+        return SourceView(self, overrides)
+
+    def to_dict(self) -> dict:
+        """Return a plain dict copy, e.g. before persisting the source."""
+        return {**self._base, **self._overrides}
+
+
 def apply_source_presentation(
-    source: dict,
+    source: Mapping,
     display_names: dict[str, str] | None,
     default_source_id: str | None,
-) -> dict:
+) -> SourceView:
     """Apply the user-facing name and default marker to a source."""
-    presented = deepcopy(source)
-    source_id = presented.get("id")
+    source_id = source.get("id")
+    overrides = {}
     display_name = (display_names or {}).get(source_id)
     if display_name:
-        presented["Source"] = display_name
-    presented["source_default"] = (
-        bool(source_id == default_source_id or presented.get("source_default", False))
+        overrides["Source"] = display_name
+    overrides["source_default"] = (
+        bool(source_id == default_source_id or source.get("source_default", False))
         if default_source_id
-        else bool(presented.get("source_default", False))
+        else bool(source.get("source_default", False))
+    )
+    return SourceView(source, overrides)
+
+
+def inputs_unchanged(previous: tuple, current: tuple) -> bool:
+    """Return true when cached inputs are still the same live objects.
+
+    Cache inputs carry ``config_revision``/``source_list_revision`` for the
+    config they read, which every config writer bumps, so the remaining
+    entries only need an identity or equality check.
+    """
+    return len(previous) == len(current) and all(
+        old is new or (not isinstance(new, (list, dict)) and old == new)
+        for old, new in zip(previous, current)
     )
-    return presented
+
+
+def _lookup_key(value: Any) -> str:
+    return str(value or "").strip().casefold()
+
+
+class SourceInventoryView:
+    """Presented AGS source inventory with prebuilt lookup indexes."""
+
+    __slots__ = (
+        "visible",
+        "visible_all",
+        "_catalog",
+        "_hidden_ids",
+        "_display_names",
+        "_default_source_id",
+        "_hidden",
+        "_by_id",
+        "_by_name",
+        "_by_value",
+    )
+
+    def __init__(self, ags_data: dict) -> None:
+        display_names = ags_data.get(CONF_SOURCE_DISPLAY_NAMES, {}) or {}
+        default_source_id = ags_data.get(CONF_DEFAULT_SOURCE_ID)
+        hidden_ids = {str(item).strip() for item in ags_data.get(CONF_HIDDEN_SOURCE_IDS, []) or []}
+
+        catalog = filter_discovered_sources(ags_data.get(CONF_LAST_DISCOVERED_SOURCES, []) or [])
+        catalog_by_name = {source["Source"].casefold(): source for source in catalog}
+        catalog_by_value = {
+            str(source.get("Source_Value") or "").strip().casefold(): source
+            for source in catalog
+        }
+
+        visible_all = []
+        visible = []
+        seen_all = set()
+        seen_visible = set()
+        for source in normalize_source_list(ags_data.get(CONF_SOURCE_FAVORITES, []) or []):
+            if is_legacy_config_source(source):
+                matched = (
+                    catalog_by_name.get(source["Source"].casefold())
+                    or catalog_by_value.get(str(source.get("Source_Value") or "").strip().casefold())
+                )
+                if not matched:
+                    continue
+                source = SourceView(matched, {"source_default": source.get("source_default", False)})
+            source_id = source.get("id")
+            is_hidden = source_matches_hidden(source, hidden_ids)
+            if source_id in seen_all and (is_hidden or source_id in seen_visible):
+                continue
+            presented = apply_source_presentation(source, display_names, default_source_id)
+            if source_id not in seen_all:
+                seen_all.add(source_id)
+                visible_all.append(presented)
+            if not is_hidden and source_id not in seen_visible:
+                seen_visible.add(source_id)
+                visible.append(presented)
+
+        self.visible_all = visible_all
+        self.visible = visible
+        self._catalog = catalog
+        self._hidden_ids = hidden_ids
+        self._display_names = display_names
+        self._default_source_id = default_source_id
+        self._hidden = None
+
+        # First match wins, mirroring an in-order scan of the visible list.
+        self._by_id: dict[str, int] = {}
+        self._by_name: dict[str, int] = {}
+        self._by_value: dict[str, int] = {}
+        for position, source in enumerate(self.visible):
+            self._by_name.setdefault(_lookup_key(source.get("Source")), position)
+            self._by_id.setdefault(_lookup_key(source.get("id")), position)
+            self._by_value.setdefault(_lookup_key(source.get("Source_Value")), position)
+
+    @property
+    def hidden(self) -> list[dict]:
+        """Return hidden catalog sources, built on first use."""
+        if self._hidden is None:
+            self._hidden = self._build_hidden()
+        return self._hidden
+
+    def _build_hidden(self) -> list[dict]:
+        visible_ids = {source.get("id") for source in self.visible_all}
+        visible_values = {
+            str(source.get("Source_Value") or "").strip()
+            for source in self.visible_all
+            if str(source.get("Source_Value") or "").strip()
+        }
+
+        hidden = []
+        seen_ids = set()
+        for source in self._catalog:
+            source_id = source.get("id")
+            value = str(source.get("Source_Value") or "").strip()
+            if not source_id or source_id in seen_ids:
+                continue
+            if source_id in visible_ids or value in visible_values:
+                continue
+            seen_ids.add(source_id)
+            hidden.append(
+                apply_source_presentation(source, self._display_names, self._default_source_id)
+            )
+
+        for source in self.visible_all:
+            if source.get("id") in seen_ids:
+                continue
+            if source_matches_hidden(source, self._hidden_ids):
+                seen_ids.add(source.get("id"))
+                hidden.append(source)
+        return hidden
+
+    def find(self, value: str | None) -> dict | None:
+        """Find a visible source by displayed name, canonical id, or media id."""
+        target = _lookup_key(value)
+        if not target:
+            return None
+        positions = [
+            position
+            for position in (
+                self._by_name.get(target),
+                self._by_id.get(target),
+                self._by_value.get(target),
+            )
+            if position is not None
+        ]
+        return self.visible[min(positions)] if positions else None
+
+
+def source_revisions(ags_data: dict) -> tuple:
+    """Return the revisions that change whenever AGS source config is written.
+
+    Applying or patching a config bumps ``config_revision`` and catalog or
+    source-list updates bump ``source_list_revision``; code that writes source
+    settings into ``ags_data`` must do one of the two.
+    """
+    return (ags_data.get("config_revision", 0), ags_data.get("source_list_revision", 0))
+
+
+def get_source_inventory_view(ags_data: dict) -> SourceInventoryView:
+    """Return the presented inventory, rebuilt only when its inputs change."""
+    inputs = source_revisions(ags_data)
+    cached = ags_data.get("_source_inventory_view")
+    if cached is not None and cached[0] == inputs:
+        return cached[1]
+    view = SourceInventoryView(ags_data)
+    ags_data["_source_inventory_view"] = (inputs, view)
+    return view
 
 
 def combine_source_inventory(
@@ -272,101 +476,126 @@ def combine_source_inventory(
     *,
     include_hidden: bool = False,
 ) -> list[dict]:
-    """Return visible generated music sources from AGS-managed favorites only."""
-    display_names = ags_data.get(CONF_SOURCE_DISPLAY_NAMES, {}) or {}
-    default_source_id = ags_data.get(CONF_DEFAULT_SOURCE_ID)
-    hidden_ids = {str(item).strip() for item in ags_data.get(CONF_HIDDEN_SOURCE_IDS, []) or []}
-
-    catalog = filter_discovered_sources(ags_data.get(CONF_LAST_DISCOVERED_SOURCES, []) or [])
-    catalog_by_name = {source["Source"].casefold(): source for source in catalog}
-    catalog_by_value = {
-        str(source.get("Source_Value") or "").strip().casefold(): source
-        for source in catalog
-    }
+    """Return visible generated music sources from AGS-managed favorites only.
 
-    normalized_sources = []
-    for source in normalize_source_list(ags_data.get(CONF_SOURCE_FAVORITES, []) or []):
-        if is_legacy_config_source(source):
-            matched = (
-                catalog_by_name.get(source["Source"].casefold())
-                or catalog_by_value.get(str(source.get("Source_Value") or "").strip().casefold())
-            )
-            if not matched:
-                continue
-            source = {**matched, "source_default": source.get("source_default", False)}
-        normalized_sources.append(source)
-
-    presented = []
-    seen_ids = set()
-    for source in normalized_sources:
-        if not include_hidden and source_matches_hidden(source, hidden_ids):
-            continue
-        source_id = source.get("id")
-        if source_id in seen_ids:
-            continue
-        seen_ids.add(source_id)
-        presented.append(
-            apply_source_presentation(source, display_names, default_source_id)
-        )
-    return presented
+    Entries are shared read-only ``SourceView`` records; call ``to_dict()``
+    (or pass them through ``normalize_source_list``) before storing or
+    sending one.
+    """
+    view = get_source_inventory_view(ags_data)
+    return list(view.visible_all if include_hidden else view.visible)
 
 
 def split_source_inventory(ags_data: dict) -> tuple[list[dict], list[dict]]:
     """Return visible favorites and hidden catalog sources."""
-    hidden_ids = {str(item).strip() for item in ags_data.get(CONF_HIDDEN_SOURCE_IDS, []) or []}
-    display_names = ags_data.get(CONF_SOURCE_DISPLAY_NAMES, {}) or {}
-    default_source_id = ags_data.get(CONF_DEFAULT_SOURCE_ID)
-
-    visible = combine_source_inventory(ags_data, include_hidden=False)
-    visible_all = combine_source_inventory(ags_data, include_hidden=True)
-    visible_ids = {source.get("id") for source in visible_all}
-    visible_values = {
-        str(source.get("Source_Value") or "").strip()
-        for source in visible_all
-        if str(source.get("Source_Value") or "").strip()
-    }
-
-    hidden = []
-    seen_ids = set()
-    for source in filter_discovered_sources(ags_data.get(CONF_LAST_DISCOVERED_SOURCES, []) or []):
-        source_id = source.get("id")
-        value = str(source.get("Source_Value") or "").strip()
-        if not source_id or source_id in seen_ids:
-            continue
-        if source_id in visible_ids or value in visible_values:
-            continue
-        seen_ids.add(source_id)
-        hidden.append(apply_source_presentation(source, display_names, default_source_id))
-
-    for source in visible_all:
-        if source.get("id") in seen_ids:
-            continue
-        if source_matches_hidden(source, hidden_ids):
-            seen_ids.add(source.get("id"))
-            hidden.append(source)
-    return visible, hidden
+    view = get_source_inventory_view(ags_data)
+    return list(view.visible), list(view.hidden)
 
 
 def find_source_by_name_or_id(ags_data: dict, value: str | None) -> dict | None:
     """Find a visible source by displayed name, canonical id, or media id."""
-    target = str(value or "").strip()
-    if not target:
-        return None
-    target_folded = target.casefold()
-    for source in combine_source_inventory(ags_data):
-        candidates = (
-            source.get("Source"),
-            source.get("id"),
-            source.get("Source_Value"),
+    return get_source_inventory_view(ags_data).find(value)
+
+
+class SourceAvailabilityMatrix:
+    """Speaker x source availability index used for playback failover.
+
+    Speakers are assigned one bit each in AGS rank order, so the best speaker
+    for a source is the lowest set bit of ``source_mask & candidate_mask``.
+    Sources without ``available_on`` metadata are playable everywhere.
+    """
+
+    __slots__ = (
+        "speakers",
+        "speaker_bits",
+        "all_mask",
+        "active_mask",
+        "available_mask",
+        "source_masks",
+        "source_speakers",
+        "_sources",
+        "_fallbacks",
+    )
+
+    def __init__(self, sources: list[dict], ranked_speakers: list[str]) -> None:
+        self.speakers = list(dict.fromkeys(ranked_speakers or []))
+        self.speaker_bits = {
+            entity_id: 1 << index
+            for index, entity_id in enumerate(self.speakers)
+        }
+        self.all_mask = (1 << len(self.speakers)) - 1
+        self.active_mask = 0
+        self.available_mask = self.all_mask
+        self.source_masks: dict[str, int] = {}
+        self.source_speakers: dict[str, frozenset[str] | None] = {}
+        self._sources = []
+        self._fallbacks: dict[str, tuple[dict, ...]] = {}
+
+        for source in sources or []:
+            source_id = source.get("id")
+            if not source_id or source_id in self.source_masks:
+                continue
+            available_on = frozenset(source.get("available_on") or [])
+            if available_on:
+                mask = 0
+                for entity_id in available_on:
+                    mask |= self.speaker_bits.get(entity_id, 0)
+                self.source_speakers[source_id] = available_on
+            else:
+                mask = self.all_mask
+                self.source_speakers[source_id] = None
+            self.source_masks[source_id] = mask
+            self._sources.append(source)
+
+    def update_speakers(self, available: Any, active: Any) -> None:
+        """Refresh the speaker availability and active-room masks."""
+        self.available_mask = 0
+        for entity_id in available or []:
+            self.available_mask |= self.speaker_bits.get(entity_id, 0)
+        self.active_mask = 0
+        for entity_id in active or []:
+            self.active_mask |= self.speaker_bits.get(entity_id, 0)
+
+    def is_available_on(self, source: dict, speaker_entity_id: str) -> bool:
+        """Return true when source discovery allows a source on a speaker."""
+        source_id = source.get("id")
+        if source_id not in self.source_speakers:
+            available_on = source.get("available_on") or []
+            return not available_on or speaker_entity_id in available_on
+        speakers = self.source_speakers[source_id]
+        return speakers is None or speaker_entity_id in speakers
+
+    def best_speaker(self, source: dict) -> str | None:
+        """Return the highest-ranked available speaker that can play a source."""
+        candidates = (self.active_mask or self.all_mask) & self.available_mask
+        mask = self.source_masks.get(source.get("id"), 0) & candidates
+        if not mask:
+            return None
+        return self.speakers[(mask & -mask).bit_length() - 1]
+
+    def fallback_source(self, speaker_entity_id: str, exclude_id: str | None) -> dict | None:
+        """Return the first other configured source playable on a speaker."""
+        fallbacks = self._fallbacks.get(speaker_entity_id)
+        if fallbacks is None:
+            # Two candidates are enough to skip the excluded source.
+            found = []
+            for source in self._sources:
+                if self.is_available_on(source, speaker_entity_id):
+                    found.append(source)
+                    if len(found) == 2:
+                        break
+            fallbacks = tuple(found)
+            self._fallbacks[speaker_entity_id] = fallbacks
+        return next(
+            (source for source in fallbacks if source.get("id") != exclude_id),
+            None,
         )
-        if any(str(candidate or "").strip().casefold() == target_folded for candidate in candidates):
-            return source
-    return None
 
 
 def normalize_source_storage(cfg: dict) -> dict:
     """Migrate legacy source storage into the AGS-managed source model."""
-    normalized = deepcopy(cfg or {})
+    # Only top-level keys are replaced, so the nested values can be shared.
+    normalized = dict(cfg or {})
 
     using_legacy_sources = normalized.get(CONF_SOURCE_FAVORITES) is None
     legacy_sources = normalized.get(CONF_SOURCE_FAVORITES)
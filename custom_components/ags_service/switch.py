@@ -3,7 +3,6 @@ from __future__ import annotations
 import logging
 
 from homeassistant.components.switch import SwitchEntity
-from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
@@ -11,34 +10,22 @@ from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
 from .ags_service import (
+    async_request_update,
     ensure_action_queue,
-    update_ags_sensors,
+    get_room_config,
+    get_zone_configs,
+    room_switch_key,
+    schedule_startup_refresh,
+    update_all_zones,
 )
 
 # Import the signal and domain
 from . import DOMAIN, SIGNAL_AGS_RELOAD
+from .runtime import get_runtime
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def schedule_ags_update_after_start(hass: HomeAssistant, config_provider) -> None:
-    """Schedule AGS updates after HA startup without blocking entity restore."""
-    async def _refresh():
-        try:
-            if DOMAIN in hass.data:
-                await update_ags_sensors(config_provider(), hass)
-        except Exception as err:
-            _LOGGER.debug("Deferred AGS switch refresh failed: %s", err)
-
-    async def _after_started(_event=None):
-        await _refresh()
-
-    if getattr(hass, "is_running", False):
-        hass.async_create_task(_after_started())
-    else:
-        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _after_started)
-
-
 # Setup platform function
 async def async_setup_platform(
     hass: HomeAssistant,
@@ -51,7 +38,7 @@ async def async_setup_platform(
     ags_config = hass.data[DOMAIN]
 
     # Track which rooms already have switches
-    added_room_switches = set()
+    added_room_switches = {}
     reload_unsub = None
     cleanup_done = False
 
@@ -70,18 +57,22 @@ async def async_setup_platform(
             return
 
         new_entities = []
-        rooms = hass.data[DOMAIN]["rooms"]
+        rooms = list(hass.data[DOMAIN]["rooms"])
+        for zone_config in get_zone_configs(hass.data[DOMAIN]).values():
+            rooms.extend(zone_config["rooms"])
 
         for room in rooms:
-            safe_room_id = "".join(c for c in room['room'].lower().replace(' ', '_') if c.isalnum() or c == '_')
-            while "__" in safe_room_id:
-                safe_room_id = safe_room_id.replace("__", "_")
-            unique_id = f"switch.{safe_room_id}_media"
-            if unique_id not in added_room_switches:
-                entity = RoomSwitch(hass, room)
-                entity.async_on_remove(cleanup_reload_listener)
-                new_entities.append(entity)
-                added_room_switches.add(unique_id)
+            unique_id = room_switch_key(room['room'])
+            existing = added_room_switches.get(unique_id)
+            if existing is not None:
+                # Keep the entity and its restored state; just follow the
+                # replaced room config.
+                existing.room = room
+                continue
+            entity = RoomSwitch(hass, room)
+            entity.async_on_remove(cleanup_reload_listener)
+            new_entities.append(entity)
+            added_room_switches[unique_id] = entity
 
         if new_entities:
             async_add_entities(new_entities)
@@ -118,22 +109,15 @@ class RoomSwitch(SwitchEntity, RestoreEntity):
         """Initialize the switch."""
         self.hass = hass
         self.room = room
+        self.switch_states = get_runtime(hass).switch_states
         self._attr_name = f"{room['room']} Media"
 
         # Use a safe slugified version for internal keys and force the entity_id
-        safe_room_id = "".join(c for c in room['room'].lower().replace(' ', '_') if c.isalnum() or c == '_')
-        while "__" in safe_room_id:
-            safe_room_id = safe_room_id.replace("__", "_")
-        self.entity_id = f"switch.{safe_room_id}_media"
+        self.entity_id = room_switch_key(room['room'])
         self._attr_unique_id = self.entity_id
 
-        # Check if the state is already stored in hass.data
-        switch_key = self._attr_unique_id
-        if switch_key in hass.data:
-            self._attr_is_on = hass.data[switch_key]
-        else:
-            self._attr_is_on = False
-            hass.data[switch_key] = False  # Initialize in hass.data
+        # Check if the state is already stored in the runtime state
+        self._attr_is_on = self.switch_states.setdefault(self._attr_unique_id, False)
 
     @property
     def is_on(self):
@@ -143,16 +127,27 @@ class RoomSwitch(SwitchEntity, RestoreEntity):
     async def async_turn_on(self, **kwargs):
         """Turn the switch on."""
         self._attr_is_on = True
-        self.hass.data[self._attr_unique_id] = True
+        self.switch_states[self._attr_unique_id] = True
         self.async_write_ha_state()
-        await update_ags_sensors(self.hass.data[DOMAIN], self.hass)
+        await async_request_update(self._zone_config(), self.hass)
 
     async def async_turn_off(self, **kwargs):
         """Turn the switch off."""
         self._attr_is_on = False
-        self.hass.data[self._attr_unique_id] = False
+        self.switch_states[self._attr_unique_id] = False
         self.async_write_ha_state()
-        await update_ags_sensors(self.hass.data[DOMAIN], self.hass)
+        await async_request_update(self._zone_config(), self.hass)
+
+    def _zone_config(self):
+        """Return the config of the zone this room belongs to."""
+        return get_room_config(self.hass.data[DOMAIN], self.room['room'])
+
+    def sync_from_data(self):
+        """Adopt a flag written directly to the runtime state, e.g. by a bulk apply."""
+        is_on = bool(self.switch_states.get(self._attr_unique_id))
+        if is_on != self._attr_is_on:
+            self._attr_is_on = is_on
+            self.async_write_ha_state()
 
     async def async_added_to_hass(self):
         """Run when entity about to be added to hass."""
@@ -160,11 +155,13 @@ class RoomSwitch(SwitchEntity, RestoreEntity):
         last_state = await self.async_get_last_state()
         if last_state:
             self._attr_is_on = last_state.state == "on"
-            self.hass.data[self._attr_unique_id] = self._attr_is_on
-        schedule_ags_update_after_start(
-            self.hass,
-            lambda: self.hass.data[DOMAIN],
-        )
+            self.switch_states[self._attr_unique_id] = self._attr_is_on
+        self.hass.data[DOMAIN].setdefault("room_switch_entities", {})[self.entity_id] = self
+        schedule_startup_refresh(self.hass)
+
+    async def async_will_remove_from_hass(self):
+        """Stop receiving bulk apply updates."""
+        self.hass.data.get(DOMAIN, {}).get("room_switch_entities", {}).pop(self.entity_id, None)
 
 class AGSActionsSwitch(SwitchEntity, RestoreEntity):
     """Global switch controlling join/unjoin actions."""
@@ -173,13 +170,10 @@ class AGSActionsSwitch(SwitchEntity, RestoreEntity):
 
     def __init__(self, hass: HomeAssistant) -> None:
         self.hass = hass
+        self.switch_states = get_runtime(hass).switch_states
         self._attr_name = "AGS Actions"
         self._attr_unique_id = "switch.ags_actions"
-        if self._attr_unique_id in hass.data:
-            self._attr_is_on = hass.data[self._attr_unique_id]
-        else:
-            self._attr_is_on = True
-            hass.data[self._attr_unique_id] = True
+        self._attr_is_on = self.switch_states.setdefault(self._attr_unique_id, True)
 
     @property
     def is_on(self) -> bool:
@@ -187,26 +181,23 @@ class AGSActionsSwitch(SwitchEntity, RestoreEntity):
 
     async def async_turn_on(self, **kwargs) -> None:
         self._attr_is_on = True
-        self.hass.data[self._attr_unique_id] = True
+        self.switch_states[self._attr_unique_id] = True
         self.async_write_ha_state()
-        await update_ags_sensors(self.hass.data[DOMAIN], self.hass)
+        await update_all_zones(self.hass)
 
     async def async_turn_off(self, **kwargs) -> None:
         self._attr_is_on = False
-        self.hass.data[self._attr_unique_id] = False
+        self.switch_states[self._attr_unique_id] = False
         self.async_write_ha_state()
-        await update_ags_sensors(self.hass.data[DOMAIN], self.hass)
+        await update_all_zones(self.hass)
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
         last_state = await self.async_get_last_state()
         if last_state:
             self._attr_is_on = last_state.state == "on"
-            self.hass.data[self._attr_unique_id] = self._attr_is_on
-        schedule_ags_update_after_start(
-            self.hass,
-            lambda: self.hass.data[DOMAIN],
-        )
+            self.switch_states[self._attr_unique_id] = self._attr_is_on
+        schedule_startup_refresh(self.hass)
 
 
 
@@ -1,3 +1,4 @@
+import asyncio
 import sys
 import os
 import types
@@ -68,6 +69,10 @@ sys.modules["homeassistant.components.sensor"].SensorDeviceClass = types.SimpleN
 sys.modules["homeassistant.helpers.restore_state"].RestoreEntity = DummyRestoreEntity
 sys.modules["homeassistant.const"].STATE_IDLE = "idle"
 sys.modules["homeassistant.const"].EVENT_HOMEASSISTANT_STARTED = "homeassistant_started"
+# Decorators only register or mark handlers; keep the functions callable.
+sys.modules["homeassistant.core"].callback = lambda func: func
+sys.modules["homeassistant.components.websocket_api"].websocket_command = lambda schema: (lambda func: func)
+sys.modules["homeassistant.components"].websocket_api = sys.modules["homeassistant.components.websocket_api"]
 
 # Add the custom_components directory to the path
 sys.path.append(os.path.abspath("custom_components"))
@@ -99,7 +104,12 @@ def test_source_utils():
             CONF_HIDDEN_SOURCE_IDS,
             CONF_SOURCE_FAVORITES,
             CONF_SOURCE_DISPLAY_NAMES,
+            SourceAvailabilityMatrix,
+            SourceView,
+            apply_source_presentation,
             combine_source_inventory,
+            find_source_by_name_or_id,
+            get_source_inventory_view,
             make_browser_source_id,
             make_source_id,
             normalize_source_storage,
@@ -144,14 +154,20 @@ def test_source_utils():
             "media_content_type": "favorite_item_id",
             "origin": "media_browser",
         }
+        def bump(config):
+            # Source writers bump the revision the inventory cache is keyed on.
+            config["source_list_revision"] = config.get("source_list_revision", 0) + 1
+
         migrated["last_discovered_sources"] = [browser_top_hit, browser_chill]
 
         migrated[CONF_SOURCE_DISPLAY_NAMES] = {top_hit_id: "Top Hits"}
+        bump(migrated)
         visible, hidden = split_source_inventory(migrated)
         assert visible[0]["Source"] == "Top Hit"
         assert hidden[0]["Source"] == "Chill"
 
         migrated[CONF_SOURCE_FAVORITES] = migrated[CONF_SOURCE_FAVORITES][:1]
+        bump(migrated)
         assert combine_source_inventory(migrated)[0]["id"] == browser_top_hit["id"]
 
         legacy_only = normalize_source_storage({
@@ -244,10 +260,56 @@ def test_source_utils():
             "media_content_type": "favorite_item_id",
         })
         catalog_config[CONF_HIDDEN_SOURCE_IDS] = [catalog_chill_id]
+        bump(catalog_config)
         visible, hidden = split_source_inventory(catalog_config)
         assert [source["id"] for source in visible] == [catalog_top_id]
         assert catalog_chill_id in [source["id"] for source in hidden]
 
+        base = {"id": "x", "Source": "Raw", "folder_path": ["Favorites"]}
+        presented = apply_source_presentation(base, {"x": "Shown"}, "x")
+        assert isinstance(presented, SourceView)
+        assert presented["Source"] == "Shown" and presented["source_default"] is True
+        assert presented["folder_path"] is base["folder_path"]
+        assert base["Source"] == "Raw" and "source_default" not in base
+        assert presented.to_dict() == {**base, "Source": "Shown", "source_default": True}
+        stored_view = {**base, "Source_Value": "FV:raw", "media_content_type": "favorite_item_id"}
+        stored_sources = normalize_source_list([apply_source_presentation(stored_view, {"x": "Shown"}, None)])
+        assert type(stored_sources[0]) is dict and stored_sources[0]["Source"] == "Shown"
+        import ags_service as ags_init
+
+        assert ags_init._config_digest({"source_favorites": [presented]}) == ags_init._config_digest(
+            {"source_favorites": [presented.to_dict()]}
+        )
+
+        view = get_source_inventory_view(catalog_config)
+        assert get_source_inventory_view(catalog_config) is view
+        assert find_source_by_name_or_id(catalog_config, "fv:TOP-HIT")["id"] == catalog_top_id
+        assert find_source_by_name_or_id(catalog_config, "Chill") is None
+        catalog_config[CONF_HIDDEN_SOURCE_IDS] = []
+        assert get_source_inventory_view(catalog_config) is view
+        bump(catalog_config)
+        assert get_source_inventory_view(catalog_config) is not view
+        assert find_source_by_name_or_id(catalog_config, catalog_chill_id)["Source"] == "Chill"
+
+        matrix = SourceAvailabilityMatrix(
+            [
+                {"id": "a", "available_on": ["media_player.b"]},
+                {"id": "b", "available_on": ["media_player.c", "media_player.b"]},
+                {"id": "c"},
+            ],
+            ["media_player.a", "media_player.b", "media_player.c"],
+        )
+        assert not matrix.is_available_on({"id": "a"}, "media_player.a")
+        assert matrix.is_available_on({"id": "c"}, "media_player.a")
+        assert matrix.best_speaker({"id": "b"}) == "media_player.b"
+        matrix.update_speakers(["media_player.a", "media_player.c"], [])
+        assert matrix.best_speaker({"id": "b"}) == "media_player.c"
+        assert matrix.best_speaker({"id": "a"}) is None
+        matrix.update_speakers(["media_player.a", "media_player.b", "media_player.c"], ["media_player.c"])
+        assert matrix.best_speaker({"id": "a"}) is None
+        assert matrix.fallback_source("media_player.a", "a")["id"] == "c"
+        assert matrix.fallback_source("media_player.b", "a")["id"] == "b"
+
         print("✓ source_utils migration/filtering/catalog split successful")
         return True
     except Exception as e:
@@ -257,6 +319,675 @@ def test_source_utils():
         return False
 
 
+def test_config_persistence():
+    try:
+        from ags_service import ConfigPersistence
+
+        class FakeStore:
+            def __init__(self):
+                self.saved = []
+
+            async def async_save(self, data):
+                self.saved.append(data)
+
+        main_store, backup_store = FakeStore(), FakeStore()
+        first = {"rooms": [{"room": "Den", "devices": []}]}
+        persistence = ConfigPersistence(MagicMock(), main_store, backup_store)
+        persistence.prime(first, first)
+        persistence.async_schedule_save({"rooms": [{"room": "Den", "devices": []}]})
+        asyncio.run(persistence.async_flush())
+        assert main_store.saved == [] and persistence.stats["skipped_unchanged"] == 1
+        second = {"rooms": [{"room": "Kitchen", "devices": []}]}
+        third = {"rooms": [{"room": "Office", "devices": []}]}
+        persistence.async_schedule_save(second)
+        persistence.async_schedule_save(third)
+        asyncio.run(persistence.async_flush())
+        assert main_store.saved == [third]
+        assert backup_store.saved == []
+        assert persistence.stats["coalesced"] == 1 and persistence.stats["written"] == 1
+        persistence.async_schedule_save(second)
+        asyncio.run(persistence.async_flush())
+        assert backup_store.saved == [third] and main_store.saved[-1] == second
+
+        catalog_store = FakeStore()
+        persistence = ConfigPersistence(MagicMock(), FakeStore(), FakeStore(), catalog_store)
+        catalog = [{"id": "a", "Source": "A"}]
+        persistence.async_schedule_save({**first, "last_discovered_sources": catalog})
+        asyncio.run(persistence.async_flush())
+        assert "last_discovered_sources" in persistence.store.saved[-1]
+        persistence.prime_catalog(None)
+        persistence.async_schedule_save({**second, "last_discovered_sources": catalog})
+        asyncio.run(persistence.async_flush())
+        persistence.async_schedule_save({**third, "last_discovered_sources": catalog})
+        asyncio.run(persistence.async_flush())
+        assert catalog_store.saved == [{"last_discovered_sources": catalog}]
+        assert persistence.store.saved[-1] == third
+
+        class FailingStore(FakeStore):
+            def __init__(self, failures):
+                super().__init__()
+                self.failures = failures
+
+            async def async_save(self, data):
+                if self.failures:
+                    self.failures -= 1
+                    raise OSError("disk full")
+                await super().async_save(data)
+
+        persistence = ConfigPersistence(MagicMock(), FailingStore(1), FakeStore())
+        persistence.async_schedule_save(second)
+        asyncio.run(persistence.async_flush())
+        assert persistence.stats["failed"] == 1 and persistence.as_dict()["pending"]
+        asyncio.run(persistence.async_flush())
+        assert persistence.store.saved == [second] and not persistence.as_dict()["pending"]
+
+        import ags_service as ags_init
+
+        pending_hass = types.SimpleNamespace(data={"ags_service": {"_config_persistence": types.SimpleNamespace(catalog_loaded=False)}})
+        catalog_ref = {"rooms": [], "default_source_id": "favorite_item_id::fv:deep"}
+        assert ags_init.sanitize_runtime_config(catalog_ref, pending_hass)["default_source_id"] == "favorite_item_id::fv:deep"
+        pending_hass.data["ags_service"]["_config_persistence"].catalog_loaded = True
+        assert ags_init.sanitize_runtime_config(catalog_ref, pending_hass)["default_source_id"] is None
+
+        loads = []
+
+        async def flaky_load(_hass):
+            loads.append(len(loads))
+            if len(loads) == 1:
+                raise OSError("store unreadable")
+
+        async def ensure_twice():
+            load_hass = types.SimpleNamespace(data={}, async_create_task=asyncio.ensure_future)
+            try:
+                await ags_init.async_ensure_source_catalog(load_hass)
+            except OSError:
+                pass
+            assert "_source_catalog_load" not in load_hass.data["ags_service"]
+            await ags_init.async_ensure_source_catalog(load_hass)
+            await ags_init.async_ensure_source_catalog(load_hass)
+
+        original_load = ags_init._async_load_source_catalog
+        ags_init._async_load_source_catalog = flaky_load
+        try:
+            asyncio.run(ensure_twice())
+        finally:
+            ags_init._async_load_source_catalog = original_load
+        assert loads == [0, 1]
+
+        print("✓ config persistence coalescing/catalog split successful")
+        return True
+    except Exception as e:
+        print(f"✗ config persistence coalescing/catalog split test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_unload_entry():
+    try:
+        from ags_service import async_unload_entry
+
+        unsubscribed = []
+
+        async def unload_platforms(entry, platforms):
+            return True
+
+        unload_hass = types.SimpleNamespace(
+            data={"ags_service": {"_config_registry_listeners": [lambda: unsubscribed.append("area"), lambda: unsubscribed.append("entity")]}},
+            config_entries=types.SimpleNamespace(async_unload_platforms=unload_platforms),
+        )
+        assert asyncio.run(async_unload_entry(unload_hass, None)) is True
+        assert unsubscribed == ["area", "entity"] and "_config_registry_listeners" not in unload_hass.data["ags_service"]
+
+        print("✓ unload listener cleanup successful")
+        return True
+    except Exception as e:
+        print(f"✗ unload listener cleanup test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_log_handler():
+    try:
+        import logging
+        from ags_service import AGSLogHandler
+
+        handler = AGSLogHandler(capacity=3)
+        streamed = []
+        handler.listeners.append(streamed.append)
+        test_logger = logging.getLogger("ags_service_log_buffer_test")
+        test_logger.propagate = False
+        test_logger.addHandler(handler)
+        test_logger.setLevel(logging.DEBUG)
+        for index in range(4):
+            test_logger.info("entry %s", index)
+        test_logger.warning("careful")
+        assert [entry["message"] for entry in handler.records] == ["entry 2", "entry 3", "careful"]
+        assert [entry["seq"] for entry in handler.query(level="warning")] == [5]
+        assert [entry["message"] for entry in handler.query(after=3)] == ["entry 3", "careful"]
+        assert len(streamed) == 5 and streamed[-1]["level"] == "WARNING"
+        assert streamed[-1]["boot_id"] == handler.boot_id != AGSLogHandler().boot_id
+        assert handler.cursor(3, handler.boot_id) == 3 and handler.cursor(3, None) == 3
+        assert handler.cursor(3, "previous-boot") is None
+        handler.set_capacity(1)
+        assert [entry["seq"] for entry in handler.records] == [5]
+
+        print("✓ log buffer successful")
+        return True
+    except Exception as e:
+        print(f"✗ log buffer test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_area_index():
+    try:
+        import ags_service as ags_init
+
+        ns = types.SimpleNamespace
+        areas = {"den": ns(id="den", name="Den"), "attic": ns(id="attic", name="Attic")}
+        devices = {"dev1": ns(id="dev1", area_id="den")}
+        entities = {
+            "media_player.den_tv": ns(entity_id="media_player.den_tv", domain="media_player", area_id=None, device_id="dev1", original_name=None, name=None),
+            "light.den": ns(entity_id="light.den", domain="light", area_id="den", device_id=None, original_name=None, name=None),
+        }
+        originals = (
+            ags_init.ar.async_get,
+            ags_init.dr.async_get,
+            ags_init.er.async_get,
+            ags_init.ar.EVENT_AREA_REGISTRY_UPDATED,
+            ags_init.dr.EVENT_DEVICE_REGISTRY_UPDATED,
+            ags_init.er.EVENT_ENTITY_REGISTRY_UPDATED,
+        )
+        try:
+            ags_init.ar.async_get = lambda _hass: ns(areas=areas, async_get_area=areas.get)
+            ags_init.dr.async_get = lambda _hass: ns(devices=devices, async_get=devices.get)
+            ags_init.er.async_get = lambda _hass: ns(entities=entities, async_get=entities.get)
+            ags_init.ar.EVENT_AREA_REGISTRY_UPDATED = "area_registry_updated"
+            ags_init.dr.EVENT_DEVICE_REGISTRY_UPDATED = "device_registry_updated"
+            ags_init.er.EVENT_ENTITY_REGISTRY_UPDATED = "entity_registry_updated"
+            area_hass = ns(data={}, states=ns(get=lambda _entity_id: None))
+            listed = ags_init._get_ha_areas_with_media_players(area_hass)
+            assert [area["area_id"] for area in listed] == ["attic", "den"]
+            assert listed[1]["media_players"] == [
+                {"entity_id": "media_player.den_tv", "name": "media_player.den_tv", "device_type": "tv"}
+            ]
+            assert ags_init._get_ha_areas_with_media_players(area_hass) is listed
+            index = area_hass.data["ags_service"]["_area_index"]
+            devices["dev1"] = ns(id="dev1", area_id="attic")
+            index.async_handle_event(ns(event_type="device_registry_updated", data={"action": "update", "device_id": "dev1"}))
+            listed = ags_init._get_ha_areas_with_media_players(area_hass)
+            assert [len(area["media_players"]) for area in listed] == [1, 0]
+            entities["media_player.attic"] = ns(entity_id="media_player.attic", domain="media_player", area_id="attic", device_id=None, original_name="Attic Speaker", name=None)
+            index.async_handle_event(ns(event_type="entity_registry_updated", data={"action": "create", "entity_id": "media_player.attic"}))
+            listed = ags_init._get_ha_areas_with_media_players(area_hass)
+            assert [player["name"] for player in listed[0]["media_players"]] == ["Attic Speaker", "media_player.den_tv"]
+            assert index.stats == {"builds": 1, "incremental_updates": 2}
+        finally:
+            (
+                ags_init.ar.async_get,
+                ags_init.dr.async_get,
+                ags_init.er.async_get,
+                ags_init.ar.EVENT_AREA_REGISTRY_UPDATED,
+                ags_init.dr.EVENT_DEVICE_REGISTRY_UPDATED,
+                ags_init.er.EVENT_ENTITY_REGISTRY_UPDATED,
+            ) = originals
+
+        print("✓ area index incremental updates successful")
+        return True
+    except Exception as e:
+        print(f"✗ area index incremental updates test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_apply_transaction():
+    try:
+        from ags_service import ags_service as ags_logic
+        from ags_service.runtime import get_runtime
+
+        ns = types.SimpleNamespace
+
+        recomputes = []
+
+        async def fake_update(config, hass):
+            runtime = get_runtime(hass)
+            recomputes.append(dict(runtime.switch_states, **runtime.snapshot(("switch_media_system_state", "ags_media_player_source_id"))))
+            runtime.active_speakers = ["media_player.den"]
+            return "OFF", "ON"
+
+        class FakeRoomSwitch:
+            synced = 0
+
+            def sync_from_data(self):
+                FakeRoomSwitch.synced += 1
+
+        apply_hass = ns(data={
+            "ags_service": {
+                "room_switch_entities": {"switch.den_media": FakeRoomSwitch()},
+                "source_favorites": [{"id": "jazz", "Source": "Jazz", "Source_Value": "FV:1", "media_content_type": "favorite_item_id"}],
+            },
+        })
+        get_runtime(apply_hass).switch_states["switch.kitchen_media"] = True
+        apply_config = {"rooms": [{"room": "Den", "devices": []}, {"room": "Kitchen", "devices": []}]}
+        original_update, original_enqueue = ags_logic.update_ags_sensors, ags_logic.enqueue_media_action
+        queued = []
+
+        async def fake_enqueue(hass, service, data):
+            queued.append((service, data))
+
+        ags_logic.update_ags_sensors, ags_logic.enqueue_media_action = fake_update, fake_enqueue
+        try:
+            result = asyncio.run(ags_logic.async_apply_transaction(
+                apply_hass, apply_config, rooms={"Den": True}, exclusive=True, source="Jazz", volume=0.3
+            ))
+        finally:
+            ags_logic.update_ags_sensors, ags_logic.enqueue_media_action = original_update, original_enqueue
+        assert len(recomputes) == 1
+        assert recomputes[0]["switch.den_media"] is True and recomputes[0]["switch.kitchen_media"] is False
+        assert recomputes[0]["switch_media_system_state"] is True
+        assert recomputes[0]["ags_media_player_source_id"] == "jazz"
+        assert result["changed_rooms"] == ["Den", "Kitchen"] and FakeRoomSwitch.synced == 1
+        assert queued == [("volume_set", {"entity_id": ["media_player.den"], "volume_level": 0.3})]
+
+        # Zone rooms are applied to their zone in a pass of its own.
+        from ags_service.runtime import CURRENT_ZONE
+
+        apply_hass.data["ags_service"]["zones"] = [{"zone": "Guest", "rooms": [{"room": "Suite", "devices": []}]}]
+        apply_hass.data["ags_service"]["config_revision"] = 1
+        zone_passes = []
+
+        async def fake_zone_update(config, hass):
+            zone_passes.append((CURRENT_ZONE.get(), config.get("zone_id"), get_runtime(hass).switch_media_system_state))
+            return "OFF", "ON"
+
+        ags_logic.update_ags_sensors, ags_logic.enqueue_media_action = fake_zone_update, fake_enqueue
+        try:
+            result = asyncio.run(ags_logic.async_apply_transaction(apply_hass, apply_config, rooms={"Suite": True}))
+        finally:
+            ags_logic.update_ags_sensors, ags_logic.enqueue_media_action = original_update, original_enqueue
+        assert zone_passes == [("guest", "guest", True)]
+        assert result["changed_rooms"] == ["Suite"] and result["zones"] == {"guest": {"previous_status": "OFF", "status": "ON"}}
+        assert get_runtime(apply_hass).switch_states["switch.suite_media"] is True
+
+        print("✓ bulk apply transaction successful")
+        return True
+    except Exception as e:
+        print(f"✗ bulk apply transaction test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_startup_config():
+    try:
+        import ags_service as ags_init
+
+        rooms_only = {"rooms": [{"room": "Den", "devices": []}]}
+        resolved = ags_init._resolve_startup_config(
+            None, None, legacy_config={}, entry_config=rooms_only, reinitializing=False
+        )
+        assert resolved == rooms_only and resolved is not rooms_only
+        resolved = ags_init._resolve_startup_config(
+            {"rooms": []}, rooms_only, legacy_config={}, entry_config={}, reinitializing=True
+        )
+        assert resolved == rooms_only
+        resolved = ags_init._resolve_startup_config(
+            rooms_only, None, legacy_config={"rooms": [{"room": "Attic", "devices": []}], "static_name": "AGS"}, entry_config={}, reinitializing=False
+        )
+        assert resolved["static_name"] == "AGS" and resolved["rooms"] == rooms_only["rooms"]
+
+        print("✓ startup config resolution successful")
+        return True
+    except Exception as e:
+        print(f"✗ startup config resolution test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_warm_start():
+    try:
+        from ags_service import ags_service as ags_logic
+        from ags_service.runtime import get_runtime
+
+        ns = types.SimpleNamespace
+
+        delayed = []
+        warm_hass = ns(data={"ags_service": {"decision_store": ns(async_delay_save=lambda func, delay: delayed.append(func()))}})
+        snapshot = {
+            "ags_status": "ON",
+            "active_rooms": ["Den"],
+            "primary_speaker": "media_player.den",
+            "ags_media_player_source": "Jazz",
+            "ags_media_player_source_id": "jazz",
+        }
+        ags_logic.seed_warm_start(warm_hass, snapshot)
+        warm_runtime = get_runtime(warm_hass)
+        assert warm_hass.data["ags_service"]["runtime"] is warm_runtime and not hasattr(warm_runtime, "__dict__")
+        assert warm_runtime.primary_speaker == "media_player.den"
+        assert warm_runtime.ags_warm_start is snapshot
+        warm_runtime.ags_status, warm_runtime.active_rooms = "ON", ["Den"]
+        ags_logic.persist_decision_snapshot(warm_hass)
+        assert delayed == []
+        warm_runtime.active_rooms = ["Den", "Kitchen"]
+        ags_logic.persist_decision_snapshot(warm_hass)
+        assert delayed[-1]["active_rooms"] == ["Den", "Kitchen"]
+
+        print("✓ warm start snapshot successful")
+        return True
+    except Exception as e:
+        print(f"✗ warm start snapshot test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_state_tracker():
+    try:
+        from ags_service import ags_service as ags_logic
+
+        subscribed, unsubscribed = [], []
+
+        def fake_track(_hass, entity_ids, _action):
+            subscribed.extend(entity_ids)
+            return lambda: unsubscribed.extend(entity_ids)
+
+        original_track = ags_logic.async_track_state_change_event
+        ags_logic.async_track_state_change_event = fake_track
+        try:
+            tracker = ags_logic.IncrementalStateTracker(None, None)
+            tracked_config = {
+                "rooms": [{"room": "Den", "devices": [{"device_id": "media_player.den"}]}],
+                "create_sensors": True,
+            }
+            tracker.update(ags_logic.get_tracked_entity_ids(tracked_config))
+            assert sorted(subscribed) == ["media_player.den", "switch.ags_actions", "switch.den_media", "zone.home"]
+            tracked_config["rooms"] = [{"room": "Den", "devices": [{"device_id": "media_player.den_sub"}]}]
+            added, removed = tracker.update(ags_logic.get_tracked_entity_ids(tracked_config))
+            assert added == {"media_player.den_sub"} and removed == {"media_player.den"}
+            assert unsubscribed == ["media_player.den"] and len(subscribed) == 5
+            tracker.clear()
+            assert len(unsubscribed) == 5 and tracker.entity_ids == set()
+        finally:
+            ags_logic.async_track_state_change_event = original_track
+
+        print("✓ incremental state tracker successful")
+        return True
+    except Exception as e:
+        print(f"✗ incremental state tracker test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_config_memo():
+    try:
+        import ags_service as ags_init
+
+        sanitize_calls = []
+        original_sanitize = ags_init._sanitize_runtime_config
+
+        def counting_sanitize(raw):
+            sanitize_calls.append(raw)
+            return original_sanitize(raw)
+
+        memo_hass = types.SimpleNamespace(data={})
+        ags_init._sanitize_runtime_config = counting_sanitize
+        try:
+            raw_doc = {"rooms": [{"room": "Memo", "devices": [{"device_id": "media_player.memo", "device_type": "speaker"}]}]}
+            first = ags_init.sanitize_runtime_config(raw_doc, memo_hass)
+            second = ags_init.sanitize_runtime_config({"rooms": [dict(raw_doc["rooms"][0])]}, memo_hass)
+            assert len(sanitize_calls) == 1 and first == second and first is not second
+            second["rooms"][0]["room"] = "Changed"
+            second["rooms"][0]["devices"][0]["priority"] = 7
+            assert ags_init.sanitize_runtime_config(raw_doc, memo_hass) == first
+            # Each AGS runtime keeps its own memo.
+            ags_init.sanitize_runtime_config(raw_doc, types.SimpleNamespace(data={}))
+            assert len(sanitize_calls) == 2
+        finally:
+            ags_init._sanitize_runtime_config = original_sanitize
+        # Sanitizing never edits the caller's document.
+        legacy_doc = {"rooms": [{"room": "Legacy", "devices": [{"device_id": "media_player.tv", "device_type": "tv", "ott_devices": [{"ott_device": "remote.box"}]}]}]}
+        legacy_devices = legacy_doc["rooms"][0]["devices"]
+        migrated = ags_init.sanitize_runtime_config(legacy_doc)
+        assert len(legacy_devices) == 1 and "unique_id" not in legacy_devices[0]
+        assert [device["device_type"] for device in migrated["rooms"][0]["devices"]] == ["tv", "ott"]
+
+        print("✓ config sanitize memo successful")
+        return True
+    except Exception as e:
+        print(f"✗ config_memo test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_zones():
+    try:
+        import ags_service as ags_init
+        from ags_service import ags_service as ags_logic
+        from ags_service.runtime import get_runtime, zone_scope
+
+        ns = types.SimpleNamespace
+
+        zones = ags_init.sanitize_runtime_config({
+            "rooms": [{"room": "Den", "devices": []}],
+            "zones": [
+                {"zone": "Guest House", "rooms": [{"room": "Den", "devices": []}, {"room": "Suite", "devices": []}]},
+                {"zone": "guest house", "rooms": []},
+            ],
+        })["zones"]
+        assert [(zone["zone"], [room["room"] for room in zone["rooms"]]) for zone in zones] == [("Guest House", ["Suite"])]
+        zone_data = {
+            "rooms": [{"room": "Den", "devices": []}],
+            "zones": zones,
+            "static_name": "Main",
+            "off_override": True,
+            "store": object(),
+            "config_revision": 1,
+        }
+        zone_configs = ags_logic.get_zone_configs(zone_data)
+        guest = zone_configs["guest_house"]
+        assert guest["zone_id"] == "guest_house" and guest["static_name"] == "Guest House" and "zones" not in guest
+        assert guest["off_override"] is True and not {"store", "config_revision", "_zone_configs"} & set(guest)
+        assert ags_logic.get_zone_configs(zone_data) is zone_configs
+        assert ags_logic.get_room_config(zone_data, "Suite") is guest and ags_logic.get_room_config(zone_data, "Den") is zone_data
+
+        async def zone_queues():
+            zone_hass = ns(data={"ags_service": {}}, loop=asyncio.get_running_loop())
+            await ags_logic.ensure_action_queue(zone_hass)
+            with zone_scope(guest):
+                await ags_logic.ensure_action_queue(zone_hass)
+                guest_runtime = get_runtime(zone_hass)
+            ags_data = zone_hass.data["ags_service"]
+            guest_queue = ags_data["zone_data"]["guest_house"]["action_queue"]
+            for data in [ags_data, ags_data["zone_data"]["guest_house"]]:
+                data["action_worker"].cancel()
+            return ags_data, guest_queue, guest_runtime, get_runtime(zone_hass)
+
+        ags_data, guest_queue, guest_runtime, main_runtime = asyncio.run(zone_queues())
+        assert guest_queue is not ags_data["action_queue"]
+        assert guest_runtime is not main_runtime and guest_runtime.switch_states is main_runtime.switch_states
+
+        print("✓ zone configs and queues successful")
+        return True
+    except Exception as e:
+        print(f"✗ zones test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_switch_coalescing():
+    try:
+        from ags_service import ags_service as ags_logic
+
+        ns = types.SimpleNamespace
+        guest = {"rooms": [], "zone_id": "guest_house"}
+
+        coalesced = []
+
+        async def counting_update(config, hass):
+            coalesced.append(config.get("zone_id"))
+            return "OFF", "ON"
+
+        def switch_hass():
+            loop = asyncio.get_running_loop()
+            tasks = []
+
+            def create_background_task(target, name):
+                tasks.append(loop.create_task(target, name=name))
+                return tasks[-1]
+
+            return ns(data={"ags_service": {}}, loop=loop, async_create_background_task=create_background_task, tasks=tasks)
+
+        async def flip_switches():
+            flip_hass = switch_hass()
+            return await asyncio.gather(
+                *(ags_logic.async_request_update({"rooms": []}, flip_hass) for _ in range(5)),
+                ags_logic.async_request_update(guest, flip_hass),
+            )
+
+        async def cancel_pending_switch():
+            cancel_hass = switch_hass()
+            waiter = asyncio.ensure_future(ags_logic.async_request_update({"rooms": []}, cancel_hass))
+            while not cancel_hass.tasks:
+                await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            cancel_hass.tasks[0].cancel()
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                pass
+            else:
+                raise AssertionError("cancelled switch update should cancel its waiters")
+            assert "pending_update" not in cancel_hass.data["ags_service"]
+            ags_logic.SWITCH_COALESCE_DELAY = 0
+            return await ags_logic.async_request_update({"rooms": []}, cancel_hass)
+
+        original_update, original_delay = ags_logic.update_ags_sensors, ags_logic.SWITCH_COALESCE_DELAY
+        ags_logic.update_ags_sensors, ags_logic.SWITCH_COALESCE_DELAY = counting_update, 0
+        try:
+            results = asyncio.run(flip_switches())
+            assert sorted(coalesced, key=str) == [None, "guest_house"] and results[0] == ("OFF", "ON")
+            ags_logic.SWITCH_COALESCE_DELAY = 60
+            assert asyncio.run(cancel_pending_switch()) == ("OFF", "ON")
+        finally:
+            ags_logic.update_ags_sensors, ags_logic.SWITCH_COALESCE_DELAY = original_update, original_delay
+
+        print("✓ switch coalescing successful")
+        return True
+    except Exception as e:
+        print(f"✗ switch_coalescing test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_room_records():
+    try:
+        import ags_service as ags_init
+        from ags_service import ags_service as ags_logic
+        from ags_service.runtime import get_runtime
+
+        ns = types.SimpleNamespace
+
+        record_rooms = [
+            {"room": "Living Room", "devices": [
+                {"device_id": "media_player.lr_tv", "device_type": "tv", "priority": 1},
+                {"device_id": "media_player.lr", "device_type": "speaker", "priority": 3},
+                {"device_id": "media_player.lr_old", "device_type": "speaker", "priority": 0, "disabled": True},
+            ]},
+            {"room": "Office", "devices": [{"device_id": "media_player.office", "device_type": "speaker", "priority": 2}]},
+        ]
+        room_index = ags_logic.get_room_records(record_rooms)
+        assert ags_logic.get_room_records(record_rooms) is room_index
+        # A config write bumps the revision, which drops compiled records even
+        # when the rooms list itself was edited in place.
+        record_rooms[1]["devices"][0]["priority"] = 4
+        ags_init._bump_config_revision(ns(data={}))
+        assert ags_logic.get_ranked_speaker_entity_ids(record_rooms) == ["media_player.lr", "media_player.office"]
+        record_rooms[1]["devices"][0]["priority"] = 2
+        ags_init._bump_config_revision(ns(data={}))
+        room_index = ags_logic.get_room_records(record_rooms)
+        living = room_index.rooms[0]
+        assert living.switch_key == "switch.living_room_media" and living.as_dict() is record_rooms[0]
+        assert [device.device_id for device in living.speakers] == ["media_player.lr"] and living.tvs[0].tv_mode == "tv_audio"
+        assert ags_logic.get_ranked_speaker_entity_ids(record_rooms) == ["media_player.office", "media_player.lr"]
+        record_hass = ns(data={"ags_service": {}}, states=ns(get=lambda entity_id: None))
+        record_runtime = get_runtime(record_hass)
+        record_runtime.ags_status, record_runtime.active_rooms = "ON", ["Office"]
+        assert ags_logic.update_speaker_states(record_rooms, record_hass) == (["media_player.office"], ["media_player.lr"])
+        assert ags_logic.get_preferred_primary_speaker(record_rooms, record_hass) == "media_player.office"
+        assert ags_logic.get_inactive_tv_speakers(record_rooms, record_hass) == ["media_player.lr"]
+
+        # Configs are never edited in place, so a changed room is a new list.
+        appletv = {"device_id": "media_player.appletv", "device_type": "ott", "parent_tv": "media_player.lr_tv", "tv_input": "HDMI 2", "priority": 4}
+        record_rooms = [{**record_rooms[0], "devices": [*record_rooms[0]["devices"], appletv]}, record_rooms[1]]
+        tv_states = {
+            "media_player.lr_tv": ns(state="on", attributes={"source": "hdmi 2"}),
+            "media_player.lr": ns(state="idle", attributes={}),
+            "media_player.lr_old": ns(state="playing", attributes={}),
+        }
+        tv_hass = ns(data={"ags_service": {}}, states=ns(get=tv_states.get))
+        tv_runtime = get_runtime(tv_hass)
+        tv_runtime.ags_status, tv_runtime.active_rooms = "ON TV", ["Living Room"]
+        living = ags_logic.get_room_records(record_rooms).rooms[0]
+        assert living.otts_for(living.tvs[0])[0].tv_input == "HDMI 2"
+        assert ags_logic.get_room_tv_control_device(living, tv_hass) == "media_player.appletv"
+        assert ags_logic.check_primary_speaker_logic({"rooms": record_rooms}, tv_hass) == "media_player.lr"
+        tv_runtime.primary_speaker = "media_player.lr"
+        assert ags_logic.get_control_device_id({"rooms": record_rooms}, tv_hass) == "media_player.appletv"
+
+        print("✓ room records successful")
+        return True
+    except Exception as e:
+        print(f"✗ room_records test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_startup_refresh():
+    try:
+        from ags_service import ags_service as ags_logic
+
+        ns = types.SimpleNamespace
+
+        started_listeners, zone_refreshes = [], []
+
+        async def counting_all_zones(hass):
+            zone_refreshes.append(hass)
+
+        startup_hass = ns(
+            data={"ags_service": {}},
+            is_running=False,
+            bus=ns(async_listen_once=lambda event, listener: started_listeners.append(listener)),
+        )
+        original_all_zones = ags_logic.update_all_zones
+        ags_logic.update_all_zones = counting_all_zones
+        try:
+            for _ in range(4):
+                ags_logic.schedule_startup_refresh(startup_hass)
+            assert len(started_listeners) == 1
+            asyncio.run(started_listeners[0]())
+        finally:
+            ags_logic.update_all_zones = original_all_zones
+        assert zone_refreshes == [startup_hass] and "startup_refresh_pending" not in startup_hass.data["ags_service"]
+
+        print("✓ startup refresh successful")
+        return True
+    except Exception as e:
+        print(f"✗ startup_refresh test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def test_media_player_source_helpers():
     try:
         from ags_service.media_player import AGSPrimarySpeakerMediaPlayer
@@ -338,6 +1069,58 @@ def test_media_player_source_helpers():
         assert favorites[0]["id"] == "favorite_item_id::FV:top-hit"
         assert favorites[0]["source_default"] is True
         assert default_id == "favorite_item_id::FV:top-hit"
+        assert player._last_merge_stats["matched"] == 1
+        assert player._last_merge_stats["merged"] == 1
+
+        from ags_service.media_player import CrawlBudget
+
+        budget = CrawlBudget(3, 4, None)
+        crawl_results = []
+        asyncio.run(player._async_crawl_favorite_sources(
+            "media_player.top_rank",
+            {
+                "children": [
+                    {
+                        "title": f"Station {index}",
+                        "media_content_id": f"FV:{index}",
+                        "media_content_type": "favorite_item_id",
+                        "can_play": True,
+                    }
+                    for index in range(6)
+                ]
+            },
+            crawl_results,
+            set(),
+            folder_path=["Favorites"],
+            budget=budget,
+        ))
+        assert len(crawl_results) == 3
+        assert budget.as_dict()["exhausted"] == "max_nodes"
+
+        # A zones-only setup has no main rooms; saving discovered sources must
+        # keep its zones and newer settings.
+        from ags_service import media_player as media_player_module
+
+        saved = []
+
+        async def capture_save(_hass, config, store=None):
+            saved.append(config)
+
+        zone_only = {
+            "rooms": [],
+            "zones": [{"zone": "Guest", "rooms": [{"room": "Suite", "devices": []}]}],
+            "log_buffer_size": 500,
+            "portal_media_player": "custom",
+        }
+        original_save = media_player_module._async_save_config_with_backup
+        media_player_module._async_save_config_with_backup = capture_save
+        player.async_schedule_update_ha_state = lambda *_args: None
+        try:
+            asyncio.run(player._async_persist_source_inventory(zone_only, [], [], None))
+        finally:
+            media_player_module._async_save_config_with_backup = original_save
+        assert saved[0]["zones"] == zone_only["zones"]
+        assert saved[0]["log_buffer_size"] == 500 and saved[0]["portal_media_player"] == "custom"
 
         print("✓ media_player source helper fallback/migration successful")
         return True
@@ -405,12 +1188,6 @@ def test_media_player_display_metadata():
                     "source_display_names": {},
                     "default_source_id": None,
                 },
-                "active_rooms": ["Kitchen", "Patio"],
-                "active_speakers": ["media_player.kitchen", "media_player.patio"],
-                "ags_status": "ON",
-                "primary_speaker": "media_player.kitchen",
-                "preferred_primary_speaker": "media_player.kitchen",
-                "ags_media_player_source": "Spotify",
             },
             states=States({
                 "media_player.kitchen": State("playing", {"app_name": "Spotify"}),
@@ -421,14 +1198,21 @@ def test_media_player_display_metadata():
         )
 
         player = AGSPrimarySpeakerMediaPlayer(hass, {})
+        runtime = player.runtime
+        runtime.active_rooms = ["Kitchen", "Patio"]
+        runtime.active_speakers = ["media_player.kitchen", "media_player.patio"]
+        runtime.ags_status = "ON"
+        runtime.primary_speaker = "media_player.kitchen"
+        runtime.preferred_primary_speaker = "media_player.kitchen"
+        runtime.ags_media_player_source = "Spotify"
         player.hass = hass
         player.entity_id = "media_player.ags_media_player"
         player.ags_status = "ON"
         player.primary_speaker_room = "Kitchen"
         player.primary_speaker_entity_id = "media_player.kitchen"
         player.primary_speaker_state = hass.states.get("media_player.kitchen")
-        player.active_rooms = hass.data["active_rooms"]
-        player.active_speakers = hass.data["active_speakers"]
+        player.active_rooms = runtime.active_rooms
+        player.active_speakers = runtime.active_speakers
 
         attrs = player.extra_state_attributes
         assert player.name == "Jason Audio"
@@ -441,6 +1225,61 @@ def test_media_player_display_metadata():
         assert source_artwork_url("Music").endswith("/apple-music.svg")
         assert player._normalize_native_source("Netflix")["thumbnail"] == source_artwork_url("Netflix")
         assert attrs["ags_sources"][0]["thumbnail"] == source_artwork_url("Spotify")
+        assert "room_diagnostics" not in attrs
+        assert "ags_all_sources" in attrs
+        assert "ags_all_sources" in AGSPrimarySpeakerMediaPlayer._unrecorded_attributes
+        hass.data["ags_service"]["compact_attributes"] = True
+        compact = player.extra_state_attributes
+        assert "ags_all_sources" not in compact and "ags_hidden_sources" not in compact
+        assert compact["ags_sources"] is attrs["ags_sources"] and compact["room_details"] is attrs["room_details"]
+        assert "devices" in compact["room_details"][0] and "thumbnail" in compact["ags_sources"][0]
+        hass.data["ags_service"]["compact_attributes"] = False
+        assert player.extra_state_attributes["ags_sources"] is attrs["ags_sources"]
+        assert player.extra_state_attributes["room_details"] is attrs["room_details"]
+        hass.states.values["media_player.patio"] = State("playing", {"source": "Radio"})
+        assert player.extra_state_attributes["room_details"] is not attrs["room_details"]
+        revision, snapshot = player.publish_state_snapshot()
+        assert revision == 1 and snapshot["speakers"]["media_player.patio"][0] == "playing"
+        assert player.publish_state_snapshot() == (1, snapshot)
+        hass.states.values["media_player.patio"] = State("idle", {"volume_level": 0.4})
+        revision, snapshot = player.publish_state_snapshot()
+        assert revision == 2 and snapshot["speakers"]["media_player.patio"] == ["idle", 0.4, None]
+
+        from ags_service import media_player as media_player_module
+
+        followed, published = [], []
+        original_track = media_player_module.async_track_state_change_event
+        original_send = media_player_module.async_dispatcher_send
+        media_player_module.async_track_state_change_event = (
+            lambda hass, entity_ids, action: followed.append((entity_ids, action)) or (lambda: followed.clear())
+        )
+        media_player_module.async_dispatcher_send = lambda hass, signal, *args: published.append(args)
+        try:
+            player.sync_state_snapshot_listener()
+            assert followed == []
+            hass.data["ags_service"]["_state_subscribers"] = 1
+            player.sync_state_snapshot_listener()
+            entity_ids, on_change = followed[0]
+            assert entity_ids == ["media_player.ags_media_player", "media_player.kitchen", "media_player.patio"]
+            # A scheduled update writes the entity without going through
+            # async_write_ha_state; its state_changed event still publishes.
+            runtime.ags_status = player.ags_status = "ON TV"
+            asyncio.run(on_change(None))
+            assert len(published) == 1 and published[0][0] == 3 and published[0][1]["ags_status"] == "ON TV"
+            assert "speakers" not in published[0][1]
+            hass.states.values["media_player.patio"] = State("idle", {"volume_level": 0.4, "is_volume_muted": True})
+            asyncio.run(on_change(None))
+            assert published[-1] == (4, {"speakers": player.build_state_snapshot()["speakers"]})
+            hass.data["ags_service"]["_state_subscribers"] = 0
+            player.sync_state_snapshot_listener()
+            assert followed == []
+        finally:
+            media_player_module.async_track_state_change_event = original_track
+            media_player_module.async_dispatcher_send = original_send
+        runtime.ags_status = player.ags_status = "ON"
+        diagnostics = player.build_diagnostics()
+        assert [room["name"] for room in diagnostics["room_diagnostics"]] == ["Kitchen", "Patio"]
+        assert diagnostics["speaker_candidates"][0]["entity_id"] == "media_player.kitchen"
         browse_tree = player._apply_default_browse_art({
             "title": "Root",
             "media_content_type": "library",
@@ -456,11 +1295,11 @@ def test_media_player_display_metadata():
         assert browse_tree["children"][0]["thumbnail"] == source_artwork_url("Paramount+")
 
         player.ags_status = "ON TV"
-        hass.data["ags_status"] = "ON TV"
+        runtime.ags_status = "ON TV"
         assert player.icon == "mdi:television-play"
 
         player.ags_status = "OFF"
-        hass.data["ags_status"] = "OFF"
+        runtime.ags_status = "OFF"
         player.primary_speaker_room = None
         attrs = player.extra_state_attributes
         assert attrs["dynamic_title"] == "Jason Audio"
@@ -474,12 +1313,106 @@ def test_media_player_display_metadata():
         traceback.print_exc()
         return False
 
+def test_config_patch():
+    try:
+        import ags_service as ags_init
+
+        def speaker(entity_id, priority):
+            return {"device_id": entity_id, "device_type": "speaker", "priority": priority, "unique_id": entity_id}
+
+        stored = ags_init.sanitize_runtime_config({
+            "rooms": [
+                {"room": "Kitchen", "devices": [speaker("media_player.kitchen", 1)]},
+                {"room": "Patio", "devices": [speaker("media_player.patio", 2)]},
+            ],
+            "source_favorites": [
+                {"id": "music::top", "Source": "Top", "Source_Value": "top", "media_content_type": "music"},
+            ],
+        })
+        tasks, replies, errors = [], [], []
+        hass = types.SimpleNamespace(
+            data={"ags_service": {"store": object(), "_stored_config_cache": stored, "log_buffer_size": 2000}},
+            async_create_task=lambda coro: tasks.append(coro) or coro.close(),
+        )
+        hass.data["ags_service"].update(ags_init._runtime_config_values(stored))
+        connection = types.SimpleNamespace(
+            send_result=lambda msg_id, result=None: replies.append(result),
+            send_error=lambda msg_id, code, message: errors.append(code),
+        )
+
+        def patch(changes=None, rooms=None):
+            ags_init.ws_patch_config(hass, connection, {"id": 1, "changes": changes or {}, "rooms": rooms or {}})
+
+        originals = (ags_init.vol, ags_init.ROOM_SCHEMA, ags_init._config_key_validators)
+        ags_init.vol = types.SimpleNamespace(Invalid=ValueError, Schema=lambda validator: validator)
+        ags_init.ROOM_SCHEMA = lambda room: room
+        ags_init._config_key_validators = lambda: {
+            key: (lambda value: value)
+            for key in ("rooms", "source_display_names", "last_discovered_sources", "log_buffer_size")
+        }
+        try:
+            ags_data = hass.data["ags_service"]
+            patch(rooms={"Kitchen": {"devices": [speaker("media_player.kitchen", 5)]}})
+            assert not errors and replies[-1]["reload"] is False and replies[-1]["scopes"] == ["rooms"]
+            assert [room["devices"][0]["priority"] for room in ags_data["rooms"]] == [2, 1]
+            assert ags_data["_stored_config_cache"]["rooms"] is ags_data["rooms"]
+            assert ags_data["source_favorites"] is stored["source_favorites"]
+
+            patch(changes={"source_display_names": {" music::top ": " Morning "}})
+            assert replies[-1]["scopes"] == ["sources"] and ags_data["source_display_names"] == {"music::top": "Morning"}
+            assert ags_data["source_list_revision"] == 1
+
+            patch(changes={"log_buffer_size": 50})
+            assert ags_init.ags_log_handler.records.maxlen == 50
+
+            for bad_changes in ({"last_discovered_sources": []}, {"rooms": []}, {"bogus": True}):
+                patch(changes=bad_changes)
+            assert errors == ["invalid_config"] * 3
+
+            revision = ags_data["config_revision"]
+            ags_init.ws_get_config(hass, connection, {"id": 2, "revision": revision, "boot_id": ags_data["config_boot_id"]})
+            assert replies[-1]["not_modified"] is True
+            # A revision held from before a restart matches the new counter
+            # but not the new boot id.
+            ags_data["_config_get_cache"] = (revision, {"config_revision": revision, "config_boot_id": ags_data["config_boot_id"]})
+            ags_init.ws_get_config(hass, connection, {"id": 3, "revision": revision, "boot_id": "previous-boot"})
+            assert "not_modified" not in replies[-1] and replies[-1]["config_boot_id"] == ags_data["config_boot_id"]
+
+            ags_data.pop("_stored_config_cache")
+            patch(changes={"source_display_names": {}})
+            assert errors[-1] == "config_not_loaded" and len(replies) == 5
+        finally:
+            ags_init.vol, ags_init.ROOM_SCHEMA, ags_init._config_key_validators = originals
+            ags_init.ags_log_handler.set_capacity(ags_init.LOG_BUFFER_SIZE)
+
+        print("✓ config patch endpoint successful")
+        return True
+    except Exception as e:
+        print(f"✗ config patch test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
 if __name__ == "__main__":
     if (
         test_imports()
         and test_source_utils()
+        and test_config_persistence()
+        and test_unload_entry()
+        and test_log_handler()
+        and test_area_index()
+        and test_apply_transaction()
+        and test_startup_config()
+        and test_warm_start()
+        and test_state_tracker()
+        and test_config_memo()
+        and test_zones()
+        and test_switch_coalescing()
+        and test_room_records()
+        and test_startup_refresh()
         and test_media_player_source_helpers()
         and test_media_player_display_metadata()
+        and test_config_patch()
     ):
         print("\nAll imports and source utility checks successful in mocked environment.")
     else: